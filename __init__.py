@@ -2,4 +2,7 @@ from mini_ddq_app.models.tenant import Tenant
 from mini_ddq_app.models.user import User
 from mini_ddq_app.models.questionnaire import Questionnaire
 from mini_ddq_app.models.question import Question
-from mini_ddq_app.models.response import Response
\ No newline at end of file
+from mini_ddq_app.models.response import Response
+from mini_ddq_app.models.questionnaire_stats import QuestionnaireStats
+from mini_ddq_app.models.import_job import ImportJob
+from mini_ddq_app.models.questionnaire_snapshot import QuestionnaireSnapshot
\ No newline at end of file
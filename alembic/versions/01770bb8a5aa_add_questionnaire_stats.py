@@ -0,0 +1,181 @@
+"""add questionnaire_stats maintained by triggers
+
+Revision ID: 01770bb8a5aa
+Revises: 59e575403aac
+Create Date: 2026-10-19 13:41:05.902315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '01770bb8a5aa'
+down_revision: Union[str, Sequence[str], None] = '59e575403aac'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('questionnaire_stats',
+    sa.Column('questionnaire_id', sa.UUID(), nullable=False),
+    sa.Column('tenant_id', sa.UUID(), nullable=False),
+    sa.Column('total_questions', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('required_questions', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('answered', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('final_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('draft_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('rejected_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['questionnaire_id'], ['questionnaires.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('questionnaire_id')
+    )
+    op.create_index("questionnaire_stats_tenant_idx", "questionnaire_stats", ["tenant_id"])
+
+    # --- delta helpers ---
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION ddq_stats_question_delta(qn uuid, tid uuid, total int, required int)
+        RETURNS void AS $$
+            INSERT INTO questionnaire_stats (questionnaire_id, tenant_id, total_questions, required_questions)
+            VALUES (qn, tid, total, required)
+            ON CONFLICT (questionnaire_id) DO UPDATE SET
+                total_questions = questionnaire_stats.total_questions + EXCLUDED.total_questions,
+                required_questions = questionnaire_stats.required_questions + EXCLUDED.required_questions,
+                updated_at = now();
+        $$ LANGUAGE sql;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION ddq_stats_response_delta(qn uuid, has_answer boolean, st text, sign int)
+        RETURNS void AS $$
+            UPDATE questionnaire_stats SET
+                answered = answered + sign * has_answer::int,
+                final_count = final_count + sign * (st = 'final')::int,
+                draft_count = draft_count + sign * (st = 'draft')::int,
+                rejected_count = rejected_count + sign * (st = 'rejected')::int,
+                updated_at = now()
+            WHERE questionnaire_id = qn;
+        $$ LANGUAGE sql;
+        """
+    )
+
+    # --- questions: insert / required flag / move between questionnaires ---
+    op.execute(
+        r"""
+        CREATE OR REPLACE FUNCTION ddq_stats_on_question() RETURNS trigger AS $$
+        DECLARE r record;
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                PERFORM ddq_stats_question_delta(OLD.questionnaire_id, OLD.tenant_id, -1, -COALESCE(OLD.is_required, false)::int);
+            END IF;
+            PERFORM ddq_stats_question_delta(NEW.questionnaire_id, NEW.tenant_id, 1, COALESCE(NEW.is_required, false)::int);
+            IF TG_OP = 'UPDATE' AND OLD.questionnaire_id <> NEW.questionnaire_id THEN
+                FOR r IN SELECT answer, status FROM responses WHERE question_id = NEW.id LOOP
+                    PERFORM ddq_stats_response_delta(OLD.questionnaire_id, COALESCE(r.answer ~ '\S', false), r.status, -1);
+                    PERFORM ddq_stats_response_delta(NEW.questionnaire_id, COALESCE(r.answer ~ '\S', false), r.status, 1);
+                END LOOP;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    # BEFORE DELETE: the cascaded response delete can no longer see the question, so account for it here.
+    op.execute(
+        r"""
+        CREATE OR REPLACE FUNCTION ddq_stats_on_question_delete() RETURNS trigger AS $$
+        DECLARE r record;
+        BEGIN
+            PERFORM ddq_stats_question_delta(OLD.questionnaire_id, OLD.tenant_id, -1, -COALESCE(OLD.is_required, false)::int);
+            FOR r IN SELECT answer, status FROM responses WHERE question_id = OLD.id LOOP
+                PERFORM ddq_stats_response_delta(OLD.questionnaire_id, COALESCE(r.answer ~ '\S', false), r.status, -1);
+            END LOOP;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        r"""
+        CREATE OR REPLACE FUNCTION ddq_stats_on_response() RETURNS trigger AS $$
+        DECLARE qn uuid;
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                SELECT questionnaire_id INTO qn FROM questions WHERE id = OLD.question_id;
+                IF FOUND THEN
+                    PERFORM ddq_stats_response_delta(qn, COALESCE(OLD.answer ~ '\S', false), OLD.status, -1);
+                END IF;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                SELECT questionnaire_id INTO qn FROM questions WHERE id = NEW.question_id;
+                PERFORM ddq_stats_response_delta(qn, COALESCE(NEW.answer ~ '\S', false), NEW.status, 1);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    op.execute(
+        "CREATE TRIGGER questions_stats AFTER INSERT OR UPDATE OF questionnaire_id, is_required ON questions "
+        "FOR EACH ROW EXECUTE FUNCTION ddq_stats_on_question()"
+    )
+    op.execute(
+        "CREATE TRIGGER questions_stats_delete BEFORE DELETE ON questions "
+        "FOR EACH ROW EXECUTE FUNCTION ddq_stats_on_question_delete()"
+    )
+    op.execute(
+        "CREATE TRIGGER responses_stats AFTER INSERT OR DELETE ON responses "
+        "FOR EACH ROW EXECUTE FUNCTION ddq_stats_on_response()"
+    )
+    # Autosaves rewrite the answer constantly; only touch the counters when a counted value changes.
+    op.execute(
+        r"""
+        CREATE TRIGGER responses_stats_update AFTER UPDATE ON responses
+        FOR EACH ROW
+        WHEN (OLD.status IS DISTINCT FROM NEW.status
+              OR OLD.question_id IS DISTINCT FROM NEW.question_id
+              OR COALESCE(OLD.answer ~ '\S', false) IS DISTINCT FROM COALESCE(NEW.answer ~ '\S', false))
+        EXECUTE FUNCTION ddq_stats_on_response()
+        """
+    )
+
+    # --- backfill ---
+    op.execute(
+        r"""
+        INSERT INTO questionnaire_stats
+            (questionnaire_id, tenant_id, total_questions, required_questions, answered, final_count, draft_count, rejected_count)
+        SELECT qn.id, qn.tenant_id,
+               count(q.id),
+               count(q.id) FILTER (WHERE q.is_required),
+               count(r.id) FILTER (WHERE r.answer ~ '\S'),
+               count(r.id) FILTER (WHERE r.status = 'final'),
+               count(r.id) FILTER (WHERE r.status = 'draft'),
+               count(r.id) FILTER (WHERE r.status = 'rejected')
+        FROM questionnaires qn
+        LEFT JOIN questions q ON q.questionnaire_id = qn.id
+        LEFT JOIN responses r ON r.question_id = q.id
+        GROUP BY qn.id, qn.tenant_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS responses_stats_update ON responses")
+    op.execute("DROP TRIGGER IF EXISTS responses_stats ON responses")
+    op.execute("DROP TRIGGER IF EXISTS questions_stats_delete ON questions")
+    op.execute("DROP TRIGGER IF EXISTS questions_stats ON questions")
+    op.execute("DROP FUNCTION IF EXISTS ddq_stats_on_response()")
+    op.execute("DROP FUNCTION IF EXISTS ddq_stats_on_question_delete()")
+    op.execute("DROP FUNCTION IF EXISTS ddq_stats_on_question()")
+    op.execute("DROP FUNCTION IF EXISTS ddq_stats_response_delta(uuid, boolean, text, int)")
+    op.execute("DROP FUNCTION IF EXISTS ddq_stats_question_delta(uuid, uuid, int, int)")
+    op.drop_index("questionnaire_stats_tenant_idx", table_name="questionnaire_stats")
+    op.drop_table('questionnaire_stats')
@@ -0,0 +1,30 @@
+"""store responses.answer uncompressed out of line (STORAGE EXTERNAL)
+
+Revision ID: 30295e8747f7
+Revises: f29f2ef4f652
+Create Date: 2026-10-19 20:31:02.664381
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '30295e8747f7'
+down_revision: Union[str, Sequence[str], None] = 'f29f2ef4f652'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Previews select left(answer, N): on uncompressed TOAST that reads only the first chunk(s)
+    # instead of decompressing the whole value. Applies to rows written from now on.
+    op.execute("ALTER TABLE responses ALTER COLUMN answer SET STORAGE EXTERNAL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE responses ALTER COLUMN answer SET STORAGE EXTENDED")
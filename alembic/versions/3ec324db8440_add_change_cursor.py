@@ -0,0 +1,65 @@
+"""add change cursor to questions and responses
+
+Revision ID: 3ec324db8440
+Revises: 4bdf7955540d
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3ec324db8440'
+down_revision: Union[str, Sequence[str], None] = '4bdf7955540d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE SEQUENCE IF NOT EXISTS ddq_change_seq")
+
+    for table in ("questions", "responses"):
+        op.add_column(table, sa.Column("change_txid", sa.BigInteger(), nullable=True))
+        op.add_column(table, sa.Column("change_seq", sa.BigInteger(), nullable=True))
+        # existing rows sort before anything written after the upgrade
+        op.execute(f"UPDATE {table} SET change_txid = 0, change_seq = nextval('ddq_change_seq')")
+        op.alter_column(table, "change_txid", nullable=False)
+        op.alter_column(table, "change_seq", nullable=False)
+
+    # Stamp every insert/update (ORM, importer, raw SQL) so the cursor can't be bypassed.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION ddq_stamp_change() RETURNS trigger AS $$
+        BEGIN
+            NEW.change_txid := txid_current();
+            NEW.change_seq := nextval('ddq_change_seq');
+            NEW.updated_at := now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    for table in ("questions", "responses"):
+        op.execute(
+            f"CREATE TRIGGER {table}_stamp_change BEFORE INSERT OR UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION ddq_stamp_change()"
+        )
+
+    op.create_index("questions_tenant_change_idx", "questions", ["tenant_id", "change_txid", "change_seq"])
+    op.create_index("responses_tenant_change_idx", "responses", ["tenant_id", "change_txid", "change_seq"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("responses_tenant_change_idx", table_name="responses")
+    op.drop_index("questions_tenant_change_idx", table_name="questions")
+    for table in ("questions", "responses"):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_stamp_change ON {table}")
+        op.drop_column(table, "change_seq")
+        op.drop_column(table, "change_txid")
+    op.execute("DROP FUNCTION IF EXISTS ddq_stamp_change()")
+    op.execute("DROP SEQUENCE IF EXISTS ddq_change_seq")
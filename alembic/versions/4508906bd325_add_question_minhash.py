@@ -0,0 +1,34 @@
+"""add questions.minhash for near-duplicate detection
+
+Revision ID: 4508906bd325
+Revises: aaa4969a079d
+Create Date: 2026-10-19 18:05:37.112904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4508906bd325'
+down_revision: Union[str, Sequence[str], None] = 'aaa4969a079d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Computed in Python (near_duplicates.signatures); existing rows stay NULL and are hashed
+    # in memory when an index loads them.
+    op.add_column('questions', sa.Column('minhash', sa.LargeBinary(), nullable=True))
+    op.add_column('import_jobs', sa.Column('dedupe', sa.Text(), server_default=sa.text("'off'"), nullable=False))
+    op.add_column('import_jobs', sa.Column('rows_duplicate', sa.Integer(), server_default=sa.text('0'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('import_jobs', 'rows_duplicate')
+    op.drop_column('import_jobs', 'dedupe')
+    op.drop_column('questions', 'minhash')
@@ -0,0 +1,35 @@
+"""add pg_trgm GIN indexes for substring / fuzzy search
+
+Revision ID: 489064388a8c
+Revises: 5360bf4f65fc
+Create Date: 2026-10-19 16:02:48.207741
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '489064388a8c'
+down_revision: Union[str, Sequence[str], None] = '5360bf4f65fc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Serve ILIKE '%q%' (substring mode) and <% / word_similarity (fuzzy mode).
+    op.create_index("questions_text_trgm_idx", "questions", ["text"],
+                    postgresql_using="gin", postgresql_ops={"text": "gin_trgm_ops"})
+    op.create_index("responses_answer_trgm_idx", "responses", ["answer"],
+                    postgresql_using="gin", postgresql_ops={"answer": "gin_trgm_ops"})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("responses_answer_trgm_idx", table_name="responses")
+    op.drop_index("questions_text_trgm_idx", table_name="questions")
+    # the extension is left installed; other objects may depend on it
@@ -0,0 +1,40 @@
+"""add generated tsvector columns + GIN indexes for full-text search
+
+Revision ID: 5360bf4f65fc
+Revises: 01770bb8a5aa
+Create Date: 2026-10-19 15:20:12.664081
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5360bf4f65fc'
+down_revision: Union[str, Sequence[str], None] = '01770bb8a5aa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match TS_CONFIG in routes/search.py and the Computed() expressions on the models.
+# Answers are clipped so a huge policy dump can't exceed the 1MB tsvector limit and fail the write.
+QUESTION_TSV = "to_tsvector('english', coalesce(text, ''))"
+RESPONSE_TSV = "to_tsvector('english', left(coalesce(answer, ''), 100000))"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("questions", sa.Column("text_tsv", postgresql.TSVECTOR(), sa.Computed(QUESTION_TSV, persisted=True)))
+    op.add_column("responses", sa.Column("answer_tsv", postgresql.TSVECTOR(), sa.Computed(RESPONSE_TSV, persisted=True)))
+    op.create_index("questions_text_tsv_idx", "questions", ["text_tsv"], postgresql_using="gin")
+    op.create_index("responses_answer_tsv_idx", "responses", ["answer_tsv"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("responses_answer_tsv_idx", table_name="responses")
+    op.drop_index("questions_text_tsv_idx", table_name="questions")
+    op.drop_column("responses", "answer_tsv")
+    op.drop_column("questions", "text_tsv")
@@ -0,0 +1,30 @@
+"""add data_version counters to tenants and questionnaires
+
+Revision ID: 59e575403aac
+Revises: 3ec324db8440
+Create Date: 2026-10-19 11:03:27.540913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '59e575403aac'
+down_revision: Union[str, Sequence[str], None] = '3ec324db8440'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("tenants", sa.Column("data_version", sa.BigInteger(), server_default=sa.text("0"), nullable=False))
+    op.add_column("questionnaires", sa.Column("data_version", sa.BigInteger(), server_default=sa.text("0"), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("questionnaires", "data_version")
+    op.drop_column("tenants", "data_version")
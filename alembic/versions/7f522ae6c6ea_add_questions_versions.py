@@ -0,0 +1,30 @@
+"""add questions_version counters to tenants and questionnaires
+
+Revision ID: 7f522ae6c6ea
+Revises: 30295e8747f7
+Create Date: 2026-10-19 22:14:51.318406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f522ae6c6ea'
+down_revision: Union[str, Sequence[str], None] = '30295e8747f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("tenants", sa.Column("questions_version", sa.BigInteger(), server_default=sa.text("0"), nullable=False))
+    op.add_column("questionnaires", sa.Column("questions_version", sa.BigInteger(), server_default=sa.text("0"), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("questionnaires", "questions_version")
+    op.drop_column("tenants", "questions_version")
@@ -0,0 +1,63 @@
+"""add import_jobs and autofill provenance on responses
+
+Revision ID: aaa4969a079d
+Revises: 489064388a8c
+Create Date: 2026-10-19 17:20:11.481263
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'aaa4969a079d'
+down_revision: Union[str, Sequence[str], None] = '489064388a8c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('import_jobs',
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('tenant_id', sa.UUID(), nullable=False),
+    sa.Column('created_by', sa.UUID(), nullable=True),
+    sa.Column('status', sa.Text(), server_default=sa.text("'queued'"), nullable=False),
+    sa.Column('stage', sa.Text(), nullable=True),
+    sa.Column('format', sa.Text(), nullable=False),
+    sa.Column('autofill', sa.Text(), server_default=sa.text("'off'"), nullable=False),
+    sa.Column('rows_total', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('rows_ok', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('rows_failed', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('autofill_total', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('autofill_done', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('autofilled', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('errors', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'[]'::jsonb"), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('finished_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index("import_jobs_tenant_idx", "import_jobs", ["tenant_id", "created_at"])
+
+    op.add_column('responses', sa.Column('source_response_id', sa.UUID(), nullable=True))
+    op.add_column('responses', sa.Column('confidence', sa.Float(), nullable=True))
+    op.create_foreign_key('responses_source_response_id_fkey', 'responses', 'responses',
+                          ['source_response_id'], ['id'], ondelete='SET NULL')
+    # keeps the SET NULL on delete of a source answer from scanning responses
+    op.create_index("responses_source_response_idx", "responses", ["source_response_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("responses_source_response_idx", table_name="responses")
+    op.drop_constraint('responses_source_response_id_fkey', 'responses', type_='foreignkey')
+    op.drop_column('responses', 'confidence')
+    op.drop_column('responses', 'source_response_id')
+    op.drop_index("import_jobs_tenant_idx", table_name="import_jobs")
+    op.drop_table('import_jobs')
@@ -0,0 +1,41 @@
+"""add questionnaire_snapshots for finalized questionnaires
+
+Revision ID: f29f2ef4f652
+Revises: 4508906bd325
+Create Date: 2026-10-19 19:12:40.530117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f29f2ef4f652'
+down_revision: Union[str, Sequence[str], None] = '4508906bd325'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('questionnaire_snapshots',
+    sa.Column('questionnaire_id', sa.UUID(), nullable=False),
+    sa.Column('tenant_id', sa.UUID(), nullable=False),
+    sa.Column('data_version', sa.BigInteger(), nullable=False),
+    sa.Column('etag', sa.Text(), nullable=False),
+    sa.Column('content', sa.LargeBinary(), nullable=False),
+    sa.Column('raw_size', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['questionnaire_id'], ['questionnaires.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('questionnaire_id')
+    )
+    # already gzip-compressed: skip TOAST's pglz attempt, keep it out of line
+    op.execute("ALTER TABLE questionnaire_snapshots ALTER COLUMN content SET STORAGE EXTERNAL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('questionnaire_snapshots')
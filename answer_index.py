@@ -0,0 +1,192 @@
+"""
+Per-tenant vector index over *final* responses, keyed by the text of the question they answer.
+Backs GET /questions/{id}/suggestions (answer reuse).
+
+- Vectors: hashed character 3/4/5-grams of the normalised question text, sublinear tf.
+  IDF weights are applied at query time, so adding a row never rewrites the others.
+- Storage: one float32 NumPy matrix per tenant (+ document frequencies); lookups are a single
+  matrix-vector product (query_many: matrix-matrix for batches).
+- Freshness: each index remembers a change-feed cursor (see changefeed.py). Before answering,
+  sync() applies only the responses changed since that cursor. The first sync is the lazy
+  full build; after that every write costs one row update, in every worker. Request paths
+  use refresh(), which runs the query outside the index lock.
+
+Notes:
+- Only ids and question text are held in memory; answers are fetched for the top hits only.
+- Character n-grams tolerate rewording, plurals and typos without a stemmer or vocabulary.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from mini_ddq_app.changefeed import changed_after
+from mini_ddq_app.models.question import Question
+from mini_ddq_app.models.response import Response as ResponseModel
+
+DIM = 2 ** 12
+NGRAMS = (3, 4, 5)
+SYNC_PAGE = 5000
+MAX_TENANTS = 64
+
+
+def vectorize(text: str) -> np.ndarray:
+    """Sublinear-tf hashed char n-gram vector (float32, DIM)."""
+    t = " " + " ".join((text or "").lower().split()) + " "
+    grams = [t[i:i + n] for n in NGRAMS for i in range(len(t) - n + 1)]
+    if not grams:
+        return np.zeros(DIM, dtype=np.float32)
+    idx = np.fromiter((hash(g) % DIM for g in grams), dtype=np.int64, count=len(grams))
+    return np.log1p(np.bincount(idx, minlength=DIM)).astype(np.float32)
+
+
+class TenantAnswerIndex:
+    def __init__(self, capacity: int = 256):
+        self.lock = threading.Lock()
+        self.cursor: Tuple[int, int] = (0, 0)
+        self._tf = np.zeros((capacity, DIM), dtype=np.float32)
+        self._df = np.zeros(DIM, dtype=np.float32)
+        self._n = 0
+        self._pos: Dict[str, int] = {}                  # response_id -> row
+        self._meta: List[Tuple[str, str, str]] = []     # row -> (response_id, question_id, question_text)
+        self._weighted: Optional[np.ndarray] = None      # cached idf-weighted, L2-normalised rows
+
+    def __len__(self) -> int:
+        return self._n
+
+    # ----- mutation -----
+    def upsert(self, response_id: str, question_id: str, question_text: str) -> None:
+        vec = vectorize(question_text)
+        row = self._pos.get(response_id)
+        if row is None:
+            if self._n == len(self._tf):
+                self._tf = np.vstack([self._tf, np.zeros_like(self._tf)])  # amortised doubling
+            row = self._n
+            self._n += 1
+            self._pos[response_id] = row
+            self._meta.append((response_id, question_id, question_text))
+        else:
+            self._df -= self._tf[row] > 0
+            self._meta[row] = (response_id, question_id, question_text)
+        self._tf[row] = vec
+        self._df += vec > 0
+        self._weighted = None
+
+    def remove(self, response_id: str) -> None:
+        row = self._pos.pop(response_id, None)
+        if row is None:
+            return
+        self._df -= self._tf[row] > 0
+        last = self._n - 1
+        if row != last:  # swap the last row into the hole to stay dense
+            self._tf[row] = self._tf[last]
+            self._meta[row] = self._meta[last]
+            self._pos[self._meta[row][0]] = row
+        self._tf[last] = 0
+        self._meta.pop()
+        self._n = last
+        self._weighted = None
+
+    # ----- query -----
+    def _idf(self) -> np.ndarray:
+        return (np.log((1.0 + self._n) / (1.0 + self._df)) + 1.0).astype(np.float32)
+
+    def _matrix(self) -> np.ndarray:
+        if self._weighted is None:
+            w = self._tf[: self._n] * self._idf()
+            norms = np.linalg.norm(w, axis=1, keepdims=True)
+            self._weighted = w / np.maximum(norms, 1e-12)
+        return self._weighted
+
+    def query_many(self, texts: Sequence[str], k: int) -> List[List[Tuple[Tuple[str, str, str], float]]]:
+        """Top-k (meta, cosine score) per input text, best first; one matrix product for the whole batch."""
+        if not self._n or not texts:
+            return [[] for _ in texts]
+        q = np.vstack([vectorize(t) for t in texts]) * self._idf()
+        q /= np.maximum(np.linalg.norm(q, axis=1, keepdims=True), 1e-12)
+        scores = q @ self._matrix().T                                 # (len(texts), n)
+        k = min(k, self._n)
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        out = []
+        for i, cand in enumerate(top):
+            cand = cand[np.argsort(-scores[i, cand])]
+            out.append([(self._meta[j], float(scores[i, j])) for j in cand])
+        return out
+
+    # ----- sync from the change feed -----
+    def _changes(self, db: Session, tenant_id: str, cursor: Tuple[int, int]) -> list:
+        return db.execute(
+            select(
+                ResponseModel.id, ResponseModel.question_id, ResponseModel.status,
+                Question.question_text, ResponseModel.change_txid, ResponseModel.change_seq,
+            )
+            .join(Question, Question.id == ResponseModel.question_id)
+            .where(*changed_after(ResponseModel, tenant_id, *cursor))
+            .order_by(ResponseModel.change_txid, ResponseModel.change_seq)
+            .limit(SYNC_PAGE)
+        ).all()
+
+    def _apply(self, rows) -> None:
+        for r in rows:
+            if r.status == "final":
+                self.upsert(str(r.id), str(r.question_id), r.question_text)
+            else:
+                self.remove(str(r.id))
+        if rows:
+            self.cursor = (rows[-1].change_txid, rows[-1].change_seq)
+
+    def sync(self, db: Session, tenant_id: str) -> None:
+        """Apply responses changed since self.cursor (the first call builds the whole index). Caller holds lock."""
+        while True:
+            rows = self._changes(db, tenant_id, self.cursor)
+            self._apply(rows)
+            if len(rows) < SYNC_PAGE:
+                return
+
+    def refresh(self, db: Session, tenant_id: str) -> None:
+        """sync() without holding lock across the query: only applying a page takes it.
+
+        A page is applied only if the cursor hasn't moved while it was read; otherwise another
+        request got there first and the page is re-read from the new cursor.
+        """
+        while True:
+            cursor = self.cursor
+            rows = self._changes(db, tenant_id, cursor)
+            with self.lock:
+                if self.cursor != cursor:
+                    continue
+                self._apply(rows)
+            if len(rows) < SYNC_PAGE:
+                return
+
+
+class TenantIndexRegistry:
+    """Lazily created per-tenant indexes, LRU-bounded by tenant count."""
+
+    def __init__(self, factory: Callable[[], Any], max_tenants: int = MAX_TENANTS):
+        self.factory = factory
+        self.max_tenants = max_tenants
+        self._lock = threading.Lock()
+        self._indexes: "OrderedDict[str, Any]" = OrderedDict()
+
+    def get(self, tenant_id: str):
+        with self._lock:
+            index = self._indexes.get(tenant_id)
+            if index is None:
+                index = self._indexes[tenant_id] = self.factory()
+                while len(self._indexes) > self.max_tenants:
+                    self._indexes.popitem(last=False)
+            self._indexes.move_to_end(tenant_id)
+            return index
+
+    def drop(self, tenant_id: str) -> None:
+        """Forget a tenant's index (e.g. after a failed write left it ahead of the DB); rebuilt on next use."""
+        with self._lock:
+            self._indexes.pop(tenant_id, None)
+
+
+registry = TenantIndexRegistry(TenantAnswerIndex)
@@ -0,0 +1,148 @@
+"""
+Small in-process caches.
+
+- LRUCache: thread-safe LRU with a size bound (entries, optionally bytes) and a per-entry TTL,
+  plus hit/miss/eviction counters for metrics.
+- RedisCache: the same get/set/pop/stats surface over Redis, for caches shared by all workers.
+  Values must be bytes. Needs the optional `redis` package.
+
+Notes:
+- Keys should embed whatever makes an entry stale (e.g. the tenant's data_version), so a
+  write "invalidates" simply by making old keys unreachable; LRU/TTL then reclaims them.
+- maxsize=0 disables the cache (every get is a miss, set is a no-op).
+- maxbytes bounds the sum of len(value); only meaningful for bytes/str values.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+MISSING = object()
+
+
+class LRUCache:
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic,
+                 maxbytes: Optional[int] = None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def _size(self, value: Any) -> int:
+        return len(value) if self.maxbytes is not None else 0
+
+    def _drop(self, key: Hashable) -> None:
+        _, value = self._data.pop(key)
+        self._bytes -= self._size(value)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        size = self._size(value)
+        if self.maxbytes is not None and size > self.maxbytes:
+            return  # would evict everything else and still not fit
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._bytes += size
+            while len(self._data) > self.maxsize or (self.maxbytes is not None and self._bytes > self.maxbytes):
+                self._drop(next(iter(self._data)))
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "bytes": self._bytes if self.maxbytes is not None else None,
+                "maxbytes": self.maxbytes,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class RedisCache:
+    """LRUCache-compatible cache in Redis (bytes values; keys are str). Eviction is Redis' own maxmemory policy."""
+
+    def __init__(self, url: str, ttl: float, prefix: str = "ddq:", client: Any = None):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:  # optional dependency
+                raise RuntimeError("RedisCache needs the 'redis' package (pip install redis)") from e
+            client = redis.Redis.from_url(url)
+        self._redis = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, default: Any = MISSING) -> Any:
+        value = self._redis.get(self.prefix + key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        self._redis.set(self.prefix + key, value, px=int(self.ttl * 1000))
+
+    def pop(self, key: str) -> None:
+        self._redis.delete(self.prefix + key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "redis",
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
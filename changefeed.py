@@ -0,0 +1,63 @@
+"""
+Change-feed helpers shared by GET /questions/changes and GET /responses/changes.
+
+- Every insert/update on questions/responses is stamped by the ddq_stamp_change trigger
+  with (change_txid, change_seq): the writing transaction id + a global sequence value.
+- A cursor is the last (txid, seq) a client has seen, encoded as "<txid>.<seq>".
+- changes_since(): rows after the cursor, in cursor order, for one tenant.
+- changed_after(): the same filter as bare criteria, for callers projecting their own columns.
+
+Notes:
+- Sequence values alone are not a safe cursor: a slow transaction can commit a lower
+  seq after a faster one was already served, and the client would skip it forever.
+- So we only serve rows whose txid is below the snapshot xmin (the oldest transaction
+  still running). Everything below that horizon is settled, so the cursor never skips a row;
+  a long-running transaction only delays delivery until it finishes.
+"""
+
+from typing import List, Tuple, Type
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Session
+
+START_CURSOR = "0.0"
+
+
+def parse_cursor(cursor: str) -> Tuple[int, int]:
+    try:
+        txid, seq = cursor.split(".", 1)
+        return int(txid), int(seq)
+    except (AttributeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def format_cursor(txid: int, seq: int) -> str:
+    return f"{txid}.{seq}"
+
+
+def changed_after(model: Type, tenant_id: str, txid: int, seq: int) -> tuple:
+    """WHERE criteria: rows of `tenant_id` after (txid, seq) and below the settled horizon."""
+    horizon = func.txid_snapshot_xmin(func.txid_current_snapshot())
+    return (
+        model.tenant_id == tenant_id,
+        tuple_(model.change_txid, model.change_seq) > tuple_(txid, seq),
+        model.change_txid < horizon,
+    )
+
+
+def changes_since(db: Session, model: Type, tenant_id: str, since: str, limit: int) -> Tuple[List, str, bool]:
+    """Returns (rows, next_cursor, has_more) for `model` rows of `tenant_id` changed after `since`."""
+    txid, seq = parse_cursor(since)
+
+    rows = (
+        db.query(model)
+        .filter(*changed_after(model, tenant_id, txid, seq))
+        .order_by(model.change_txid, model.change_seq)
+        .limit(limit + 1)  # one extra row tells us whether there is another page
+        .all()
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = format_cursor(rows[-1].change_txid, rows[-1].change_seq) if rows else since
+    return rows, next_cursor, has_more
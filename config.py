@@ -7,5 +7,36 @@ class Settings:
     JWT_SECRET = os.getenv("JWT_SECRET", "devsecret")
     JWT_ALG = "HS256"
     ACCESS_TOKEN_EXPIRE_MIN=60*8  # 8h
+    SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "2048"))        # entries per worker; 0 disables
+    SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "300"))         # seconds
+    SEARCH_FUZZY_THRESHOLD = float(os.getenv("SEARCH_FUZZY_THRESHOLD", "0.4"))  # pg_trgm word_similarity cut-off
+
+    AUTOFILL_MIN_SCORE = float(os.getenv("AUTOFILL_MIN_SCORE", "0.5"))  # import autofill: min question similarity
+    QUESTION_CACHE_URL = os.getenv("QUESTION_CACHE_URL", "")                # redis://... shares it across workers; empty = in-process
+    QUESTION_CACHE_SIZE = int(os.getenv("QUESTION_CACHE_SIZE", "1024"))     # question lists per worker (in-process); 0 disables
+    QUESTION_CACHE_MAX_BYTES = int(os.getenv("QUESTION_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    QUESTION_CACHE_TTL = float(os.getenv("QUESTION_CACHE_TTL", "600"))      # seconds
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0"))                  # 0 = slow-query log off
+    SLOW_QUERY_EXPLAIN_SAMPLE = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE", "0.2"))  # share of slow queries EXPLAINed
+    SLOW_QUERY_BUFFER = int(os.getenv("SLOW_QUERY_BUFFER", "200"))          # entries kept per worker
+    DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "0"))          # this instance's Postgres connection budget, all workers; 0 = use DB_POOL_SIZE/DB_MAX_OVERFLOW
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))                      # per worker, when DB_MAX_CONNECTIONS is 0
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))             # seconds to wait for a pooled connection
+    WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))                # worker processes sharing DB_MAX_CONNECTIONS (uvicorn/gunicorn read it too)
+    FAIR_SCHEDULER = os.getenv("FAIR_SCHEDULER", "1") not in ("0", "false", "no")  # per-tenant request/DB quotas
+    FAIR_MAX_INFLIGHT = int(os.getenv("FAIR_MAX_INFLIGHT", "32"))           # scheduled requests running per worker
+    FAIR_TENANT_INFLIGHT = int(os.getenv("FAIR_TENANT_INFLIGHT", "8"))      # ... of which one tenant may run
+    FAIR_TENANT_QUEUE = int(os.getenv("FAIR_TENANT_QUEUE", "32"))           # queued per tenant before 429
+    FAIR_QUEUE_TIMEOUT = float(os.getenv("FAIR_QUEUE_TIMEOUT", "10"))       # seconds queued before 429
+    FAIR_TENANT_WEIGHTS = os.getenv("FAIR_TENANT_WEIGHTS", "")              # "tenant_id=2,other_id=0.5"; default weight 1
+    FAIR_TENANT_DB_CONNECTIONS = int(os.getenv("FAIR_TENANT_DB_CONNECTIONS", "0"))  # DB sessions per tenant; 0 = half the pool
+    FAIR_DB_TIMEOUT = float(os.getenv("FAIR_DB_TIMEOUT", "5"))              # seconds to wait for a tenant DB slot before 429
+    METRICS_TENANT_LABELS = os.getenv("METRICS_TENANT_LABELS", "0") not in ("0", "false", "no")  # per-tenant series on /metrics (exposes tenant ids)
+    DRAFT_WRITE_BEHIND = os.getenv("DRAFT_WRITE_BEHIND", "0") in ("1", "true", "yes")  # buffer draft autosaves (draft_buffer.py)
+    DRAFT_FLUSH_INTERVAL = float(os.getenv("DRAFT_FLUSH_INTERVAL", "1.0"))  # seconds between write-behind flushes
+    DRAFT_FLUSH_SIZE = int(os.getenv("DRAFT_FLUSH_SIZE", "500"))            # pending drafts that trigger an early flush
+    WARMUP = os.getenv("WARMUP", "1") not in ("0", "false", "no")           # warm engine/mappers/hashing at startup
+    WARMUP_CONNECTIONS = int(os.getenv("WARMUP_CONNECTIONS", "2"))          # pool connections opened during warmup
 
 settings = Settings()
\ No newline at end of file
@@ -1,14 +1,97 @@
+"""
+Engine and session factory.
+
+- The engine is created on first use (get_engine()), not at import: importing models, routes
+  or alembic's env.py never opens a pool, and the app creates it in its lifespan (warmup.py).
+- SessionLocal() binds itself to the engine on first call, so scripts can keep using it directly.
+- Pool size: with DB_MAX_CONNECTIONS set, each worker's pool is its share of that budget
+  (pool_limits()), so WEB_CONCURRENCY workers together can never open more; otherwise
+  DB_POOL_SIZE + DB_MAX_OVERFLOW per worker.
+
+Notes:
+- `from mini_ddq_app.db import engine` still works (module __getattr__), but creates the engine.
+"""
+
+import threading
+from typing import Tuple
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from mini_ddq_app.config import settings
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True, future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+_engine = None
+_engine_lock = threading.Lock()
+_pool_capacity = 0  # pool_size + max_overflow of the engine's pool
+
+# connections per worker outside the pool: the LISTEN connection of events.broker
+RESERVED_PER_WORKER = 1
+
+
+def pool_limits(max_connections: int, workers: int, reserved_per_worker: int = RESERVED_PER_WORKER) -> Tuple[int, int]:
+    """(pool_size, max_overflow) per worker so that workers * (pool + overflow + reserved) <= max_connections.
+
+    Two thirds of a worker's share stay open in the pool, the rest is burst overflow.
+    """
+    per_worker = max_connections // max(workers, 1) - reserved_per_worker
+    if per_worker < 1:
+        raise ValueError(f"a budget of {max_connections} connections is too small for {workers} workers "
+                         f"(each needs at least {reserved_per_worker + 1})")
+    pool_size = max(1, per_worker * 2 // 3)
+    return pool_size, per_worker - pool_size
+
+
+class _LazySessionmaker(sessionmaker):
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            get_engine()
+        return super().__call__(**local_kw)
+
+
+def get_engine() -> Engine:
+    global _engine, _pool_capacity
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                if settings.DB_MAX_CONNECTIONS > 0:
+                    pool_size, max_overflow = pool_limits(settings.DB_MAX_CONNECTIONS, settings.WEB_CONCURRENCY)
+                else:
+                    pool_size, max_overflow = settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+                engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True, future=True, pool_size=pool_size,
+                                       max_overflow=max_overflow, pool_timeout=settings.DB_POOL_TIMEOUT)
+                if settings.SLOW_QUERY_MS > 0:  # opt-in: time every statement, EXPLAIN a sample of the slow ones
+                    from mini_ddq_app import slow_queries
+                    slow_queries.install(engine, settings.SLOW_QUERY_MS, settings.SLOW_QUERY_EXPLAIN_SAMPLE,
+                                         settings.SLOW_QUERY_BUFFER)
+                from mini_ddq_app.metrics import register_pool
+                register_pool("app", engine.pool)
+                SessionLocal.configure(bind=engine)
+                _pool_capacity = pool_size + max_overflow
+                _engine = engine
+    return _engine
+
+
+def pool_capacity() -> int:
+    """Connections one worker's pool can hand out at once (creates the engine if needed)."""
+    get_engine()
+    return _pool_capacity
+
+
+def __getattr__(name):
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+SessionLocal = _LazySessionmaker(autoflush=False, autocommit=False, future=True)
 Base = declarative_base()
 
 def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+    from mini_ddq_app.fairness import db_slot
+
+    with db_slot():  # per-tenant cap on concurrent sessions (fairness.py)
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
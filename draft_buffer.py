@@ -0,0 +1,195 @@
+"""
+Write-behind buffer for draft autosaves (opt-in: DRAFT_WRITE_BEHIND=1).
+
+- PUT /responses/{question_id} with status "draft" on an existing response only records the
+  latest answer per (tenant_id, question_id) here and returns. Repeated saves of one field
+  between flushes coalesce into a single row write.
+- A background thread flushes every DRAFT_FLUSH_INTERVAL seconds, or as soon as
+  DRAFT_FLUSH_SIZE keys are pending. A flush writes one multi-row INSERT .. ON CONFLICT DO
+  UPDATE, then publishes the change event (ids plus matching question_ids) and bumps the
+  data versions, in one transaction.
+- Synchronous flushes keep reads and final writes consistent:
+  - GET /responses/{question_id} flushes its own key, and GET /responses/ the tenant's keys.
+  - A non-draft write flushes its key before writing, so a buffered draft can never land
+    on top of a final answer.
+  - stop() (app shutdown) flushes whatever is left.
+
+Notes:
+- Buffers are per worker process. Two workers holding drafts for the same field each flush
+  their own latest value, so across workers the last flush wins (same as concurrent PUTs).
+- Other readers (search, stats, change feeds, SSE) see a draft once it is flushed, at most
+  DRAFT_FLUSH_INTERVAL later.
+- A flush that fails is retried row by row. Rows that still fail (e.g. the question was
+  deleted) are logged and dropped.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from mini_ddq_app import metrics
+from mini_ddq_app.config import settings
+from mini_ddq_app.events import MAX_IDS_PER_EVENT, publish
+from mini_ddq_app.models.response import Response as ResponseModel
+from mini_ddq_app.versioning import bump_versions
+
+logger = logging.getLogger("mini_ddq_app.draft_buffer")
+
+Key = Tuple[str, str]  # (tenant_id, question_id)
+
+DRAFTS = metrics.Counter("ddq_draft_saves_total", "Buffered draft saves (coalesced = replaced an unflushed save)",
+                         ("outcome",))
+FLUSHED_ROWS = metrics.Counter("ddq_draft_flushed_rows_total", "Draft rows written by write-behind flushes", ())
+metrics.METRICS += [DRAFTS, FLUSHED_ROWS]
+
+
+@dataclass
+class PendingDraft:
+    response_id: str
+    questionnaire_id: str
+    answer: Optional[str]
+    user_id: str
+
+
+class DraftBuffer:
+    def __init__(self, session_factory, interval: float, max_pending: int):
+        self.session_factory = session_factory
+        self.interval, self.max_pending = interval, max_pending
+        self._lock = threading.Lock()         # guards _pending
+        self._flush_lock = threading.Lock()   # one flush at a time, so writes land in save order
+        self._pending: Dict[Key, PendingDraft] = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def pending(self, tenant_id, question_id) -> Optional[PendingDraft]:
+        return self._pending.get((str(tenant_id), str(question_id)))
+
+    def put(self, tenant_id, question_id, draft: PendingDraft) -> None:
+        with self._lock:
+            coalesced = self._pending.get((str(tenant_id), str(question_id))) is not None
+            self._pending[(str(tenant_id), str(question_id))] = draft
+            full = len(self._pending) >= self.max_pending
+        DRAFTS.inc("coalesced" if coalesced else "buffered")
+        self._ensure_started()
+        if full:
+            self._wake.set()
+
+    # ----- flushing -----
+    def _take(self, tenant_id=None, keys: Optional[Iterable[Key]] = None) -> Dict[Key, PendingDraft]:
+        with self._lock:
+            if keys is not None:
+                wanted = [k for k in ((str(t), str(q)) for t, q in keys) if k in self._pending]
+            elif tenant_id is not None:
+                wanted = [k for k in self._pending if k[0] == str(tenant_id)]
+            else:
+                taken, self._pending = self._pending, {}
+                return taken
+            return {k: self._pending.pop(k) for k in wanted}
+
+    def flush(self, tenant_id=None, keys: Optional[Iterable[Key]] = None) -> int:
+        """Write pending drafts (all, one tenant's, or the given keys); returns rows written."""
+        if not self._pending:
+            return 0
+        with self._flush_lock:
+            batch = self._take(tenant_id, keys)
+            if not batch:
+                return 0
+            db: Session = self.session_factory()
+            try:
+                try:
+                    written = self._write(db, batch)
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    logger.exception("draft flush of %d rows failed; retrying row by row", len(batch))
+                    written = self._write_one_by_one(db, batch)
+            finally:
+                db.close()
+        FLUSHED_ROWS.inc(amount=written)
+        return written
+
+    def _write(self, db: Session, batch: Dict[Key, PendingDraft]) -> int:
+        by_tenant: Dict[str, List[Tuple[str, PendingDraft]]] = defaultdict(list)
+        for (tenant_id, question_id), draft in batch.items():
+            by_tenant[tenant_id].append((question_id, draft))
+        written = 0
+        for tenant_id, rows in by_tenant.items():
+            stmt = pg_insert(ResponseModel).values([
+                {"tenant_id": tenant_id, "question_id": qid, "answer": d.answer, "status": "draft",
+                 "updated_by": d.user_id}
+                for qid, d in rows
+            ])
+            upserted = db.execute(
+                stmt.on_conflict_do_update(
+                    constraint="uq_responses_one_per_question",
+                    set_={"answer": stmt.excluded.answer, "status": stmt.excluded.status,
+                          "updated_by": stmt.excluded.updated_by},
+                ).returning(ResponseModel.id, ResponseModel.question_id)
+            ).all()
+            ids = [str(r.id) for r in upserted]
+            qn_ids = sorted({d.questionnaire_id for _, d in rows})
+            # same shape as the synchronous PUT's event, with question_ids[i] belonging to ids[i]
+            extra = {"question_ids": [str(r.question_id) for r in upserted]} if len(ids) <= MAX_IDS_PER_EVENT else {}
+            publish(db, tenant_id, "response", "upserted", ids, questionnaire_ids=qn_ids, status="draft", **extra)
+            bump_versions(db, tenant_id, qn_ids)
+            written += len(ids)
+        return written
+
+    def _write_one_by_one(self, db: Session, batch: Dict[Key, PendingDraft]) -> int:
+        written = 0
+        for key, draft in batch.items():
+            try:
+                written += self._write(db, {key: draft})
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.error("dropping buffered draft for tenant %s question %s: %s", key[0], key[1], e)
+        return written
+
+    # ----- background flusher -----
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._wake.clear()  # may still be set by an earlier stop()
+                self._thread = threading.Thread(target=self._run, name="ddq-draft-flusher", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("draft flush failed")
+                time.sleep(self.interval)
+
+    def stop(self) -> None:
+        """Stop the flusher and write everything still pending (app shutdown)."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        self.flush()
+
+
+def _session():
+    from mini_ddq_app.db import SessionLocal
+    return SessionLocal()
+
+
+draft_buffer = DraftBuffer(_session, settings.DRAFT_FLUSH_INTERVAL, settings.DRAFT_FLUSH_SIZE)
@@ -0,0 +1,169 @@
+"""
+Tenant-scoped change events over Postgres LISTEN/NOTIFY.
+
+- publish(): queues a NOTIFY inside the caller's transaction. Postgres delivers it on commit
+  and drops it on rollback, so subscribers never hear about writes that didn't happen.
+- ChangeBroker: one LISTEN connection per worker process (a daemon thread), fanned out to
+  every subscriber of the matching tenant through per-subscriber asyncio queues.
+- broker: the process-wide instance used by routes/events.py.
+
+Notes:
+- Events are hints, not the data itself: clients re-read via GET /responses/changes etc.
+- NOTIFY payloads are capped at 8000 bytes, so large batches send a count instead of ids.
+- A slow subscriber whose queue fills up (or any listener reconnect) gets a single
+  "resync" event instead of a silent gap.
+"""
+
+import asyncio
+import json
+import logging
+import select
+import threading
+from typing import Any, Dict, Iterable, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+log = logging.getLogger(__name__)
+
+CHANNEL = "ddq_changes"
+MAX_IDS_PER_EVENT = 50
+RESYNC_EVENT = {"kind": "resync"}
+
+
+def publish(db: Session, tenant_id, kind: str, op: str, ids: Iterable = (), **extra: Any) -> None:
+    """Queue a change event on the current transaction (sent when it commits)."""
+    ids = [str(i) for i in ids]
+    payload: Dict[str, Any] = {"tenant_id": str(tenant_id), "kind": kind, "op": op}
+    if len(ids) <= MAX_IDS_PER_EVENT:
+        payload["ids"] = ids
+    else:
+        payload["count"] = len(ids)
+    payload.update(extra)
+    db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": json.dumps(payload)})
+
+
+class Subscription:
+    def __init__(self, tenant_id: str, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.tenant_id = tenant_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        # runs on the subscriber's event loop (via call_soon_threadsafe)
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = RESYNC_EVENT
+        self.queue.put_nowait(event)
+
+
+class ChangeBroker:
+    def __init__(self, channel: str = CHANNEL, queue_size: int = 100):
+        self.channel = channel
+        self.queue_size = queue_size
+        self._subs: Dict[str, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ----- subscribers (called from the event loop) -----
+    def subscribe(self, tenant_id: str) -> Subscription:
+        sub = Subscription(str(tenant_id), asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subs.setdefault(sub.tenant_id, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subs.get(sub.tenant_id)
+            if subs:
+                subs.discard(sub)
+                if not subs:
+                    del self._subs[sub.tenant_id]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(s) for s in self._subs.values())
+
+    # ----- fan-out (called from the listener thread) -----
+    def dispatch(self, raw_payload: str) -> None:
+        try:
+            event = json.loads(raw_payload)
+        except ValueError:
+            log.warning("Ignoring malformed %s payload: %r", self.channel, raw_payload[:200])
+            return
+        with self._lock:
+            targets = list(self._subs.get(event.get("tenant_id"), ()))
+        self._deliver(targets, event)
+
+    def _broadcast_resync(self) -> None:
+        with self._lock:
+            targets = [s for subs in self._subs.values() for s in subs]
+        self._deliver(targets, RESYNC_EVENT)
+
+    @staticmethod
+    def _deliver(targets, event: Dict[str, Any]) -> None:
+        for sub in targets:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, event)
+            except RuntimeError:
+                pass  # subscriber's loop already closed; its stream is going away
+
+    # ----- listener lifecycle -----
+    def ensure_started(self) -> None:
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="ddq-change-listener", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _connect(self):
+        # A dedicated DBAPI connection outside the pool: LISTEN needs it for the process lifetime.
+        from mini_ddq_app.db import get_engine
+
+        engine = get_engine()
+        cargs, cparams = engine.dialect.create_connect_args(engine.url)
+        conn = engine.dialect.connect(*cargs, **cparams)
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute(f"LISTEN {self.channel}")
+        return conn
+
+    def _run(self) -> None:
+        backoff = 1.0
+        reconnecting = False
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._connect()
+                if reconnecting:
+                    self._broadcast_resync()  # events may have been missed while disconnected
+                backoff = 1.0
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self.dispatch(conn.notifies.pop(0).payload)
+            except Exception:
+                log.exception("Change listener connection failed; retrying in %.0fs", backoff)
+                reconnecting = True
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+
+broker = ChangeBroker()
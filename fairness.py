@@ -0,0 +1,292 @@
+"""
+Per-tenant fair scheduling: one tenant's import jobs and search loops can't starve the others
+of the shared threadpool and DB pool.
+
+- FairnessMiddleware (pure ASGI) reads the tenant from the verified Bearer token (no DB hit)
+  and asks TenantScheduler for a slot before the request reaches routing or the threadpool.
+- TenantScheduler: at most FAIR_MAX_INFLIGHT requests run per worker, and each tenant has
+  at most FAIR_TENANT_INFLIGHT of them. Over that, a request waits in its tenant's queue.
+  Freed slots go to the queued request with the smallest virtual finish tag (weighted fair
+  queueing; FAIR_TENANT_WEIGHTS gives some tenants a bigger share). A tenant whose queue is
+  full (FAIR_TENANT_QUEUE), or a request that waited FAIR_QUEUE_TIMEOUT, is rejected with
+  429 + Retry-After.
+- db_slot(): get_db holds a per-tenant semaphore for the session's lifetime, so one tenant
+  uses at most FAIR_TENANT_DB_CONNECTIONS of the pool (default: half its capacity). It waits
+  FAIR_DB_TIMEOUT, then answers 429.
+- Metrics: ddq_tenant_requests_total{outcome}, ddq_tenant_queue_wait_seconds, and the
+  ddq_tenant_inflight / ddq_tenant_queued / ddq_tenant_db_sessions gauges, all labelled by
+  tenant id. /metrics is unauthenticated, so they are only rendered with METRICS_TENANT_LABELS=1.
+
+Notes:
+- Requests without a valid token (login, probes, /metrics) are not scheduled. Neither is
+  the SSE stream: it would hold a slot for its whole lifetime.
+- The scheduler state is per worker process and lives on the event loop (no locks). The DB
+  semaphores are taken in threadpool threads and use threading primitives.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from jose import JWTError
+
+from mini_ddq_app import metrics
+from mini_ddq_app.auth.jwt import decode_token
+from mini_ddq_app.config import settings
+from mini_ddq_app.serialization import dumps
+
+EXEMPT_PREFIXES = ("/auth/", "/events/", "/healthz", "/readyz", "/metrics", "/docs", "/openapi.json")
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+TENANT_REQUESTS = metrics.Counter("ddq_tenant_requests_total",
+                                  "Scheduled requests by tenant and outcome (admitted, queued, rejected_*)",
+                                  ("tenant", "outcome"))
+QUEUE_WAIT = metrics.Histogram("ddq_tenant_queue_wait_seconds", "Time queued before admission", WAIT_BUCKETS,
+                               ("tenant",))
+
+_tenant: ContextVar[Optional[str]] = ContextVar("ddq_tenant", default=None)
+
+
+def current_tenant() -> Optional[str]:
+    return _tenant.get()
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """'tenant_id=2,other=0.5' -> {tenant_id: 2.0, other: 0.5}"""
+    weights = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        tenant_id, _, weight = part.partition("=")
+        weights[tenant_id.strip()] = float(weight)
+    return weights
+
+
+class QuotaExceeded(Exception):
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason, self.retry_after = reason, retry_after
+
+
+class _TenantState:
+    __slots__ = ("weight", "inflight", "queue", "last_finish", "avg_duration")
+
+    def __init__(self, weight: float):
+        self.weight = weight
+        self.inflight = 0
+        self.queue: Deque[Tuple[float, asyncio.Future]] = deque()
+        self.last_finish = 0.0   # virtual finish tag of the tenant's latest request
+        self.avg_duration = 0.1  # EWMA of request time, seconds (for Retry-After)
+
+
+class TenantScheduler:
+    def __init__(self, max_inflight: int, tenant_inflight: int, tenant_queue: int, queue_timeout: float,
+                 weights: Optional[Dict[str, float]] = None):
+        self.max_inflight, self.tenant_inflight = max_inflight, tenant_inflight
+        self.tenant_queue, self.queue_timeout = tenant_queue, queue_timeout
+        self.weights = weights or {}
+        self._inflight = 0
+        self._vtime = 0.0
+        self._tenants: Dict[str, _TenantState] = {}
+
+    def _state(self, tenant_id: str) -> _TenantState:
+        t = self._tenants.get(tenant_id)
+        if t is None:
+            t = self._tenants[tenant_id] = _TenantState(self.weights.get(tenant_id, 1.0))
+        return t
+
+    def _tag(self, t: _TenantState) -> float:
+        t.last_finish = max(self._vtime, t.last_finish) + 1.0 / t.weight
+        return t.last_finish
+
+    def _retry_after(self, t: _TenantState) -> int:
+        # time for the tenant's backlog to drain at its own concurrency
+        return max(1, math.ceil(t.avg_duration * (len(t.queue) + 1) / self.tenant_inflight))
+
+    async def acquire(self, tenant_id: str) -> float:
+        """Wait for a slot; returns seconds queued. Raises QuotaExceeded instead of queueing past the quota."""
+        t = self._state(tenant_id)
+        if not t.queue and t.inflight < self.tenant_inflight and self._inflight < self.max_inflight:
+            self._tag(t)
+            self._admit(t)
+            TENANT_REQUESTS.inc(tenant_id, "admitted")
+            return 0.0
+        if len(t.queue) >= self.tenant_queue:
+            TENANT_REQUESTS.inc(tenant_id, "rejected_quota")
+            raise QuotaExceeded("tenant request quota exceeded", self._retry_after(t))
+
+        entry = (self._tag(t), asyncio.get_running_loop().create_future())
+        t.queue.append(entry)
+        TENANT_REQUESTS.inc(tenant_id, "queued")
+        started = time.perf_counter()
+        fut = entry[1]
+        try:
+            await asyncio.wait({fut}, timeout=self.queue_timeout)
+        except BaseException:            # the client went away while queued
+            if fut.done():
+                self.release(tenant_id, 0.0)
+            else:
+                t.queue.remove(entry)
+                fut.cancel()
+            raise
+        waited = time.perf_counter() - started
+        QUEUE_WAIT.observe(waited, tenant_id)
+        if not fut.done():
+            t.queue.remove(entry)
+            fut.cancel()
+            TENANT_REQUESTS.inc(tenant_id, "rejected_timeout")
+            raise QuotaExceeded("timed out waiting for a slot", self._retry_after(t))
+        TENANT_REQUESTS.inc(tenant_id, "admitted")
+        return waited
+
+    def release(self, tenant_id: str, duration: float) -> None:
+        t = self._tenants[tenant_id]
+        t.inflight -= 1
+        self._inflight -= 1
+        t.avg_duration += 0.2 * (duration - t.avg_duration)
+        self._dispatch()
+
+    def _admit(self, t: _TenantState) -> None:
+        t.inflight += 1
+        self._inflight += 1
+
+    def _dispatch(self) -> None:
+        """Hand free slots to queued requests, smallest virtual finish tag first."""
+        while self._inflight < self.max_inflight:
+            best = None
+            for t in self._tenants.values():
+                if t.queue and t.inflight < self.tenant_inflight and (best is None or t.queue[0][0] < best.queue[0][0]):
+                    best = t
+            if best is None:
+                return
+            tag, fut = best.queue.popleft()
+            self._vtime = max(self._vtime, tag)
+            self._admit(best)
+            fut.set_result(None)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {tid: {"inflight": t.inflight, "queued": len(t.queue), "weight": t.weight}
+                for tid, t in self._tenants.items()}
+
+
+# ---------- per-tenant DB sessions ----------
+class _DBSlots:
+    def __init__(self, limit: int, timeout: float):
+        self.limit, self.timeout = limit, timeout
+        self._lock = threading.Lock()
+        self._sems: Dict[str, threading.BoundedSemaphore] = {}
+        self._in_use: Dict[str, int] = {}
+
+    def _limit(self) -> int:
+        if not self.limit:
+            from mini_ddq_app.db import pool_capacity
+            self.limit = max(1, pool_capacity() // 2)
+        return self.limit
+
+    @contextmanager
+    def hold(self, tenant_id: str):
+        with self._lock:
+            sem = self._sems.get(tenant_id)
+            if sem is None:
+                sem = self._sems[tenant_id] = threading.BoundedSemaphore(self._limit())
+        if not sem.acquire(timeout=self.timeout):
+            TENANT_REQUESTS.inc(tenant_id, "rejected_db")
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                                detail="tenant database quota exceeded", headers={"Retry-After": "1"})
+        with self._lock:
+            self._in_use[tenant_id] = self._in_use.get(tenant_id, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_use[tenant_id] -= 1
+            sem.release()
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._in_use)
+
+
+scheduler = TenantScheduler(settings.FAIR_MAX_INFLIGHT, settings.FAIR_TENANT_INFLIGHT, settings.FAIR_TENANT_QUEUE,
+                            settings.FAIR_QUEUE_TIMEOUT, parse_weights(settings.FAIR_TENANT_WEIGHTS))
+db_slots = _DBSlots(settings.FAIR_TENANT_DB_CONNECTIONS, settings.FAIR_DB_TIMEOUT)
+
+
+@contextmanager
+def db_slot():
+    """Hold one of the current tenant's DB slots (no-op outside a scheduled request)."""
+    tenant_id = _tenant.get()
+    if tenant_id is None or not settings.FAIR_SCHEDULER:
+        yield
+        return
+    with db_slots.hold(tenant_id):
+        yield
+
+
+def _collect() -> List[str]:
+    if not settings.METRICS_TENANT_LABELS:
+        return []
+    lines = TENANT_REQUESTS.render() + QUEUE_WAIT.render()
+    tenants = scheduler.snapshot()
+    gauges = (
+        ("ddq_tenant_inflight", "Requests running per tenant", {k: v["inflight"] for k, v in tenants.items()}),
+        ("ddq_tenant_queued", "Requests queued per tenant", {k: v["queued"] for k, v in tenants.items()}),
+        ("ddq_tenant_db_sessions", "DB sessions held per tenant", db_slots.snapshot()),
+    )
+    for name, help_text, values in gauges:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        lines += [f'{name}{{tenant="{metrics._escape(tid)}"}} {value:g}' for tid, value in sorted(values.items())]
+    return lines
+
+
+metrics.register_collector(_collect)
+
+
+# ---------- middleware ----------
+def _tenant_from_scope(scope) -> Optional[str]:
+    for key, value in scope.get("headers", ()):
+        if key == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return None
+            try:
+                return decode_token(token).get("tenant_id")
+            except JWTError:
+                return None
+    return None
+
+
+class FairnessMiddleware:
+    def __init__(self, app, scheduler: TenantScheduler = scheduler):
+        self.app = app
+        self.scheduler = scheduler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.FAIR_SCHEDULER or scope["path"].startswith(EXEMPT_PREFIXES):
+            return await self.app(scope, receive, send)
+        tenant_id = _tenant_from_scope(scope)
+        if tenant_id is None:
+            return await self.app(scope, receive, send)
+
+        try:
+            await self.scheduler.acquire(tenant_id)
+        except QuotaExceeded as e:
+            body = dumps({"detail": str(e)})
+            await send({"type": "http.response.start", "status": 429, "headers": [
+                (b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(e.retry_after).encode()),
+            ]})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        token = _tenant.set(tenant_id)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _tenant.reset(token)
+            self.scheduler.release(tenant_id, time.perf_counter() - started)
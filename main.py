@@ -1,14 +1,47 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.datastructures import Default
 from mini_ddq_app.routes import auth as auth_routes
 from mini_ddq_app.routes import responses as response_routes
 from mini_ddq_app.routes import questions as question_routes
 from mini_ddq_app.routes import search as search_routes
 from mini_ddq_app.routes import imports as imports_routes
+from mini_ddq_app.routes import events as events_routes
+from mini_ddq_app.routes import questionnaires as questionnaire_routes
+from mini_ddq_app.routes import metrics as metrics_routes
+from mini_ddq_app.routes import health as health_routes
+from mini_ddq_app import warmup
+from mini_ddq_app.draft_buffer import draft_buffer
+from mini_ddq_app.events import broker
+from mini_ddq_app.fairness import FairnessMiddleware
+from mini_ddq_app.metrics import MetricsMiddleware
+from mini_ddq_app.serialization import ORJSONResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # warm up in a thread: /healthz answers right away, /readyz turns 200 once it's done
+    warming = asyncio.get_running_loop().run_in_executor(None, warmup.run)
+    yield
+    await warming
+    draft_buffer.stop()  # write buffered draft autosaves before the process goes away
+    broker.stop()
 
-app = FastAPI(title="Mini DDQ API")
+
+# Default(): response_model routes keep FastAPI's Pydantic dump_json path; the rest encode with orjson
+app = FastAPI(title="Mini DDQ API", lifespan=lifespan, default_response_class=Default(ORJSONResponse))
 
 app.include_router(auth_routes.router)
 app.include_router(question_routes.router)
 app.include_router(response_routes.router)
 app.include_router(search_routes.router)
-app.include_router(imports_routes.router)
\ No newline at end of file
+app.include_router(imports_routes.router)
+app.include_router(events_routes.router)
+app.include_router(questionnaire_routes.router)
+app.include_router(metrics_routes.router)
+app.include_router(health_routes.router)
+
+app.add_middleware(FairnessMiddleware)
+app.add_middleware(MetricsMiddleware)  # outermost: rejected (429) requests are counted too
@@ -0,0 +1,250 @@
+"""
+Per-request performance instrumentation, exposed in Prometheus text format at GET /metrics.
+
+- MetricsMiddleware (pure ASGI): per-route latency histogram, response size histogram, status
+  counts, SQL statement count and DB time per request. Routes are labelled by their path
+  template (/questions/{question_id}/suggestions), never by the raw path.
+- SQL: before/after_cursor_execute listeners on every Engine add to the RequestStats in a
+  contextvar; sync endpoints run in the threadpool with a copy of the context, so their
+  statements land on the same request.
+- N+1 detector: a request that runs the same SQL text N1_THRESHOLD+ times is counted in
+  ddq_n_plus_one_suspected_total and logged with the statement. That is the signature of a
+  per-row lazy load or per-row lookup: the statement count grows with the result size.
+
+Notes:
+- Metrics are per worker process; Prometheus sums across workers/instances.
+- Server-sent event streams are left out of the latency histograms (their "latency" is the
+  connection lifetime).
+"""
+
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("mini_ddq_app.metrics")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+STATEMENT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 250)
+N1_THRESHOLD = 10
+
+
+# ---------- registry ----------
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float], labels: Sequence[str]):
+        self.name, self.help, self.buckets, self.labels = name, help_text, tuple(buckets), tuple(labels)
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], List[float]] = {}  # labels -> [bucket counts..., +Inf, sum]
+
+    def observe(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_values, series in sorted(self._series.items()):
+                base = _labels(self.labels, label_values)
+                for bound, count in zip(self.buckets, series):
+                    lines.append(f'{self.name}_bucket{{{base}{"," if base else ""}le="{bound:g}"}} {count:g}')
+                lines.append(f'{self.name}_bucket{{{base}{"," if base else ""}le="+Inf"}} {series[-2]:g}')
+                lines.append(f"{self.name}_count{{{base}}} {series[-2]:g}")
+                lines.append(f"{self.name}_sum{{{base}}} {series[-1]:.6f}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: Sequence[str]):
+        self.name, self.help, self.labels = name, help_text, tuple(labels)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{{{_labels(self.labels, label_values)}}} {value:g}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    return ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+
+
+REQUEST_LATENCY = Histogram("ddq_request_duration_seconds", "Request latency", LATENCY_BUCKETS, ("method", "route"))
+RESPONSE_SIZE = Histogram("ddq_response_size_bytes", "Response body size", SIZE_BUCKETS, ("method", "route"))
+REQUEST_STATEMENTS = Histogram("ddq_request_sql_statements", "SQL statements per request", STATEMENT_BUCKETS,
+                               ("method", "route"))
+REQUEST_DB_TIME = Histogram("ddq_request_db_seconds", "Time spent in SQL per request", LATENCY_BUCKETS,
+                            ("method", "route"))
+REQUESTS = Counter("ddq_requests_total", "Requests by status code", ("method", "route", "status"))
+N_PLUS_ONE = Counter("ddq_n_plus_one_suspected_total",
+                     f"Requests that ran one SQL statement {N1_THRESHOLD}+ times", ("method", "route"))
+
+METRICS = [REQUEST_LATENCY, RESPONSE_SIZE, REQUEST_STATEMENTS, REQUEST_DB_TIME, REQUESTS, N_PLUS_ONE]
+
+# name -> callable returning a stats dict (LRUCache.stats()); rendered as gauges
+_cache_sources: Dict[str, Callable[[], dict]] = {}
+
+
+def register_cache(name: str, stats: Callable[[], dict]) -> None:
+    _cache_sources[name] = stats
+
+
+def _render_caches() -> List[str]:
+    lines = []
+    for key in ("hits", "misses", "evictions", "size"):
+        metric = f"ddq_cache_{key}"
+        lines += [f"# HELP {metric} Cache {key} (per worker)", f"# TYPE {metric} gauge"]
+        for name, stats in sorted(_cache_sources.items()):
+            value = stats().get(key)
+            if value is not None:
+                lines.append(f'{metric}{{cache="{_escape(name)}"}} {value:g}')
+    return lines
+
+
+# name -> SQLAlchemy pool; rendered as gauges (QueuePool exposes size/checkedout/overflow)
+_pools: Dict[str, object] = {}
+
+
+def register_pool(name: str, pool) -> None:
+    _pools[name] = pool
+
+
+def _render_pools() -> List[str]:
+    lines = []
+    for key, help_text in (("size", "Configured pool size"), ("checkedout", "Connections in use"),
+                           ("overflow", "Connections opened beyond the pool size"),
+                           ("checkedin", "Idle connections in the pool")):
+        metric = f"ddq_db_pool_{key}"
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+        for name, pool in sorted(_pools.items()):
+            getter = getattr(pool, key, None)
+            if callable(getter):
+                lines.append(f'{metric}{{pool="{_escape(name)}"}} {getter():g}')
+    return lines
+
+
+# callables returning ready-made exposition lines (e.g. fairness per-tenant gauges)
+_collectors: List[Callable[[], List[str]]] = []
+
+
+def register_collector(collect: Callable[[], List[str]]) -> None:
+    _collectors.append(collect)
+
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in METRICS:
+        lines += metric.render()
+    lines += _render_caches()
+    lines += _render_pools()
+    for collect in _collectors:
+        lines += collect()
+    return "\n".join(lines) + "\n"
+
+
+# ---------- SQL accounting ----------
+@dataclass
+class RequestStats:
+    statements: int = 0
+    db_time: float = 0.0
+    by_sql: Dict[str, int] = field(default_factory=dict)
+    scope: Optional[dict] = None  # ASGI scope; the router adds "route" to it once matched
+
+
+def current_route() -> Optional[str]:
+    """'METHOD /path/{template}' of the request being served on this context, if any."""
+    stats = _current.get()
+    if stats is None or stats.scope is None:
+        return None
+    route = getattr(stats.scope.get("route"), "path", None) or stats.scope.get("path")
+    return f'{stats.scope.get("method")} {route}'
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("ddq_request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("ddq_query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["ddq_query_start"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_time += time.perf_counter() - started
+        stats.by_sql[statement] = stats.by_sql.get(statement, 0) + 1
+
+
+# ---------- middleware ----------
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats(scope=scope)
+        token = _current.set(stats)
+        status_code, size, streaming = 500, 0, False
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code, size, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                streaming = any(k == b"content-type" and v.startswith(b"text/event-stream")
+                                for k, v in message.get("headers", ()))
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope["method"]
+            REQUESTS.inc(method, route, str(status_code))
+            if not streaming:
+                REQUEST_LATENCY.observe(time.perf_counter() - started, method, route)
+                RESPONSE_SIZE.observe(size, method, route)
+                REQUEST_STATEMENTS.observe(stats.statements, method, route)
+                REQUEST_DB_TIME.observe(stats.db_time, method, route)
+            repeated = max(stats.by_sql.items(), key=lambda kv: kv[1], default=None)
+            if repeated and repeated[1] >= N1_THRESHOLD:
+                N_PLUS_ONE.inc(method, route)
+                logger.warning(
+                    "possible N+1: %s %s ran one statement %d times (%d statements total): %s",
+                    method, route, repeated[1], stats.statements, " ".join(repeated[0].split())[:300],
+                )
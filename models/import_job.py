@@ -0,0 +1,28 @@
+from sqlalchemy import Column, ForeignKey, Integer, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.types import Text, TIMESTAMP
+from mini_ddq_app.db import Base
+
+# One row per background import (POST /imports/questions without ?sync). The worker updates
+# the counters as it commits each batch, so GET /imports/jobs/{id} shows live progress.
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False)
+    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    status = Column(Text, nullable=False, server_default=text("'queued'"))  # queued | running | succeeded | failed
+    stage = Column(Text)                                                     # importing | autofill
+    format = Column(Text, nullable=False)
+    autofill = Column(Text, nullable=False, server_default=text("'off'"))    # off | draft
+    dedupe = Column(Text, nullable=False, server_default=text("'off'"))      # off | flag | skip
+    rows_total = Column(Integer, nullable=False, server_default=text("0"))
+    rows_ok = Column(Integer, nullable=False, server_default=text("0"))
+    rows_failed = Column(Integer, nullable=False, server_default=text("0"))
+    rows_duplicate = Column(Integer, nullable=False, server_default=text("0"))
+    autofill_total = Column(Integer, nullable=False, server_default=text("0"))
+    autofill_done = Column(Integer, nullable=False, server_default=text("0"))
+    autofilled = Column(Integer, nullable=False, server_default=text("0"))
+    errors = Column(JSONB, nullable=False, server_default=text("'[]'::jsonb"))
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"), onupdate=text("now()"))
+    finished_at = Column(TIMESTAMP(timezone=True))
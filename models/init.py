@@ -6,4 +6,7 @@ from .tenant import Tenant
 from .user import User
 from .questionnaire import Questionnaire
 from .question import Question
-from .response import Response
\ No newline at end of file
+from .response import Response
+from .questionnaire_stats import QuestionnaireStats
+from .import_job import ImportJob
+from .questionnaire_snapshot import QuestionnaireSnapshot
\ No newline at end of file
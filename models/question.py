@@ -1,6 +1,7 @@
 # mini_ddq_app/models/question.py
-from sqlalchemy import Column, ForeignKey, Integer, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, ForeignKey, Integer, Boolean, BigInteger, FetchedValue, Computed, LargeBinary
+from sqlalchemy.orm import deferred
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 from sqlalchemy.types import Text, TIMESTAMP
 from sqlalchemy import text as sa_text  # alias the function safely
 from mini_ddq_app.db import Base
@@ -16,4 +17,11 @@ class Question(Base):
     display_order = Column(Integer)
     is_required = Column(Boolean, server_default=sa_text("false"))
     created_at = Column(TIMESTAMP(timezone=True), server_default=sa_text("now()"))
-    updated_at = Column(TIMESTAMP(timezone=True), server_default=sa_text("now()"))
\ No newline at end of file
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=sa_text("now()"), server_onupdate=FetchedValue())
+    # change cursor, stamped by the ddq_stamp_change trigger on every insert/update
+    change_txid = Column(BigInteger, nullable=False, server_default=FetchedValue(), server_onupdate=FetchedValue())
+    change_seq = Column(BigInteger, nullable=False, server_default=FetchedValue(), server_onupdate=FetchedValue())
+    # full-text search vector (generated column, GIN-indexed); deferred so normal loads don't fetch it
+    text_tsv = deferred(Column(TSVECTOR, Computed("to_tsvector('english', coalesce(text, ''))", persisted=True)))
+    # MinHash signature of the text (see near_duplicates.py); set by every insert path
+    minhash = deferred(Column(LargeBinary))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, UniqueConstraint, text
+from sqlalchemy import Column, ForeignKey, UniqueConstraint, BigInteger, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.types import Text, Integer, TIMESTAMP
 from mini_ddq_app.db import Base
@@ -13,4 +13,6 @@ class Questionnaire(Base):
     created_by = Column(UUID(as_uuid=True), nullable=False)
     created_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
     updated_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
+    data_version = Column(BigInteger, nullable=False, server_default=text("0"))  # bumped by every write (see versioning.py)
+    questions_version = Column(BigInteger, nullable=False, server_default=text("0"))  # bumped by question writes only
     __table_args__ = (UniqueConstraint("tenant_id", "name", "version", name="uq_questionnaires_name_version"),)
\ No newline at end of file
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, ForeignKey, BigInteger, Integer, LargeBinary, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.types import Text, TIMESTAMP
+from mini_ddq_app.db import Base
+
+# Pre-rendered document of a finalized questionnaire (gzip-compressed JSON), written by
+# POST /questionnaires/{id}/finalize and served as-is by GET /questionnaires/{id}/document.
+class QuestionnaireSnapshot(Base):
+    __tablename__ = "questionnaire_snapshots"
+    questionnaire_id = Column(UUID(as_uuid=True), ForeignKey("questionnaires.id", ondelete="CASCADE"), primary_key=True)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False)
+    data_version = Column(BigInteger, nullable=False)  # questionnaire data_version the document was rendered at
+    etag = Column(Text, nullable=False)
+    content = Column(LargeBinary, nullable=False)      # gzip(JSON)
+    raw_size = Column(Integer, nullable=False)         # uncompressed bytes
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
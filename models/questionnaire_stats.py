@@ -0,0 +1,18 @@
+from sqlalchemy import Column, ForeignKey, Integer, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.types import TIMESTAMP
+from mini_ddq_app.db import Base
+
+# Completion counters per questionnaire. Maintained by DB triggers on questions/responses
+# (see the add_questionnaire_stats migration); the app only reads them.
+class QuestionnaireStats(Base):
+    __tablename__ = "questionnaire_stats"
+    questionnaire_id = Column(UUID(as_uuid=True), ForeignKey("questionnaires.id", ondelete="CASCADE"), primary_key=True)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False)
+    total_questions = Column(Integer, nullable=False, server_default=text("0"))
+    required_questions = Column(Integer, nullable=False, server_default=text("0"))
+    answered = Column(Integer, nullable=False, server_default=text("0"))
+    final_count = Column(Integer, nullable=False, server_default=text("0"))
+    draft_count = Column(Integer, nullable=False, server_default=text("0"))
+    rejected_count = Column(Integer, nullable=False, server_default=text("0"))
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, ForeignKey, UniqueConstraint, text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, ForeignKey, UniqueConstraint, BigInteger, FetchedValue, Computed, Float, text
+from sqlalchemy.orm import deferred
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 from sqlalchemy.types import Text, TIMESTAMP
 from mini_ddq_app.db import Base
 
@@ -10,6 +11,14 @@ class Response(Base):
     question_id = Column(UUID(as_uuid=True), ForeignKey("questions.id", ondelete="CASCADE"), nullable=False)
     answer = Column(Text)
     status = Column(Text, nullable=False, server_default=text("'draft'"))
+    # set when the answer was drafted from an earlier final response (import autofill)
+    source_response_id = Column(UUID(as_uuid=True), ForeignKey("responses.id", ondelete="SET NULL"))
+    confidence = Column(Float)
     updated_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
-    updated_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"), server_onupdate=FetchedValue())
+    # change cursor, stamped by the ddq_stamp_change trigger on every insert/update
+    change_txid = Column(BigInteger, nullable=False, server_default=FetchedValue(), server_onupdate=FetchedValue())
+    change_seq = Column(BigInteger, nullable=False, server_default=FetchedValue(), server_onupdate=FetchedValue())
+    # full-text search vector (generated column, GIN-indexed); deferred so normal loads don't fetch it
+    answer_tsv = deferred(Column(TSVECTOR, Computed("to_tsvector('english', left(coalesce(answer, ''), 100000))", persisted=True)))
     __table_args__ = (UniqueConstraint("tenant_id", "question_id", name="uq_responses_one_per_question"),)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, text
+from sqlalchemy import Column, BigInteger, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.types import Text, Date, TIMESTAMP
 from mini_ddq_app.db import Base
@@ -11,4 +11,6 @@ class Tenant(Base):
     contract_end = Column(Date)
     status = Column(Text, nullable=False, server_default=text("'active'"))
     created_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
-    updated_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
\ No newline at end of file
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=text("now()"))
+    data_version = Column(BigInteger, nullable=False, server_default=text("0"))  # bumped by every write (see versioning.py)
+    questions_version = Column(BigInteger, nullable=False, server_default=text("0"))  # bumped by question writes only
\ No newline at end of file
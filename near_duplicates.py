@@ -0,0 +1,149 @@
+"""
+Per-tenant MinHash/LSH index over question text, used by the importer to flag or skip
+reworded copies of questions the tenant already has.
+
+- signatures(): MinHash signatures (NUM_PERM uint32 values) of the character 5-gram shingles
+  of the normalised text, computed for a batch of texts with NumPy in chunks of CHUNK texts
+  (the hash matrix grows with the shingle count, so a whole upload at once could need GBs).
+- Signatures are stored in questions.minhash (bytea) on every insert, so an index is rebuilt
+  from stored bytes (no re-hashing), and then kept current from the change feed like answer_index.
+- LSH: BANDS bands of ROWS values each; questions sharing any band bucket are candidates, and
+  candidates are confirmed by their estimated Jaccard similarity (share of equal signature values).
+  A lookup touches BANDS buckets, independent of how many questions the tenant has.
+
+Notes:
+- With 16 bands x 4 rows, pairs at Jaccard 0.7 become candidates ~99% of the time and pairs at
+  0.3 ~12% of the time; the threshold check discards those.
+- Hashing uses crc32 with fixed permutation seeds, so stored signatures stay valid across
+  processes and restarts. Changing NUM_PERM / the shingling invalidates them (re-backfill).
+"""
+
+import re
+import threading
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from mini_ddq_app.answer_index import SYNC_PAGE, TenantIndexRegistry
+from mini_ddq_app.changefeed import changed_after
+from mini_ddq_app.models.question import Question
+
+NUM_PERM = 64
+BANDS, ROWS = 16, 4
+SHINGLE = 5
+DEFAULT_THRESHOLD = 0.7
+CHUNK = 256  # texts hashed per pass: ~10 MB of (NUM_PERM, shingles) uint64 for typical questions
+
+_PRIME = (1 << 31) - 1  # a * crc32 < 2**63, so the universal hash never overflows uint64
+_rng = np.random.RandomState(20241019)
+_A = _rng.randint(1, _PRIME, size=NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, _PRIME, size=NUM_PERM).astype(np.uint64)
+
+_WORD = re.compile(r"\w+")
+
+
+def _shingles(text: str) -> List[int]:
+    t = " ".join(_WORD.findall((text or "").lower()))
+    if len(t) <= SHINGLE:
+        return [zlib.crc32(t.encode())]
+    return sorted({zlib.crc32(t[i:i + SHINGLE].encode()) for i in range(len(t) - SHINGLE + 1)})
+
+
+def signatures(texts: Sequence[str]) -> np.ndarray:
+    """(len(texts), NUM_PERM) uint32 MinHash signatures, vectorized over CHUNK texts at a time."""
+    out = np.empty((len(texts), NUM_PERM), dtype=np.uint32)
+    for start in range(0, len(texts), CHUNK):
+        shingles = [_shingles(t) for t in texts[start:start + CHUNK]]
+        flat = np.fromiter((h for s in shingles for h in s), dtype=np.uint64)
+        starts = np.cumsum([0] + [len(s) for s in shingles[:-1]])
+        hashed = (np.outer(_A, flat) + _B[:, None]) % _PRIME      # (NUM_PERM, shingles in the chunk)
+        out[start:start + len(shingles)] = np.minimum.reduceat(hashed, starts, axis=1).T
+    return out
+
+
+def to_bytes(sig: np.ndarray) -> bytes:
+    return sig.astype("<u4").tobytes()
+
+
+def from_bytes(raw: bytes) -> np.ndarray:
+    return np.frombuffer(raw, dtype="<u4").astype(np.uint32)
+
+
+class TenantDuplicateIndex:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.cursor: Tuple[int, int] = (0, 0)
+        self._sigs: Dict[str, np.ndarray] = {}                   # question_id -> signature
+        self._qn: Dict[str, str] = {}                            # question_id -> questionnaire_id
+        self._buckets: Dict[Tuple[int, bytes], Set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._sigs)
+
+    @staticmethod
+    def _bands(sig: np.ndarray):
+        for b in range(BANDS):
+            yield b, sig[b * ROWS:(b + 1) * ROWS].tobytes()
+
+    def upsert(self, question_id: str, questionnaire_id: str, sig: np.ndarray) -> None:
+        self.remove(question_id)
+        self._sigs[question_id] = sig
+        self._qn[question_id] = questionnaire_id
+        for key in self._bands(sig):
+            self._buckets[key].add(question_id)
+
+    def remove(self, question_id: str) -> None:
+        old = self._sigs.pop(question_id, None)
+        if old is None:
+            return
+        self._qn.pop(question_id, None)
+        for key in self._bands(old):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(question_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def best_match(self, sig: np.ndarray, threshold: float = DEFAULT_THRESHOLD,
+                   questionnaire_id: Optional[str] = None) -> Optional[Tuple[str, float]]:
+        """Most similar indexed question (id, estimated Jaccard) at or above threshold, if any."""
+        candidates: Set[str] = set()
+        for key in self._bands(sig):
+            candidates |= self._buckets.get(key, set())
+        best = None
+        for qid in candidates:
+            if questionnaire_id is not None and self._qn[qid] != questionnaire_id:
+                continue
+            score = float(np.mean(self._sigs[qid] == sig))
+            if score >= threshold and (best is None or score > best[1]):
+                best = (qid, score)
+        return best
+
+    def sync(self, db: Session, tenant_id: str) -> None:
+        """Apply questions changed since self.cursor (the first call loads every stored signature)."""
+        while True:
+            rows = db.execute(
+                select(
+                    Question.id, Question.questionnaire_id, Question.minhash, Question.question_text,
+                    Question.change_txid, Question.change_seq,
+                )
+                .where(*changed_after(Question, tenant_id, *self.cursor))
+                .order_by(Question.change_txid, Question.change_seq)
+                .limit(SYNC_PAGE)
+            ).all()
+            missing = [r for r in rows if r.minhash is None]   # rows written before signatures existed
+            computed = dict(zip((r.id for r in missing), signatures([r.question_text for r in missing])))
+            for r in rows:
+                sig = from_bytes(r.minhash) if r.minhash is not None else computed[r.id]
+                self.upsert(str(r.id), str(r.questionnaire_id), sig)
+            if rows:
+                self.cursor = (rows[-1].change_txid, rows[-1].change_seq)
+            if len(rows) < SYNC_PAGE:
+                return
+
+
+registry = TenantIndexRegistry(TenantDuplicateIndex)
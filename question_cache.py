@@ -0,0 +1,64 @@
+"""
+Read-through cache of serialized GET /questions responses, per tenant and questionnaire.
+
+- One entry per (tenant, questionnaire or "all"), holding the questions_version it was built from,
+  its ETag and the JSON body bytes. A hit skips the query and the serialization entirely.
+- Entries are checked against the current questions_version on read, so a write made by another
+  worker (or a path that forgot to invalidate) can never be served stale.
+- invalidate(): called by create_question, the importer and the bulk update after they commit,
+  so memory is released right away instead of waiting for LRU/TTL.
+- Backend: in-process LRUCache by default (bounded by entry count and bytes); set
+  QUESTION_CACHE_URL=redis://... to share one cache across all workers (cache.RedisCache).
+
+Notes:
+- Values are packed as bytes ("<version>\\n<etag>\\n<body>") so both backends store the same thing.
+"""
+
+from typing import Iterable, Optional, Tuple
+
+from mini_ddq_app import metrics
+from mini_ddq_app.cache import LRUCache, MISSING, RedisCache
+from mini_ddq_app.config import settings
+
+ALL = "all"
+
+
+def _key(tenant_id, questionnaire_id) -> str:
+    return f"questions:{tenant_id}:{questionnaire_id or ALL}"
+
+
+class QuestionListCache:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def get(self, tenant_id, questionnaire_id, version: int) -> Optional[Tuple[str, bytes]]:
+        """(etag, body) if an entry for exactly this questions_version exists."""
+        raw = self.backend.get(_key(tenant_id, questionnaire_id))
+        if raw is MISSING:
+            return None
+        cached_version, etag, body = raw.split(b"\n", 2)
+        if int(cached_version) != version:
+            return None
+        return etag.decode(), body
+
+    def set(self, tenant_id, questionnaire_id, version: int, etag: str, body: bytes) -> None:
+        self.backend.set(_key(tenant_id, questionnaire_id), f"{version}\n{etag}\n".encode() + body)
+
+    def invalidate(self, tenant_id, questionnaire_ids: Iterable = ()) -> None:
+        self.backend.pop(_key(tenant_id, None))
+        for qn_id in questionnaire_ids:
+            self.backend.pop(_key(tenant_id, qn_id))
+
+    def stats(self):
+        return self.backend.stats()
+
+
+def _make_backend():
+    if settings.QUESTION_CACHE_URL:
+        return RedisCache(settings.QUESTION_CACHE_URL, ttl=settings.QUESTION_CACHE_TTL)
+    return LRUCache(maxsize=settings.QUESTION_CACHE_SIZE, ttl=settings.QUESTION_CACHE_TTL,
+                    maxbytes=settings.QUESTION_CACHE_MAX_BYTES)
+
+
+question_lists = QuestionListCache(_make_backend())
+metrics.register_cache("question_lists", question_lists.stats)
@@ -0,0 +1,48 @@
+# mini_ddq_app/routes/events.py
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from mini_ddq_app.db import get_db
+from mini_ddq_app.deps import get_current_user
+from mini_ddq_app.events import broker, Subscription
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+KEEPALIVE_SECONDS = 15
+
+
+async def _sse(request: Request, sub: Subscription):
+    try:
+        yield "retry: 3000\n\n"
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"  # keeps proxies from closing an idle stream
+                continue
+            yield f"event: {event.get('kind', 'change')}\ndata: {json.dumps(event)}\n\n"
+    finally:
+        broker.unsubscribe(sub)
+
+
+@router.get("/stream", summary="Server-sent events for question/response changes in the current tenant")
+async def stream_changes(
+    request: Request,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+):
+    # Auth is done; give the pooled connection back, the stream may stay open for hours.
+    await run_in_threadpool(db.close)
+
+    broker.ensure_started()
+    sub = broker.subscribe(user.tenant_id)
+    return StreamingResponse(
+        _sse(request, sub),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,23 @@
+# mini_ddq_app/routes/health.py
+from fastapi import APIRouter
+from mini_ddq_app.serialization import ORJSONResponse
+
+from mini_ddq_app import warmup
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/healthz", include_in_schema=False, summary="Liveness: the process is up and serving")
+def liveness():
+    return {"status": "ok"}
+
+
+@router.get("/readyz", include_in_schema=False,
+            summary="Readiness: warmup finished and the database answers (503 until then)")
+def readiness():
+    body = warmup.state.snapshot()
+    if not body["warm"]:
+        return ORJSONResponse({"status": "warming", **body}, status_code=503)
+    if not warmup.database_ok():
+        return ORJSONResponse({"status": "database unavailable", **body}, status_code=503)
+    return {"status": "ready", **body}
@@ -1,14 +1,26 @@
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status, Query, BackgroundTasks
+from pydantic import UUID4
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Literal, Tuple
 import csv
 import io
 import json
+import uuid
 
-from mini_ddq_app.db import get_db
+from mini_ddq_app.answer_index import registry as answer_indexes
+from mini_ddq_app.config import settings
+from mini_ddq_app.db import get_db, SessionLocal
 from mini_ddq_app.deps import get_current_user, require_role
+from mini_ddq_app.events import publish
+from mini_ddq_app.question_cache import question_lists
+from mini_ddq_app.near_duplicates import DEFAULT_THRESHOLD, registry as dup_indexes, signatures, to_bytes
+from mini_ddq_app.versioning import bump_versions
 from mini_ddq_app.models.questionnaire import Questionnaire
 from mini_ddq_app.models.question import Question
+from mini_ddq_app.models.response import Response as ResponseModel
+from mini_ddq_app.models.import_job import ImportJob
 
 router = APIRouter(prefix="/imports", tags=["imports"])
 
@@ -58,11 +70,57 @@ def _parse_json(content: bytes) -> List[Dict[str, Any]]:
         })
     return rows
 
-def _import_rows(db: Session, tenant_id, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+# (question_id, questionnaire_id, text) of each imported question, collected for autofill
+Created = List[Tuple[str, str, str]]
+AUTOFILL_BATCH = 500
+MAX_DUPLICATES_REPORTED = 200
+
+def _commit_batch(db: Session, tenant_id, batch: List[Question], created: Optional[Created] = None,
+                  progress: Optional[Callable[[], None]] = None) -> None:
+    """Commit one importer batch, bump data versions and announce it to change subscribers."""
+    db.flush()  # assigns ids
+    questionnaire_ids = sorted({str(q.questionnaire_id) for q in batch})
+    publish(db, tenant_id, "question", "imported", [q.id for q in batch], questionnaire_ids=questionnaire_ids)
+    bump_versions(db, tenant_id, questionnaire_ids, questions=True)
+    if created is not None:
+        created.extend((str(q.id), str(q.questionnaire_id), q.question_text) for q in batch)
+    if progress:
+        progress()  # job counters commit together with the batch
+    db.commit()
+    question_lists.invalidate(tenant_id, questionnaire_ids)
+
+def _import_rows(db: Session, tenant_id, rows: List[Dict[str, Any]], created: Optional[Created] = None,
+                 progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 dedupe: str = "off", dedupe_threshold: float = DEFAULT_THRESHOLD,
+                 dedupe_scope: str = "questionnaire") -> Dict[str, Any]:
     """Core importer: validate rows, enforce tenant, insert in small batches."""
     stats = {"rows_total": len(rows), "rows_ok": 0, "rows_failed": 0, "errors": []}
+    if dedupe != "off":
+        stats.update(rows_duplicate=0, duplicates=[])
+    # one vectorized pass for the whole file; stored on every row so indexes never re-hash
+    sigs = signatures([r.get("text") or "" for r in rows])
+
+    if dedupe == "off":
+        _insert_rows(db, tenant_id, rows, sigs, stats, created, progress)
+        return stats
+
+    index = dup_indexes.get(tenant_id)
+    with index.lock:  # one importer per tenant (per worker) at a time sees a consistent index
+        try:
+            index.sync(db, tenant_id)
+            _insert_rows(db, tenant_id, rows, sigs, stats, created, progress,
+                         index, dedupe, dedupe_threshold, dedupe_scope)
+        except Exception:
+            dup_indexes.drop(tenant_id)  # may hold rows that were rolled back
+            raise
+    return stats
+
+def _insert_rows(db: Session, tenant_id, rows: List[Dict[str, Any]], sigs, stats: Dict[str, Any],
+                 created: Optional[Created], progress, index=None, dedupe: str = "off",
+                 dedupe_threshold: float = DEFAULT_THRESHOLD, dedupe_scope: str = "questionnaire") -> None:
+    report = (lambda: progress(stats)) if progress else None
     BATCH = 100
-    batch_count = 0
+    batch: List[Question] = []
 
     for idx, r in enumerate(rows, start=1):
         qn_id = r.get("questionnaire_id")
@@ -80,26 +138,102 @@ def _import_rows(db: Session, tenant_id, rows: List[Dict[str, Any]]) -> Dict[str
             stats["errors"].append({"row": idx, "error": "Questionnaire not found for this tenant"})
             continue
 
-        # create question
+        # near-duplicate check: LSH lookup against the tenant's questions and earlier rows of this file
+        if index is not None:
+            match = index.best_match(sigs[idx - 1], dedupe_threshold,
+                                     qn_id if dedupe_scope == "questionnaire" else None)
+            if match:
+                stats["rows_duplicate"] += 1
+                if len(stats["duplicates"]) < MAX_DUPLICATES_REPORTED:
+                    stats["duplicates"].append({
+                        "row": idx, "duplicate_of": match[0], "similarity": round(match[1], 3),
+                        "action": "skipped" if dedupe == "skip" else "flagged",
+                    })
+                if dedupe == "skip":
+                    continue
+
+        # create question (id assigned here so the index can see it before the batch flushes)
         q = Question(
+            id=uuid.uuid4(),
             tenant_id=tenant_id,
             questionnaire_id=qn_id,
             question_text=text,
             category=r.get("category"),
             is_required=(r.get("is_required") if r.get("is_required") is not None else False),
             display_order=r.get("display_order"),
+            minhash=to_bytes(sigs[idx - 1]),
         )
         db.add(q)
         stats["rows_ok"] += 1
-        batch_count += 1
+        batch.append(q)
+        if index is not None:
+            index.upsert(str(q.id), qn_id, sigs[idx - 1])
+
+        if len(batch) >= BATCH:
+            _commit_batch(db, tenant_id, batch, created, report)
+            batch = []
+
+    if batch:
+        _commit_batch(db, tenant_id, batch, created, report)
+
+def _autofill_drafts(db: Session, tenant_id, created: Created, user_id=None,
+                     min_score: float = settings.AUTOFILL_MIN_SCORE,
+                     progress: Optional[Callable[[int, int], None]] = None) -> int:
+    """
+    Draft an answer for each imported question from the tenant's most similar final response.
+    One vectorized pass scores every question; drafts are then written in multi-row INSERTs.
+    Questions that already have a response are left alone. Returns the number of drafts written.
+    """
+    if not created:
+        return 0
+    index = answer_indexes.get(tenant_id)
+    index.refresh(db, tenant_id)
+    with index.lock:
+        best = [hits[0] if hits else None for hits in index.query_many([t for _, _, t in created], 1)]
 
-        if batch_count >= BATCH:
-            db.commit()
-            batch_count = 0
+    source_ids = {hit[0][0] for hit in best if hit and hit[1] >= min_score}
+    answers = {
+        str(rid): answer
+        for rid, answer in db.execute(
+            select(ResponseModel.id, ResponseModel.answer).where(
+                ResponseModel.tenant_id == tenant_id,
+                ResponseModel.id.in_(source_ids),
+                ResponseModel.status == "final",  # the index may lag a just-retracted answer
+            )
+        ).all()
+    } if source_ids else {}
 
-    if batch_count:
+    filled = 0
+    for start in range(0, len(created), AUTOFILL_BATCH):
+        values = [
+            {
+                "tenant_id": tenant_id,
+                "question_id": qid,
+                "answer": answers[hit[0][0]],
+                "status": "draft",
+                "source_response_id": hit[0][0],
+                "confidence": round(hit[1], 4),
+                "updated_by": user_id,
+            }
+            for (qid, _, _), hit in zip(created[start:start + AUTOFILL_BATCH], best[start:start + AUTOFILL_BATCH])
+            if hit and hit[1] >= min_score and hit[0][0] in answers
+        ]
+        if values:
+            written = db.execute(
+                pg_insert(ResponseModel)
+                .values(values)
+                .on_conflict_do_nothing(constraint="uq_responses_one_per_question")
+                .returning(ResponseModel.id)
+            ).scalars().all()
+            if written:
+                qn_ids = sorted({qn for _, qn, _ in created[start:start + AUTOFILL_BATCH]})
+                publish(db, tenant_id, "response", "autofilled", written, questionnaire_ids=qn_ids)
+                bump_versions(db, tenant_id, qn_ids)
+            filled += len(written)
+        if progress:
+            progress(min(start + AUTOFILL_BATCH, len(created)), filled)
         db.commit()
-    return stats
+    return filled
 
 def _detect_format(filename: str, content_type: str) -> str:
     # simple heuristic by extension, fallback to content-type
@@ -114,15 +248,45 @@ def _detect_format(filename: str, content_type: str) -> str:
     return "csv"  # default to CSV
 
 
+def _trim_errors(errors: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    if len(errors) > 10:
+        return errors[:10] + [{"row": "...", "error": "…truncated…"}]
+    return errors
+
+
 # --------- background worker ---------
-def _background_import(file_bytes: bytes, fmt: str, tenant_id, db_factory) -> None:
+def _background_import(job_id, file_bytes: bytes, fmt: str, tenant_id, user_id, autofill: str,
+                       min_score: float, dedupe: Dict[str, Any], db_factory) -> None:
     db = db_factory()
     try:
-        rows = _parse_csv(file_bytes) if fmt == "csv" else _parse_json(file_bytes)
-        _import_rows(db, tenant_id, rows)
-    except Exception:
-        # best-effort background; log in real app
-        pass
+        job = db.get(ImportJob, job_id)
+        job.status, job.stage = "running", "importing"
+        db.commit()
+
+        def on_import(stats):
+            job.rows_total, job.rows_ok, job.rows_failed = stats["rows_total"], stats["rows_ok"], stats["rows_failed"]
+            job.rows_duplicate = stats.get("rows_duplicate", 0)
+            job.errors = _trim_errors(stats["errors"])
+
+        def on_autofill(done, filled):
+            job.autofill_done, job.autofilled = done, filled
+
+        try:
+            rows = _parse_csv(file_bytes) if fmt == "csv" else _parse_json(file_bytes)
+            created: Optional[Created] = [] if autofill == "draft" else None
+            stats = _import_rows(db, tenant_id, rows, created, on_import, **dedupe)
+            on_import(stats)  # rows that failed after the last committed batch
+            if created:
+                job.stage, job.autofill_total = "autofill", len(created)
+                db.commit()
+                _autofill_drafts(db, tenant_id, created, user_id, min_score, on_autofill)
+            job.status = "succeeded"
+        except Exception as e:
+            db.rollback()
+            job.status = "failed"
+            job.errors = list(job.errors or []) + [{"row": None, "error": f"{type(e).__name__}: {e}"}]
+        job.finished_at = func.now()
+        db.commit()
     finally:
         db.close()
 
@@ -133,14 +297,27 @@ def _background_import(file_bytes: bytes, fmt: str, tenant_id, db_factory) -> No
     dependencies=[Depends(require_role("admin", "analyst"))],
     summary="Bulk import questions (CSV or JSON). Use ?sync=true to wait for result."
 )
-async def import_questions(
+def import_questions(
     background: BackgroundTasks,
     file: UploadFile = File(..., description="CSV with headers: questionnaire_id,text,category,is_required,display_order OR JSON list of objects with same keys"),
     sync: bool = Query(False, description="Run synchronously and return summary"),
+    autofill: Literal["off", "draft"] = Query(
+        "off", description="draft: after import, pre-fill each new question with a draft copied from the "
+                           "tenant's most similar final answer (with confidence + source_response_id)"),
+    min_confidence: float = Query(settings.AUTOFILL_MIN_SCORE, ge=0.0, le=1.0,
+                                  description="autofill: minimum question similarity to draft an answer"),
+    dedupe: Literal["off", "flag", "skip"] = Query(
+        "off", description="near-duplicate questions (reworded copies): flag = import and report them, "
+                           "skip = report and don't import"),
+    dedupe_threshold: float = Query(DEFAULT_THRESHOLD, ge=0.3, le=1.0,
+                                    description="dedupe: minimum estimated Jaccard similarity of the texts"),
+    dedupe_scope: Literal["questionnaire", "tenant"] = Query(
+        "questionnaire", description="dedupe: compare against the target questionnaire only, or all of the tenant's questions"),
     db: Session = Depends(get_db),
     user = Depends(get_current_user),
 ):
-    data = await file.read()
+    # plain def: parsing, inserts and autofill are blocking, so the whole handler runs in the threadpool
+    data = file.file.read()
     fmt = _detect_format(file.filename or "", file.content_type or "")
 
     if sync:
@@ -149,13 +326,55 @@ async def import_questions(
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Parse error: {e}")
 
-        stats = _import_rows(db, user.tenant_id, rows)
+        created: Optional[Created] = [] if autofill == "draft" else None
+        stats = _import_rows(db, user.tenant_id, rows, created, dedupe=dedupe,
+                             dedupe_threshold=dedupe_threshold, dedupe_scope=dedupe_scope)
         # Trim error samples for brevity
-        if len(stats["errors"]) > 10:
-            stats["errors"] = stats["errors"][:10] + [{"row": "...", "error": "…truncated…"}]
+        stats["errors"] = _trim_errors(stats["errors"])
+        if created is not None:
+            stats["autofilled"] = _autofill_drafts(db, user.tenant_id, created, user.id, min_confidence)
         return {"mode": "sync", "format": fmt, **stats}
 
-    # async path: fire-and-forget
-    background.add_task(_background_import, data, fmt, user.tenant_id, type(db))
-    # simple receipt (in a real app you'd persist a job record)
-    return {"mode": "async", "status": "accepted", "format": fmt, "note": "Job running in background"}
\ No newline at end of file
+    # async path: persist a job record, then hand off to a worker with its own session
+    job = ImportJob(tenant_id=user.tenant_id, created_by=user.id, format=fmt, autofill=autofill, dedupe=dedupe)
+    db.add(job)
+    db.commit()
+    background.add_task(_background_import, job.id, data, fmt, user.tenant_id, user.id, autofill,
+                        min_confidence,
+                        {"dedupe": dedupe, "dedupe_threshold": dedupe_threshold, "dedupe_scope": dedupe_scope},
+                        SessionLocal)
+    return {"mode": "async", "status": "accepted", "format": fmt, "job_id": str(job.id),
+            "note": "Job running in background; poll /imports/jobs/{job_id}"}
+
+
+@router.get(
+    "/jobs/{job_id}",
+    dependencies=[Depends(require_role("admin", "analyst"))],
+    summary="Progress of a background import (and its autofill stage)"
+)
+def get_import_job(
+    job_id: UUID4,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+):
+    job = db.query(ImportJob).filter(ImportJob.id == str(job_id), ImportJob.tenant_id == user.tenant_id).first()
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found")
+    return {
+        "job_id": str(job.id),
+        "status": job.status,
+        "stage": job.stage,
+        "format": job.format,
+        "autofill": job.autofill,
+        "rows_total": job.rows_total,
+        "rows_ok": job.rows_ok,
+        "rows_failed": job.rows_failed,
+        "dedupe": job.dedupe,
+        "rows_duplicate": job.rows_duplicate,
+        "autofill_total": job.autofill_total,
+        "autofill_done": job.autofill_done,
+        "autofilled": job.autofilled,
+        "errors": job.errors,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+    }
\ No newline at end of file
@@ -0,0 +1,23 @@
+# mini_ddq_app/routes/metrics.py
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+
+from mini_ddq_app import metrics, slow_queries
+from mini_ddq_app.deps import require_role
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False,
+            summary="Prometheus metrics for this worker")
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@router.get("/metrics/slow-queries", dependencies=[Depends(require_role("admin"))],
+            summary="Recent slow statements with sampled EXPLAIN plans, newest first (admin; this worker)")
+def recent_slow_queries(limit: int = Query(50, ge=1, le=500)):
+    log = slow_queries.slow_log
+    if log is None:
+        return {"enabled": False, "entries": []}
+    return {"enabled": True, "threshold_ms": log.threshold * 1000, "entries": log.recent(limit)}
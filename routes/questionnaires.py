@@ -0,0 +1,175 @@
+# mini_ddq_app/routes/questionnaires.py
+import gzip
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from pydantic import BaseModel, UUID4
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from mini_ddq_app.db import get_db
+from mini_ddq_app.deps import get_current_user, require_role
+from mini_ddq_app.events import publish
+from mini_ddq_app.snapshots import document_etag, load_snapshot, render_document, store_snapshot
+from mini_ddq_app.versioning import bump_versions, not_modified
+from mini_ddq_app.models.questionnaire import Questionnaire
+from mini_ddq_app.models.questionnaire_stats import QuestionnaireStats
+
+router = APIRouter(prefix="/questionnaires", tags=["questionnaires"])
+
+# ----- Schemas -----
+class QuestionnaireStatsOut(BaseModel):
+    questionnaire_id: UUID4
+    total_questions: int
+    required_questions: int
+    answered: int
+    final: int
+    draft: int
+    rejected: int
+    percent_complete: float  # final responses / total questions
+
+class QuestionnaireFinalizeOut(BaseModel):
+    questionnaire_id: UUID4
+    status: str
+    data_version: int
+    etag: str
+    raw_size: int         # bytes of the JSON document
+    compressed_size: int  # bytes stored / sent to gzip-capable clients
+
+FINAL_STATUS = "final"
+
+# ----- Helpers -----
+def _get_questionnaire_or_404(db: Session, questionnaire_id: UUID4, tenant_id: str) -> Questionnaire:
+    qn = (
+        db.query(Questionnaire)
+        .filter(Questionnaire.id == str(questionnaire_id), Questionnaire.tenant_id == tenant_id)
+        .first()
+    )
+    if not qn:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Questionnaire not found")
+    return qn
+
+_COUNTERS = (
+    func.coalesce(QuestionnaireStats.total_questions, 0),
+    func.coalesce(QuestionnaireStats.required_questions, 0),
+    func.coalesce(QuestionnaireStats.answered, 0),
+    func.coalesce(QuestionnaireStats.final_count, 0),
+    func.coalesce(QuestionnaireStats.draft_count, 0),
+    func.coalesce(QuestionnaireStats.rejected_count, 0),
+)
+
+def _stats_query(db: Session, tenant_id: str):
+    # Questionnaires without any question yet have no stats row -> all zeros.
+    return (
+        db.query(Questionnaire.id, *_COUNTERS)
+        .outerjoin(QuestionnaireStats, QuestionnaireStats.questionnaire_id == Questionnaire.id)
+        .filter(Questionnaire.tenant_id == tenant_id)
+    )
+
+def _to_out(row) -> QuestionnaireStatsOut:
+    qn_id, total, required, answered, final, draft, rejected = row
+    return QuestionnaireStatsOut(
+        questionnaire_id=qn_id,
+        total_questions=total,
+        required_questions=required,
+        answered=answered,
+        final=final,
+        draft=draft,
+        rejected=rejected,
+        percent_complete=round(100.0 * final / total, 1) if total else 0.0,
+    )
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """True if Accept-Encoding allows gzip with q > 0, explicitly or via "*" (gzip;q=0 refuses it)."""
+    qvalues = {}
+    for item in accept_encoding.split(","):
+        coding, *params = [p.strip() for p in item.split(";")]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qvalues[coding.lower()] = q
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qvalues:
+            return qvalues[coding] > 0
+    return False
+
+# ----- Routes -----
+@router.get("/stats", response_model=List[QuestionnaireStatsOut],
+            summary="Completion stats for every questionnaire of the current tenant")
+def list_questionnaire_stats(
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+):
+    return [_to_out(row) for row in _stats_query(db, user.tenant_id).all()]
+
+@router.get("/{questionnaire_id}/stats", response_model=QuestionnaireStatsOut,
+            summary="Completion stats for one questionnaire (tenant-scoped)")
+def get_questionnaire_stats(
+    questionnaire_id: UUID4,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+):
+    row = _stats_query(db, user.tenant_id).filter(Questionnaire.id == str(questionnaire_id)).first()
+    if not row:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Questionnaire not found")
+    return _to_out(row)
+
+@router.post("/{questionnaire_id}/finalize", response_model=QuestionnaireFinalizeOut,
+             dependencies=[Depends(require_role("admin"))],
+             summary="Mark a questionnaire final and store its pre-rendered document (admin)")
+def finalize_questionnaire(
+    questionnaire_id: UUID4,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+):
+    qn = _get_questionnaire_or_404(db, questionnaire_id, user.tenant_id)
+    qn.status = FINAL_STATUS
+    db.flush()
+    publish(db, user.tenant_id, "questionnaire", "finalized", [qn.id])
+    bump_versions(db, user.tenant_id, [qn.id])
+    db.refresh(qn)  # pick up the bumped data_version the snapshot is tagged with
+    snap = store_snapshot(db, qn)
+    db.commit()
+    return QuestionnaireFinalizeOut(
+        questionnaire_id=snap.questionnaire_id,
+        status=FINAL_STATUS,
+        data_version=snap.data_version,
+        etag=snap.etag,
+        raw_size=snap.raw_size,
+        compressed_size=len(snap.content),
+    )
+
+@router.get("/{questionnaire_id}/document",
+            summary="Full questionnaire with questions and answers; finalized ones are served from a stored snapshot")
+def get_questionnaire_document(
+    questionnaire_id: UUID4,
+    request: Request,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+):
+    snap = load_snapshot(db, user.tenant_id, questionnaire_id)
+    if snap is None:
+        qn = _get_questionnaire_or_404(db, questionnaire_id, user.tenant_id)
+        if qn.status != FINAL_STATUS:
+            # still being edited: render live, never stored
+            etag = document_etag(qn.id, qn.data_version)
+            if not_modified(request, etag):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+            return Response(content=render_document(db, qn), media_type="application/json", headers={"ETag": etag})
+        snap = store_snapshot(db, qn)  # edited after finalize (or finalized before snapshots existed)
+        db.commit()
+
+    headers = {"ETag": snap.etag, "Vary": "Accept-Encoding"}
+    if not_modified(request, snap.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        return Response(content=snap.content, media_type="application/json",
+                        headers={**headers, "Content-Encoding": "gzip"})
+    return Response(content=gzip.decompress(snap.content), media_type="application/json", headers=headers)
@@ -1,12 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import Boolean, Integer, Text, case, cast, column, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import datetime
+from uuid import UUID
 from pydantic import BaseModel, UUID4, Field
 
+from mini_ddq_app.answer_index import registry as answer_indexes
 from mini_ddq_app.db import get_db
+from mini_ddq_app.near_duplicates import signatures, to_bytes
+from mini_ddq_app.changefeed import START_CURSOR, changes_since, format_cursor
 from mini_ddq_app.deps import get_current_user, require_role
+from mini_ddq_app.events import publish
+from mini_ddq_app.question_cache import question_lists
+from mini_ddq_app.serialization import json_response, rows_json, text_col
+from mini_ddq_app.versioning import bump_versions, make_etag, not_modified, questions_version
 from mini_ddq_app.models.question import Question
 from mini_ddq_app.models.questionnaire import Questionnaire
+from mini_ddq_app.models.response import Response as ResponseModel
 
 router = APIRouter(prefix="/questions", tags=["questions"])
 
@@ -30,6 +42,43 @@ class QuestionOut(BaseModel):
     class Config:
         from_attributes = True  # Pydantic v2
 
+class QuestionChangeOut(QuestionOut):
+    updated_at: Optional[datetime] = None
+    cursor: str
+
+class QuestionChangesPage(BaseModel):
+    items: List[QuestionChangeOut]
+    cursor: str       # pass back as ?since= on the next poll
+    has_more: bool
+
+class AnswerSuggestion(BaseModel):
+    response_id: UUID4
+    question_id: UUID4
+    question_text: str
+    answer: Optional[str] = None
+    score: float  # cosine similarity of the question texts, 0..1
+
+class QuestionBulkItem(BaseModel):
+    id: UUID4
+    # Only fields present in the payload are changed; explicit null clears display_order/category.
+    display_order: Optional[int] = None
+    category: Optional[str] = None
+    is_required: Optional[bool] = None
+
+class QuestionBulkUpdate(BaseModel):
+    questionnaire_id: UUID4
+    items: List[QuestionBulkItem] = Field(..., min_length=1, max_length=5000)
+
+class QuestionBulkResult(BaseModel):
+    questionnaire_id: UUID4
+    updated: int
+
+# QuestionOut as a Core projection: list reads never hydrate ORM objects
+QUESTION_OUT_COLUMNS = (
+    text_col(Question.id), text_col(Question.tenant_id), text_col(Question.questionnaire_id),
+    Question.question_text, Question.category, Question.is_required, Question.display_order,
+)
+
 # ----- Helpers -----
 def _ensure_questionnaire_in_tenant(db: Session, questionnaire_id: UUID4, tenant_id: str) -> Questionnaire:
     qn = (
@@ -48,14 +97,62 @@ def _ensure_questionnaire_in_tenant(db: Session, questionnaire_id: UUID4, tenant
     summary="List questions for current tenant (optionally filter by questionnaire)"
 )
 def list_questions(
+    request: Request,
     db: Session = Depends(get_db),
     user = Depends(get_current_user),
     questionnaire_id: Optional[UUID4] = Query(default=None),
 ):
-    q = db.query(Question).filter(Question.tenant_id == user.tenant_id)
+    version = questions_version(db, user.tenant_id, questionnaire_id)
+    etag = make_etag("questions", user.tenant_id, questionnaire_id, version)
+    if not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    # version is None for a questionnaire outside this tenant: the (empty) list is not worth caching
+    cached = question_lists.get(user.tenant_id, questionnaire_id, version) if version is not None else None
+    if cached:
+        return Response(content=cached[1], media_type="application/json", headers={"ETag": cached[0]})
+
+    stmt = select(*QUESTION_OUT_COLUMNS).where(Question.tenant_id == user.tenant_id)
     if questionnaire_id:
-        q = q.filter(Question.questionnaire_id == str(questionnaire_id))
-    return q.order_by(Question.display_order).all()
+        stmt = stmt.where(Question.questionnaire_id == str(questionnaire_id))
+    body = rows_json(db.execute(stmt.order_by(Question.display_order)))
+    if version is not None:
+        question_lists.set(user.tenant_id, questionnaire_id, version, etag, body)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+@router.get("/cache/stats", dependencies=[Depends(require_role("admin"))],
+            summary="Question list cache metrics (admin; per worker unless the backend is shared)")
+def question_cache_stats():
+    return question_lists.stats()
+
+@router.get(
+    "/changes",
+    response_model=QuestionChangesPage,
+    summary="Questions changed since a cursor (incremental sync)"
+)
+def list_question_changes(
+    since: str = Query(default=START_CURSOR, description="Cursor from the previous page; omit for a full sync"),
+    limit: int = Query(default=500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+):
+    rows, cursor, has_more = changes_since(db, Question, user.tenant_id, since, limit)
+    # built as plain dicts and encoded once (QuestionChangesPage shape); no second validation pass
+    items = [
+        {
+            "id": x.id,
+            "tenant_id": x.tenant_id,
+            "questionnaire_id": x.questionnaire_id,
+            "question_text": x.question_text,
+            "category": x.category,
+            "is_required": x.is_required,
+            "display_order": x.display_order,
+            "updated_at": x.updated_at,
+            "cursor": format_cursor(x.change_txid, x.change_seq),
+        }
+        for x in rows
+    ]
+    return json_response({"items": items, "cursor": cursor, "has_more": has_more})
 
 @router.post(
     "/",
@@ -78,9 +175,122 @@ def create_question(
         category=data.category,
         is_required=data.is_required,
         display_order=data.display_order,
+        minhash=to_bytes(signatures([data.text])[0]),
     )
     db.add(new_q)
+    db.flush()  # assigns new_q.id for the change event
+    publish(db, user.tenant_id, "question", "created", [new_q.id], questionnaire_id=str(data.questionnaire_id))
+    bump_versions(db, user.tenant_id, [data.questionnaire_id], questions=True)
     db.commit()
+    question_lists.invalidate(user.tenant_id, [data.questionnaire_id])
     db.refresh(new_q)
     return new_q
 
+@router.patch(
+    "/bulk",
+    response_model=QuestionBulkResult,
+    dependencies=[Depends(require_role("admin", "analyst"))],
+    summary="Reorder / bulk edit questions of one questionnaire in a single statement (admin/analyst)"
+)
+def bulk_update_questions(
+    data: QuestionBulkUpdate,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+):
+    ids = [str(item.id) for item in data.items]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Duplicate question ids")
+
+    rows = []
+    for item in data.items:
+        given = item.model_fields_set
+        rows.append((
+            str(item.id),
+            "display_order" in given, item.display_order,
+            "category" in given, item.category,
+            item.is_required is not None, item.is_required,
+        ))
+    v = values(
+        column("id", Text), column("set_order", Boolean), column("display_order", Integer),
+        column("set_category", Boolean), column("category", Text),
+        column("set_required", Boolean), column("is_required", Boolean),
+        name="v",
+    ).data(rows)
+
+    # UPDATE questions ... FROM (VALUES ...) v; the WHERE clause is the tenant check for every id at once.
+    # Casts: Postgres types VALUES columns from the literals, which are untyped for strings/all-NULL columns.
+    stmt = (
+        update(Question)
+        .where(
+            Question.id == cast(v.c.id, PGUUID(as_uuid=True)),
+            Question.tenant_id == user.tenant_id,
+            Question.questionnaire_id == str(data.questionnaire_id),
+        )
+        .values(
+            display_order=case((v.c.set_order, cast(v.c.display_order, Integer)), else_=Question.display_order),
+            category=case((v.c.set_category, cast(v.c.category, Text)), else_=Question.category),
+            is_required=case((v.c.set_required, cast(v.c.is_required, Boolean)), else_=Question.is_required),
+        )
+        .returning(Question.id)
+        .execution_options(synchronize_session=False)
+    )
+    updated = {str(qid) for qid in db.execute(stmt).scalars()}
+
+    if len(updated) != len(ids):
+        db.rollback()  # all-or-nothing
+        missing = [i for i in ids if i not in updated]
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"message": "Questions not found in this questionnaire", "ids": missing[:50]},
+        )
+
+    publish(db, user.tenant_id, "question", "bulk_updated", ids, questionnaire_id=str(data.questionnaire_id))
+    bump_versions(db, user.tenant_id, [data.questionnaire_id], questions=True)
+    db.commit()
+    question_lists.invalidate(user.tenant_id, [data.questionnaire_id])
+    return QuestionBulkResult(questionnaire_id=data.questionnaire_id, updated=len(updated))
+
+@router.get(
+    "/{question_id}/suggestions",
+    response_model=List[AnswerSuggestion],
+    summary="Earlier final answers to the most similar questions (answer reuse)"
+)
+def suggest_answers(
+    question_id: UUID4,
+    limit: int = Query(default=5, ge=1, le=50),
+    min_score: float = Query(default=0.3, ge=0.0, le=1.0),
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+):
+    question = (
+        db.query(Question)
+        .filter(Question.id == str(question_id), Question.tenant_id == user.tenant_id)
+        .first()
+    )
+    if not question:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Question not found")
+
+    index = answer_indexes.get(user.tenant_id)
+    index.refresh(db, user.tenant_id)
+    with index.lock:
+        # +1: the question's own final answer may be the top hit
+        hits = index.query_many([question.question_text], limit + 1)[0]
+
+    hits = [(meta, score) for meta, score in hits if meta[1] != str(question_id) and score >= min_score][:limit]
+    if not hits:
+        return []
+    answers = dict(
+        db.query(ResponseModel.id, ResponseModel.answer)
+        .filter(ResponseModel.tenant_id == user.tenant_id, ResponseModel.id.in_([m[0] for m, _ in hits]))
+        .all()
+    )
+    return [
+        AnswerSuggestion(
+            response_id=response_id,
+            question_id=qid,
+            question_text=text,
+            answer=answers.get(UUID(response_id)),
+            score=round(score, 4),
+        )
+        for (response_id, qid, text), score in hits
+    ]
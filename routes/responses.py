@@ -1,10 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from pydantic import BaseModel, UUID4
-from typing import Optional, List
+from typing import Literal, Optional, List
+from datetime import datetime
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from mini_ddq_app.config import settings
 from mini_ddq_app.db import get_db
+from mini_ddq_app.draft_buffer import PendingDraft, draft_buffer
+from mini_ddq_app.changefeed import START_CURSOR, changes_since, format_cursor
 from mini_ddq_app.deps import get_current_user, require_role
+from mini_ddq_app.events import publish
+from mini_ddq_app.serialization import json_response, rows_json, text_col, text_preview
+from mini_ddq_app.versioning import bump_versions, make_etag, not_modified, tenant_version
 from mini_ddq_app.models.response import Response as ResponseModel
 from mini_ddq_app.models.question import Question as QuestionModel
 
@@ -17,17 +25,49 @@ class ResponseOut(BaseModel):
     question_id: UUID4
     tenant_id: UUID4
     answer: Optional[str] = None
+    answer_truncated: Optional[bool] = None  # only with include=answer_preview
     status: str
 
     class Config:
         from_attributes = True  # pydantic v2 (a.k.a. orm_mode=True in v1)
 
 
+class ResponseChangeOut(ResponseOut):
+    updated_at: Optional[datetime] = None
+    cursor: str
+
+
+class ResponseChangesPage(BaseModel):
+    items: List[ResponseChangeOut]
+    cursor: str       # pass back as ?since= on the next poll
+    has_more: bool
+
+
 class ResponseUpsert(BaseModel):
     answer: Optional[str] = None
     status: Optional[str] = "draft"   # 'draft' | 'final' | 'rejected'
 
 
+AnswerInclude = Literal["answer_preview", "answer_full", "none"]
+DEFAULT_PREVIEW_CHARS = 200
+
+# ResponseOut as a Core projection: list reads never hydrate ORM objects
+RESPONSE_KEY_COLUMNS = (
+    text_col(ResponseModel.id), text_col(ResponseModel.question_id), text_col(ResponseModel.tenant_id),
+    ResponseModel.status,
+)
+RESPONSE_OUT_COLUMNS = RESPONSE_KEY_COLUMNS + (ResponseModel.answer,)
+
+
+def answer_columns(col, include: str, preview_chars: int = DEFAULT_PREVIEW_CHARS) -> tuple:
+    """Projection of an answer column for ?include=: a SQL-side preview, the full text, or nothing."""
+    if include == "answer_full":
+        return (col.label("answer"),)
+    if include == "answer_preview":
+        return text_preview(col, preview_chars, "answer")
+    return ()
+
+
 # ---------- Helpers ----------
 def _ensure_same_tenant_or_404(db: Session, question_id: UUID4, tenant_id: str) -> QuestionModel:
     q = (
@@ -48,25 +88,75 @@ def _ensure_same_tenant_or_404(db: Session, question_id: UUID4, tenant_id: str)
 
 @router.get("/", response_model=List[ResponseOut], summary="List responses for current tenant")
 def list_responses(
+    request: Request,
     status_filter: Optional[str] = Query(default=None, description="Filter by status: draft/final/rejected"),
+    include: AnswerInclude = Query(
+        "answer_full",
+        description="answer_full: whole text; answer_preview: first preview_chars characters + answer_truncated "
+                    "(full text of one answer: GET /responses/{question_id}); none: no answer",
+    ),
+    preview_chars: int = Query(DEFAULT_PREVIEW_CHARS, ge=20, le=5000),
     db: Session = Depends(get_db),
     user = Depends(get_current_user),
 ):
-    q = db.query(ResponseModel).filter(ResponseModel.tenant_id == user.tenant_id)
+    draft_buffer.flush(tenant_id=user.tenant_id)  # buffered autosaves become visible (and bump the version) first
+    etag = make_etag("responses", user.tenant_id, status_filter, include,
+                     preview_chars if include == "answer_preview" else None, tenant_version(db, user.tenant_id))
+    if not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    stmt = (
+        select(*RESPONSE_KEY_COLUMNS, *answer_columns(ResponseModel.answer, include, preview_chars))
+        .where(ResponseModel.tenant_id == user.tenant_id)
+    )
     if status_filter:
-        q = q.filter(ResponseModel.status == status_filter)
-    return q.all()
+        stmt = stmt.where(ResponseModel.status == status_filter)
+    return Response(content=rows_json(db.execute(stmt)), media_type="application/json", headers={"ETag": etag})
+
+
+@router.get("/changes", response_model=ResponseChangesPage,
+            summary="Responses changed since a cursor (incremental sync)")
+def list_response_changes(
+    since: str = Query(default=START_CURSOR, description="Cursor from the previous page; omit for a full sync"),
+    limit: int = Query(default=500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+):
+    rows, cursor, has_more = changes_since(db, ResponseModel, user.tenant_id, since, limit)
+    # built as plain dicts and encoded once (ResponseChangesPage shape); no second validation pass
+    items = [
+        {
+            "id": r.id,
+            "question_id": r.question_id,
+            "tenant_id": r.tenant_id,
+            "answer": r.answer,
+            "status": r.status,
+            "updated_at": r.updated_at,
+            "cursor": format_cursor(r.change_txid, r.change_seq),
+        }
+        for r in rows
+    ]
+    return json_response({"items": items, "cursor": cursor, "has_more": has_more})
 
 
 @router.get("/{question_id}", response_model=ResponseOut, summary="Get response for a question (tenant-scoped)")
 def get_response_for_question(
     question_id: UUID4,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     user = Depends(get_current_user),
 ):
-    # Validate question belongs to caller’s tenant
+    # Validate question belongs to caller’s tenant (before the ETag: a foreign id is 404, never 304)
     _ensure_same_tenant_or_404(db, question_id, user.tenant_id)
 
+    if draft_buffer.pending(user.tenant_id, question_id):
+        draft_buffer.flush(keys=[(user.tenant_id, question_id)])
+    etag = make_etag("response", user.tenant_id, question_id, tenant_version(db, user.tenant_id))
+    if not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
     resp = (
         db.query(ResponseModel)
         .filter(
@@ -80,6 +170,25 @@ def get_response_for_question(
     return resp
 
 
+def _buffer_draft(db: Session, question_id: UUID4, payload: ResponseUpsert, user) -> Optional[dict]:
+    """Queue a draft save of an existing response for write-behind; None if it must be written now (first save)."""
+    pending = draft_buffer.pending(user.tenant_id, question_id)
+    if pending is not None:  # already validated and looked up by an earlier save: no SQL at all
+        response_id, questionnaire_id = pending.response_id, pending.questionnaire_id
+    else:
+        row = db.execute(
+            select(ResponseModel.id, QuestionModel.questionnaire_id)
+            .join(QuestionModel, QuestionModel.id == ResponseModel.question_id)
+            .where(ResponseModel.tenant_id == user.tenant_id, ResponseModel.question_id == str(question_id))
+        ).first()
+        if row is None:
+            return None
+        response_id, questionnaire_id = str(row.id), str(row.questionnaire_id)
+    draft_buffer.put(user.tenant_id, question_id, PendingDraft(response_id, questionnaire_id, payload.answer, user.id))
+    return {"id": response_id, "question_id": question_id, "tenant_id": user.tenant_id,
+            "answer": payload.answer, "status": "draft"}
+
+
 @router.put("/{question_id}", response_model=ResponseOut,
             dependencies=[Depends(require_role("admin", "analyst"))],
             summary="Create/update the single response for a question (upsert)")
@@ -89,8 +198,17 @@ def upsert_response_for_question(
     db: Session = Depends(get_db),
     user = Depends(get_current_user),
 ):
+    if settings.DRAFT_WRITE_BEHIND:
+        if payload.status == "draft":  # status null keeps the stored one, which may be final: write it now
+            buffered = _buffer_draft(db, question_id, payload, user)
+            if buffered is not None:
+                return buffered
+        else:
+            # a buffered draft must not be flushed over this write later
+            draft_buffer.flush(keys=[(user.tenant_id, question_id)])
+
     # Ensure the question is in the same tenant
-    _ensure_same_tenant_or_404(db, question_id, user.tenant_id)
+    question = _ensure_same_tenant_or_404(db, question_id, user.tenant_id)
 
     # Try fetch existing single response (enforced by unique (tenant_id, question_id))
     resp = (
@@ -120,6 +238,10 @@ def upsert_response_for_question(
         )
         db.add(resp)
 
+    db.flush()  # assigns resp.id for a newly created response
+    publish(db, user.tenant_id, "response", "upserted", [resp.id],
+            question_id=str(question_id), status=resp.status)
+    bump_versions(db, user.tenant_id, [question.questionnaire_id])
     db.commit()
     db.refresh(resp)
     return resp
\ No newline at end of file
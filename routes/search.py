@@ -1,63 +1,228 @@
 # mini_ddq_app/routes/search.py
-from typing import Literal
-from sqlalchemy import func
-from fastapi import APIRouter, Depends, Query, HTTPException
+from typing import Literal, Optional
+from sqlalchemy import Float, case, cast, exists, func, literal, null, select, text, union_all
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
 from sqlalchemy.orm import Session
 
+from mini_ddq_app import metrics
+from mini_ddq_app.cache import LRUCache, MISSING
+from mini_ddq_app.config import settings
 from mini_ddq_app.db import get_db
-from mini_ddq_app.deps import get_current_user
+from mini_ddq_app.deps import get_current_user, require_role
+from mini_ddq_app.serialization import dumps
+from mini_ddq_app.routes.responses import DEFAULT_PREVIEW_CHARS, answer_columns
+from mini_ddq_app.versioning import tenant_version
 from mini_ddq_app.models.question import Question
-from mini_ddq_app.models.response import Response
+from mini_ddq_app.models.response import Response as ResponseModel
 
 router = APIRouter(prefix="/search", tags=["search"])
 
+# Must match the config used by the generated text_tsv / answer_tsv columns.
+TS_CONFIG = "english"
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+SearchMode = Literal["auto", "fts", "substring", "fuzzy"]
+SearchInclude = Literal["snippet", "answer_preview", "answer_full", "none"]
+
+# Snippets: computed in SQL for the returned page only, so full answers never leave the database.
+HIGHLIGHT_START, HIGHLIGHT_STOP = "<mark>", "</mark>"
+FRAGMENT_DELIMITER = " … "
+HEADLINE_MAX_CHARS = 100_000   # same cap as answer_tsv; ts_headline re-parses the text it is given
+CHARS_PER_WORD = 7             # window size for substring/fuzzy snippets, which count characters
+
+# Keyed on the tenant's data_version: every write path bumps it, so stale pages are never served.
+_cache = LRUCache(maxsize=settings.SEARCH_CACHE_SIZE, ttl=settings.SEARCH_CACHE_TTL)
+metrics.register_cache("search", _cache.stats)
+
+
+def _escape_like(q: str) -> str:
+    return q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _criteria(mode: str, q: str, text_col, tsv_col):
+    """(where clause, rank expression) for one searchable column; every branch is index-backed."""
+    if mode == "fts":
+        tsq = func.websearch_to_tsquery(TS_CONFIG, q)
+        return tsv_col.bool_op("@@")(tsq), func.ts_rank(tsv_col, tsq)
+    if mode == "fuzzy":
+        # word_similarity: best match of q against any extent of the text, so long answers aren't penalised
+        return literal(q).bool_op("<%")(text_col), func.word_similarity(q, text_col)
+    # substring: ILIKE served by the pg_trgm GIN index; no meaningful rank
+    return text_col.ilike(f"%{_escape_like(q)}%", escape="\\"), cast(literal(0.0), Float)
+
+
+def _hits(tenant_id: str, q: str, scope: str, mode: str):
+    """One UNION ALL over the requested scopes, projecting only the columns the result dicts need."""
+    branches = []
+    if scope in ("all", "questions"):
+        where, rank = _criteria(mode, q, Question.question_text, Question.text_tsv)
+        branches.append(
+            select(
+                literal("question").label("type"),
+                Question.id.label("id"),
+                null().label("question_id"),
+                Question.question_text.label("text"),
+                Question.category.label("category"),
+                null().label("answer"),
+                null().label("status"),
+                cast(rank, Float).label("rank"),
+            ).where(Question.tenant_id == tenant_id, where)
+        )
+    if scope in ("all", "responses"):
+        where, rank = _criteria(mode, q, ResponseModel.answer, ResponseModel.answer_tsv)
+        branches.append(
+            select(
+                literal("response").label("type"),
+                ResponseModel.id.label("id"),
+                ResponseModel.question_id.label("question_id"),
+                null().label("text"),
+                null().label("category"),
+                ResponseModel.answer.label("answer"),
+                ResponseModel.status.label("status"),
+                cast(rank, Float).label("rank"),
+            ).where(ResponseModel.tenant_id == tenant_id, ResponseModel.answer.isnot(None), where)
+        )
+    return union_all(*branches).subquery("hits") if len(branches) > 1 else branches[0].subquery("hits")
+
+
+def _snippet(mode: str, q: str, col, fragment_words: int, max_fragments: int):
+    """Highlighted fragments of `col` around the matches of q."""
+    if mode == "fts":
+        options = (
+            f'StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_STOP}", '
+            f"MaxWords={fragment_words}, MinWords={max(fragment_words // 2, 1)}, "
+            f'MaxFragments={max_fragments}, FragmentDelimiter="{FRAGMENT_DELIMITER}"'
+        )
+        return func.ts_headline(TS_CONFIG, func.left(col, HEADLINE_MAX_CHARS),
+                                func.websearch_to_tsquery(TS_CONFIG, q), options)
+
+    # substring / fuzzy: one character window around the first literal occurrence (q is lower-cased);
+    # fuzzy hits often have none, and then the window is the start of the text
+    half = fragment_words * CHARS_PER_WORD // 2
+    pos = func.strpos(func.lower(col), q)
+    start = func.greatest(pos - half, 1)
+    end = pos + len(q)
+    around = (
+        case((start > 1, "…"), else_="")
+        + func.substr(col, start, pos - start)
+        + HIGHLIGHT_START + func.substr(col, pos, len(q)) + HIGHLIGHT_STOP
+        + func.substr(col, end, half)
+        + case((func.length(col) >= end + half, "…"), else_="")
+    )
+    leading = func.left(col, 2 * half) + case((func.length(col) > 2 * half, "…"), else_="")
+    return case((pos > 0, around), else_=leading)
+
+
+def _search_page(db: Session, tenant_id: str, q: str, scope: str, mode: str, limit: int, offset: int,
+                 include: str = "answer_full", fragment_words: int = 30, max_fragments: int = 2,
+                 preview_chars: int = DEFAULT_PREVIEW_CHARS):
+    """Returns (rows, total) for one page of the merged, ranked hit list."""
+    hits = _hits(tenant_id, q, scope, mode)
+    page = (
+        select(hits, func.count().over().label("total"))
+        .order_by(hits.c.rank.desc(), hits.c.type, hits.c.id)  # id tie-break keeps pages stable
+        .limit(limit)
+        .offset(offset)
+        .subquery("page")
+    )
+    # the outer query only sees the page, so snippets/previews are built for at most `limit` rows
+    cols = [c for c in page.c if c.key != "answer"]
+    if include == "snippet":
+        cols.append(_snippet(mode, q, page.c.answer, fragment_words, max_fragments).label("snippet"))
+    else:
+        cols.extend(answer_columns(page.c.answer, include, preview_chars))
+    stmt = select(*cols).order_by(page.c.rank.desc(), page.c.type, page.c.id)
+    rows = db.execute(stmt).all()
+    return rows, (rows[0].total if rows else 0)
+
+
+def _has_hits(db: Session, tenant_id: str, q: str, scope: str, mode: str) -> bool:
+    """EXISTS probe: stops at the first index hit instead of ranking and counting them all."""
+    return db.execute(select(exists(_hits(tenant_id, q, scope, mode).select()))).scalar()
+
+
+def _to_result(row) -> dict:
+    if row.type == "question":
+        return {"type": "question", "id": str(row.id), "text": row.text, "category": row.category}
+    result = {"type": "response", "id": str(row.id), "question_id": str(row.question_id), "status": row.status}
+    for field in ("snippet", "answer", "answer_truncated"):
+        if field in row._fields:
+            result[field] = getattr(row, field)
+    return result
+
+
+def _run_search(db: Session, tenant_id: str, q: str, scope: str, mode: str,
+                fuzzy_threshold: float, limit: int, offset: int, **snippet_opts):
+    """Returns (result dicts, total) for one page."""
+    if mode == "fuzzy":
+        # transaction-local; lets the <% operator use the trigram index with our cut-off
+        db.execute(
+            text("SELECT set_config('pg_trgm.word_similarity_threshold', :t, true)"),
+            {"t": str(fuzzy_threshold)},
+        )
+
+    if mode == "auto":
+        # decided per query, not per page, so every page of a substring fallback stays on substring
+        mode = "fts" if _has_hits(db, tenant_id, q, scope, "fts") else "substring"
+    rows, total = _search_page(db, tenant_id, q, scope, mode, limit, offset, **snippet_opts)
+    return [_to_result(r) for r in rows], total
+
+
 @router.get("/", summary="Search questions/responses within current tenant")
 def search_items(
     q: str = Query(..., min_length=2, description="Search text"),
     scope: Literal["all", "questions", "responses"] = Query("all"),
+    mode: SearchMode = Query(
+        "auto",
+        description="fts: ranked full-text (websearch syntax); substring: plain ILIKE; "
+                    "fuzzy: trigram similarity, good for partial tokens like control IDs; "
+                    "auto: fts, falling back to substring when nothing matches (e.g. stop words, partial tokens)",
+    ),
+    threshold: Optional[float] = Query(None, ge=0.0, le=1.0, description="fuzzy mode: minimum word similarity"),
+    include: SearchInclude = Query(
+        "snippet",
+        description=f"snippet: response hits carry highlighted fragments ({HIGHLIGHT_START}…{HIGHLIGHT_STOP}, "
+                    "raw text, not HTML-escaped) instead of the answer; answer_preview: first preview_chars "
+                    "characters + answer_truncated; answer_full: the whole answer text; none: no answer",
+    ),
+    preview_chars: int = Query(DEFAULT_PREVIEW_CHARS, ge=20, le=5000, description="answer_preview: characters"),
+    fragment_words: int = Query(30, ge=5, le=100, description="snippet: approximate words per fragment"),
+    max_fragments: int = Query(2, ge=1, le=5, description="snippet: fragments per hit (full-text matches only)"),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    offset: int = Query(0, ge=0, le=10_000),
     db: Session = Depends(get_db),
     user = Depends(get_current_user),
 ):
-    results = []
-
-    if scope in ("all", "questions"):
-        questions = (
-            db.query(Question)
-            .filter(
-                Question.tenant_id == user.tenant_id,
-                Question.question_text.ilike(f"%{q}%"),
-            )
-            .limit(50)
-            .all()
-        )
-        results += [
-            {"type": "question", "id": str(x.id), "text": x.question_text, "category": x.category}
-            for x in questions
-        ]
+    q = " ".join(q.lower().split())  # every mode is case-insensitive, so this only widens cache hits
+    fuzzy_threshold = threshold if threshold is not None else settings.SEARCH_FUZZY_THRESHOLD
+    snippet_opts = {"include": include}
+    if include == "snippet":
+        snippet_opts.update(fragment_words=fragment_words, max_fragments=max_fragments)
+    elif include == "answer_preview":
+        snippet_opts.update(preview_chars=preview_chars)
+    key = (
+        user.tenant_id, tenant_version(db, user.tenant_id),
+        q, scope, mode, fuzzy_threshold if mode == "fuzzy" else None, limit, offset,
+        tuple(sorted(snippet_opts.items())),
+    )
+    cached = _cache.get(key)
+    if cached is MISSING:
+        cached = _run_search(db, user.tenant_id, q, scope, mode, fuzzy_threshold, limit, offset, **snippet_opts)
+        _cache.set(key, cached)
+    results, total = cached
 
-    if scope in ("all", "responses"):
-        responses = (
-            db.query(Response)
-            .filter(
-                Response.tenant_id == user.tenant_id,
-                Response.answer.isnot(None),
-                Response.answer.ilike(f"%{q}%"),
-            )
-            .limit(50)
-            .all()
-        )
-        results += [
-            {
-                "type": "response",
-                "id": str(r.id),
-                "question_id": str(r.question_id),
-                "answer": r.answer,
-                "status": r.status,
-            }
-            for r in responses
-        ]
-
-    if not results:
+    if not results and offset == 0:
         raise HTTPException(status_code=404, detail="No matches found")
 
-    return results[:50]
\ No newline at end of file
+    # Body stays a plain list; paging info travels in headers.
+    headers = {"X-Total-Count": str(total)}
+    if offset + len(results) < total:
+        headers["X-Next-Offset"] = str(offset + len(results))
+    return Response(content=dumps(results), media_type="application/json", headers=headers)
+
+
+@router.get("/cache/stats", dependencies=[Depends(require_role("admin"))],
+            summary="Search result cache hit-rate metrics for this worker (admin)")
+def search_cache_stats():
+    return _cache.stats()
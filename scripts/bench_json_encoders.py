@@ -0,0 +1,72 @@
+# mini_ddq_app/scripts/bench_json_encoders.py
+"""
+Serialization benchmark over a 10k-row QuestionChangeOut-shaped payload (UUIDs, datetimes, text).
+No database or app needed; every variant encodes the same rows.
+
+- fastapi-default: pydantic validation of dicts -> jsonable_encoder -> json.dumps
+  (what a plain-returning route did before the default response class changed)
+- pydantic-dump_json: TypeAdapter validation + Rust dump_json (FastAPI's response_model fast path)
+- stdlib-json: dicts -> json.dumps with default=str for UUID/datetime
+- orjson: dicts -> orjson.dumps (serialization.dumps; native UUID/datetime)
+
+    python -m mini_ddq_app.scripts.bench_json_encoders --rows 10000
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from mini_ddq_app.routes.questions import QuestionChangeOut
+from mini_ddq_app.serialization import dumps
+
+
+def payload(n: int) -> List[dict]:
+    tenant, qn, now = uuid.uuid4(), uuid.uuid4(), datetime.now(timezone.utc)
+    return [
+        {
+            "id": uuid.uuid4(), "tenant_id": tenant, "questionnaire_id": qn,
+            "question_text": f"Does the vendor encrypt customer data at rest and in transit? ({i})",
+            "category": "security", "is_required": bool(i % 2), "display_order": i,
+            "updated_at": now, "cursor": f"{1000 + i}.{i}",
+        }
+        for i in range(n)
+    ]
+
+
+def best_of(repeat: int, fn) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=10_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    rows = payload(args.rows)
+    adapter = TypeAdapter(List[QuestionChangeOut])
+    variants = {
+        "fastapi-default": lambda: json.dumps(jsonable_encoder(adapter.validate_python(rows))).encode(),
+        "pydantic-dump_json": lambda: adapter.dump_json(adapter.validate_python(rows)),
+        "stdlib-json": lambda: json.dumps(rows, default=str, separators=(",", ":")).encode(),
+        "orjson": lambda: dumps(rows),
+    }
+    print(f"{'encoder':<20} {'ms':>9} {'rows/s':>12} {'bytes':>11}")
+    for name, fn in variants.items():
+        size = len(fn())
+        secs = best_of(args.repeat, fn)
+        print(f"{name:<20} {secs * 1000:>9.1f} {args.rows / secs:>12,.0f} {size:>11,}")
+
+
+if __name__ == "__main__":
+    main()
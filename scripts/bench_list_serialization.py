@@ -0,0 +1,96 @@
+# mini_ddq_app/scripts/bench_list_serialization.py
+"""
+Microbenchmark: list-endpoint read paths, ORM hydration + Pydantic vs. Core projection.
+
+- orm:  db.query(Model).all() -> TypeAdapter(List[Out]) from_attributes validation -> JSON
+        (what FastAPI did for response_model lists)
+- core: select(<output columns>) -> rows_json (what list_questions / list_responses do now)
+
+Seeds a throwaway tenant with N questions + responses inside one transaction, measures, and
+rolls everything back. Reports the best of --repeat runs as rows/second.
+
+    python -m mini_ddq_app.scripts.bench_list_serialization --rows 10000
+"""
+import argparse
+import time
+import uuid
+from datetime import date
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+
+from mini_ddq_app.db import SessionLocal
+from mini_ddq_app.models.tenant import Tenant
+from mini_ddq_app.models.questionnaire import Questionnaire
+from mini_ddq_app.models.question import Question
+from mini_ddq_app.models.response import Response as ResponseModel
+from mini_ddq_app.routes.questions import QUESTION_OUT_COLUMNS, QuestionOut
+from mini_ddq_app.routes.responses import RESPONSE_OUT_COLUMNS, ResponseOut
+from mini_ddq_app.serialization import rows_json
+
+
+def seed(db, n: int):
+    tenant = Tenant(org_name=f"bench-{uuid.uuid4()}", contract_start=date.today())
+    db.add(tenant)
+    db.flush()
+    qn = Questionnaire(tenant_id=tenant.id, name="bench", created_by=uuid.uuid4())
+    db.add(qn)
+    db.flush()
+    q_ids = [uuid.uuid4() for _ in range(n)]
+    db.execute(insert(Question), [
+        {"id": q, "tenant_id": tenant.id, "questionnaire_id": qn.id, "question_text": f"Bench question {i} about controls?",
+         "category": "bench", "is_required": i % 2 == 0, "display_order": i}
+        for i, q in enumerate(q_ids)
+    ])
+    db.execute(insert(ResponseModel), [
+        {"tenant_id": tenant.id, "question_id": q, "answer": "Yes. " * 40, "status": "final"} for q in q_ids
+    ])
+    return tenant.id
+
+
+def best_of(repeat: int, fn) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=10_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    db = SessionLocal()
+    try:
+        tenant_id = seed(db, args.rows)
+        cases = {
+            "questions": (Question, QuestionOut, QUESTION_OUT_COLUMNS),
+            "responses": (ResponseModel, ResponseOut, RESPONSE_OUT_COLUMNS),
+        }
+        print(f"{'list':<10} {'path':<5} {'ms':>9} {'rows/s':>12} {'bytes':>10}")
+        for name, (model, out, columns) in cases.items():
+            adapter = TypeAdapter(List[out])
+
+            def orm():
+                db.expunge_all()  # a request starts with an empty identity map
+                rows = db.query(model).filter(model.tenant_id == tenant_id).all()
+                return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+            def core():
+                return rows_json(db.execute(select(*columns).where(model.tenant_id == tenant_id)))
+
+            for label, fn in (("orm", orm), ("core", core)):
+                size = len(fn())  # warm-up + payload size
+                secs = best_of(args.repeat, fn)
+                print(f"{name:<10} {label:<5} {secs * 1000:>9.1f} {args.rows / secs:>12,.0f} {size:>10,}")
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
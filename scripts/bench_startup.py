@@ -0,0 +1,97 @@
+# mini_ddq_app/scripts/bench_startup.py
+"""
+Cold-start benchmark: start a fresh uvicorn process and time how long until it is live,
+ready, and how slow its first requests are, with the startup warmup on and off.
+
+- live: first 200 from GET /healthz (process imported the app and serves HTTP)
+- ready: first 200 from GET /readyz (warmup done, DB reachable; immediate with WARMUP=0)
+- first login / first list: latency of the very first POST /auth/login and GET /questions/
+- warm login / warm list: the same requests again (steady-state reference)
+
+    python -m mini_ddq_app.scripts.bench_startup --runs 3
+
+Needs a seeded database (DATABASE_URL, data_db.py) and a free --port.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+METRICS = ("live", "ready", "first_login", "warm_login", "first_list", "warm_list")
+
+
+def wait_for(url: str, deadline: float) -> float:
+    while time.perf_counter() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return time.perf_counter()
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.01)
+    raise SystemExit(f"timed out waiting for {url}")
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    r = fn()
+    r.raise_for_status()
+    return r, time.perf_counter() - t0
+
+
+def one_run(port: int, warmup: bool, email: str, password: str) -> dict:
+    base = f"http://127.0.0.1:{port}"
+    env = {**os.environ, "WARMUP": "1" if warmup else "0"}
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "mini_ddq_app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        live = wait_for(f"{base}/healthz", t0 + 60) - t0
+        ready = wait_for(f"{base}/readyz", t0 + 60) - t0
+        with httpx.Client(base_url=base, timeout=30) as c:
+            login = lambda: c.post("/auth/login", json={"email": email, "password": password})
+            r, first_login = timed(login)
+            _, warm_login = timed(login)
+            headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+            _, first_list = timed(lambda: c.get("/questions/", headers=headers))
+            _, warm_list = timed(lambda: c.get("/questions/", headers=headers))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return {"live": live, "ready": ready, "first_login": first_login, "warm_login": warm_login,
+            "first_list": first_list, "warm_list": warm_list}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--port", type=int, default=8799)
+    ap.add_argument("--email", default="alice@alpha.com")
+    ap.add_argument("--password", default="alpha_admin")
+    ap.add_argument("--json", action="store_true", help="print medians as JSON instead of a table")
+    args = ap.parse_args()
+
+    results = {}
+    for warmup in (False, True):
+        runs = [one_run(args.port, warmup, args.email, args.password) for _ in range(args.runs)]
+        results["warmup" if warmup else "no-warmup"] = {
+            m: round(statistics.median(r[m] for r in runs) * 1000, 1) for m in METRICS
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"median of {args.runs} runs, ms")
+    print(f"{'':<11}" + "".join(f"{m:>13}" for m in METRICS))
+    for name, row in results.items():
+        print(f"{name:<11}" + "".join(f"{row[m]:>13.1f}" for m in METRICS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+# mini_ddq_app/scripts/loadtest.py
+"""
+HTTP load generator: many virtual users across tenants drive a running server (real sockets,
+real uvicorn) with a weighted mix of requests, and the run is reported as JSON.
+
+- Users: each virtual user logs in with one of --credentials (round-robin, so users spread
+  across tenants), discovers its tenant's question ids, then loops over the mix.
+- Mix (--mix name=weight,...): login, list_questions, get_response, upsert_response (draft),
+  search, import (small sync CSV into one of the tenant's questionnaires).
+- Load shape: users start evenly over --ramp-up seconds; --rps caps the total request rate
+  (one shared token bucket), 0 = as fast as the users go. The run lasts --duration seconds.
+- Report: throughput, per-endpoint count / error rate / latency percentiles, status codes,
+  and the server's DB pool gauges (ddq_db_pool_* from GET /metrics) sampled during the run.
+  JSON goes to stdout (or --out) so runs can be diffed; a summary table goes to stderr.
+
+    python -m mini_ddq_app.scripts.loadtest --spawn-server --users 50 --duration 60 --rps 200
+    python -m mini_ddq_app.scripts.loadtest --base-url http://staging:8000 --out rc1.json
+
+Notes:
+- Writes are real: upserts overwrite the seeded users' draft answers and imports add questions
+  (prefixed "loadtest"); point it at a throwaway database.
+- --spawn-server runs `uvicorn mini_ddq_app.main:app` with the current environment
+  (DATABASE_URL etc.) and stops it afterwards.
+- Latency is measured client-side per request, from send to the full body being read.
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+DEFAULT_MIX = "list_questions=30,get_response=25,upsert_response=15,search=20,import=2,login=3"
+DEFAULT_CREDENTIALS = "alice@alpha.com:alpha_admin,alan@alpha.com:alpha_analyst," \
+                      "bob@beta.com:beta_admin,bella@beta.com:beta_analyst"
+SEARCH_TERMS = ["encryption", "policy", "SOC2", "access control", "incident", "backup", "vendor"]
+PERCENTILES = (50, 90, 95, 99)
+POOL_METRIC = re.compile(r'^ddq_db_pool_(\w+)\{pool="([^"]*)"\} ([0-9.eE+-]+)$')
+
+
+# ---------- load shaping / recording ----------
+class TokenBucket:
+    """Shared rate limiter: acquire() waits until a request may start (rate <= 0: no limit)."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._next = time.perf_counter()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            now = time.perf_counter()
+            wait = self._next - now
+            self._next = max(self._next, now) + 1.0 / self.rate
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def add(self, endpoint: str, seconds: float, status: str, ok: bool) -> None:
+        self.latencies[endpoint].append(seconds)
+        self.statuses[endpoint][status] += 1
+        if not ok:
+            self.errors[endpoint] += 1
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, int(round(p / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise SystemExit(f"unknown operation in --mix: {name!r} (known: {', '.join(OPERATIONS)})")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise SystemExit("--mix needs at least one operation with a positive weight")
+    return mix
+
+
+def parse_pool_metrics(text: str) -> Dict[str, Dict[str, float]]:
+    pools: Dict[str, Dict[str, float]] = defaultdict(dict)
+    for line in text.splitlines():
+        m = POOL_METRIC.match(line)
+        if m:
+            pools[m.group(2)][m.group(1)] = float(m.group(3))
+    return dict(pools)
+
+
+# ---------- virtual user ----------
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, email: str, password: str, rec: Recorder, rng: random.Random):
+        self.client, self.email, self.password, self.rec, self.rng = client, email, password, rec, rng
+        self.headers: Dict[str, str] = {}
+        self.question_ids: List[str] = []
+        self.questionnaire_ids: List[str] = []
+
+    async def call(self, endpoint: str, method: str, url: str, ok_statuses=(200,), **kw) -> Optional[httpx.Response]:
+        t0 = time.perf_counter()
+        try:
+            r = await self.client.request(method, url, headers=self.headers, **kw)
+        except httpx.HTTPError as e:
+            self.rec.add(endpoint, time.perf_counter() - t0, type(e).__name__, ok=False)
+            return None
+        self.rec.add(endpoint, time.perf_counter() - t0, str(r.status_code), ok=r.status_code in ok_statuses)
+        return r
+
+    async def login(self) -> bool:
+        r = await self.call("login", "POST", "/auth/login", json={"email": self.email, "password": self.password})
+        if r is None or r.status_code != 200:
+            return False
+        self.headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        return True
+
+    async def discover(self) -> None:
+        r = await self.call("list_questions", "GET", "/questions/")
+        if r is not None and r.status_code == 200:
+            rows = r.json()
+            self.question_ids = [q["id"] for q in rows]
+            self.questionnaire_ids = sorted({q["questionnaire_id"] for q in rows})
+
+    async def list_questions(self):
+        params = {}
+        if self.questionnaire_ids and self.rng.random() < 0.5:
+            params["questionnaire_id"] = self.rng.choice(self.questionnaire_ids)
+        await self.call("list_questions", "GET", "/questions/", params=params)
+
+    async def get_response(self):
+        if self.question_ids:
+            await self.call("get_response", "GET", f"/responses/{self.rng.choice(self.question_ids)}",
+                            ok_statuses=(200, 404))  # 404: question has no response yet
+
+    async def upsert_response(self):
+        if self.question_ids:
+            await self.call("upsert_response", "PUT", f"/responses/{self.rng.choice(self.question_ids)}",
+                            json={"answer": f"loadtest draft {self.rng.random():.6f}", "status": "draft"})
+
+    async def search(self):
+        await self.call("search", "GET", "/search/", params={"q": self.rng.choice(SEARCH_TERMS), "limit": 20},
+                        ok_statuses=(200, 404))  # 404: no matches
+
+    async def import_(self):
+        if not self.questionnaire_ids:
+            return
+        qn = self.rng.choice(self.questionnaire_ids)
+        buf = io.StringIO()
+        w = csv.writer(buf)
+        w.writerow(["questionnaire_id", "text", "category", "is_required", "display_order"])
+        tag = self.rng.randrange(1 << 30)
+        for i in range(10):
+            w.writerow([qn, f"loadtest {tag} question {i}", "loadtest", "false", i])
+        await self.call("import", "POST", "/imports/questions", params={"sync": "true"},
+                        files={"file": ("loadtest.csv", buf.getvalue().encode(), "text/csv")})
+
+    async def relogin(self):
+        await self.login()
+
+
+OPERATIONS = {
+    "login": VirtualUser.relogin,
+    "list_questions": VirtualUser.list_questions,
+    "get_response": VirtualUser.get_response,
+    "upsert_response": VirtualUser.upsert_response,
+    "search": VirtualUser.search,
+    "import": VirtualUser.import_,
+}
+
+
+async def run_user(user: VirtualUser, mix: Dict[str, float], bucket: TokenBucket, start_at: float, stop_at: float):
+    await asyncio.sleep(max(0.0, start_at - time.perf_counter()))
+    await bucket.acquire()
+    if not await user.login():
+        return
+    await bucket.acquire()
+    await user.discover()
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < stop_at:
+        await bucket.acquire()
+        if time.perf_counter() >= stop_at:
+            return
+        await OPERATIONS[user.rng.choices(names, weights)[0]](user)
+
+
+async def sample_pools(client: httpx.AsyncClient, stop: asyncio.Event, interval: float,
+                       samples: List[Tuple[float, Dict]], t0: float):
+    while True:
+        try:
+            r = await client.get("/metrics")
+            if r.status_code == 200:
+                samples.append((time.perf_counter() - t0, parse_pool_metrics(r.text)))
+        except httpx.HTTPError:
+            pass
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+            return
+        except asyncio.TimeoutError:
+            continue
+
+
+def pool_report(samples: List[Tuple[float, Dict]]) -> Dict[str, dict]:
+    out: Dict[str, dict] = {}
+    for _, pools in samples:
+        for name, gauges in pools.items():
+            entry = out.setdefault(name, {"size": gauges.get("size"), "max_checkedout": 0.0,
+                                          "max_overflow": 0.0, "checkedout": []})
+            entry["max_checkedout"] = max(entry["max_checkedout"], gauges.get("checkedout", 0.0))
+            entry["max_overflow"] = max(entry["max_overflow"], gauges.get("overflow", 0.0))
+            entry["checkedout"].append(gauges.get("checkedout", 0.0))
+    for entry in out.values():
+        series = entry.pop("checkedout")
+        entry["mean_checkedout"] = round(sum(series) / len(series), 3) if series else 0.0
+        entry["samples"] = len(series)
+    return out
+
+
+def build_report(args, rec: Recorder, elapsed: float, samples) -> dict:
+    endpoints = {}
+    total = errors = 0
+    for name in sorted(rec.latencies):
+        lat = sorted(rec.latencies[name])
+        total += len(lat)
+        errors += rec.errors[name]
+        endpoints[name] = {
+            "count": len(lat),
+            "rps": round(len(lat) / elapsed, 2),
+            "errors": rec.errors[name],
+            "error_rate": round(rec.errors[name] / len(lat), 4),
+            "latency_ms": {
+                **{f"p{p}": round(percentile(lat, p) * 1000, 2) for p in PERCENTILES},
+                "mean": round(sum(lat) / len(lat) * 1000, 2),
+                "max": round(lat[-1] * 1000, 2),
+            },
+            "status": dict(rec.statuses[name]),
+        }
+    return {
+        "config": {
+            "base_url": args.base_url, "users": args.users, "duration_s": args.duration,
+            "ramp_up_s": args.ramp_up, "target_rps": args.rps, "mix": parse_mix(args.mix), "seed": args.seed,
+        },
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() - elapsed)),
+        "elapsed_s": round(elapsed, 3),
+        "requests": total,
+        "rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "endpoints": endpoints,
+        "db_pool": pool_report(samples),
+    }
+
+
+async def run(args) -> dict:
+    mix = parse_mix(args.mix)
+    creds = [tuple(c.split(":", 1)) for c in args.credentials.split(",") if c]
+    rec, bucket = Recorder(), TokenBucket(args.rps)
+    limits = httpx.Limits(max_connections=args.users + 1, max_keepalive_connections=args.users + 1)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        t0 = time.perf_counter()
+        stop_at = t0 + args.ramp_up + args.duration
+        users = [
+            VirtualUser(client, *creds[i % len(creds)], rec, random.Random(args.seed * 100003 + i))
+            for i in range(args.users)
+        ]
+        step = args.ramp_up / args.users if args.users else 0.0
+        samples: List[Tuple[float, Dict]] = []
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_pools(client, stop, args.pool_interval, samples, t0))
+        await asyncio.gather(*(run_user(u, mix, bucket, t0 + i * step, stop_at) for i, u in enumerate(users)))
+        elapsed = time.perf_counter() - t0
+        stop.set()
+        await sampler
+    return build_report(args, rec, elapsed, samples)
+
+
+# ---------- server / output ----------
+def spawn_server(base_url: str, wait: float = 30.0) -> subprocess.Popen:
+    url = httpx.URL(base_url)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "mini_ddq_app.main:app", "--host", url.host,
+         "--port", str(url.port or 8000), "--log-level", "warning"],
+        env=os.environ.copy(),
+    )
+    deadline = time.time() + wait
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"server exited with code {proc.returncode}")
+        try:
+            if httpx.get(f"{base_url}/metrics", timeout=1.0).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise SystemExit(f"server did not come up at {base_url} within {wait:.0f}s")
+
+
+def print_summary(report: dict) -> None:
+    err = sys.stderr
+    print(f"\n{report['requests']} requests in {report['elapsed_s']:.1f}s = {report['rps']:.1f} req/s, "
+          f"error rate {report['error_rate']:.2%}", file=err)
+    print(f"{'endpoint':<17}{'count':>8}{'rps':>9}{'err%':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}", file=err)
+    for name, e in report["endpoints"].items():
+        lat = e["latency_ms"]
+        print(f"{name:<17}{e['count']:>8}{e['rps']:>9.1f}{e['error_rate']:>8.2%}"
+              f"{lat['p50']:>9.1f}{lat['p95']:>9.1f}{lat['p99']:>9.1f}{lat['max']:>9.1f}", file=err)
+    for name, p in report["db_pool"].items():
+        print(f"db pool {name}: size {p['size']:g}, max in use {p['max_checkedout']:g}, "
+              f"mean in use {p['mean_checkedout']:g}, max overflow {p['max_overflow']:g}", file=err)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--base-url", default="http://127.0.0.1:8000")
+    ap.add_argument("--spawn-server", action="store_true", help="start uvicorn on --base-url for the run")
+    ap.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    ap.add_argument("--duration", type=float, default=30.0, help="seconds at full load (after ramp-up)")
+    ap.add_argument("--ramp-up", type=float, default=5.0, help="seconds over which users start")
+    ap.add_argument("--rps", type=float, default=0.0, help="total request rate cap (0 = unlimited)")
+    ap.add_argument("--mix", default=DEFAULT_MIX, help="operation=weight,... (" + ", ".join(OPERATIONS) + ")")
+    ap.add_argument("--credentials", default=DEFAULT_CREDENTIALS, help="email:password,... (users round-robin)")
+    ap.add_argument("--timeout", type=float, default=30.0, help="per-request timeout, seconds")
+    ap.add_argument("--pool-interval", type=float, default=1.0, help="seconds between /metrics samples")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--out", help="write the JSON report here instead of stdout")
+    args = ap.parse_args()
+    parse_mix(args.mix)
+
+    server = spawn_server(args.base_url) if args.spawn_server else None
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    print_summary(report)
+    body = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(body + "\n")
+    else:
+        print(body)
+
+
+if __name__ == "__main__":
+    main()
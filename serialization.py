@@ -0,0 +1,57 @@
+"""
+JSON bodies built straight from Core rows, for list endpoints that skip ORM hydration.
+
+- text_col(): cast a column (e.g. a UUID) to text in SQL, labelled with its attribute name,
+  so rows already hold JSON-ready strings and Python does no per-value conversion.
+- text_preview(): first N characters of a text column plus a "<name>_truncated" flag, both
+  computed in SQL so only a slice of a large (TOASTed) value is read and sent.
+- rows_json(): a list of Core rows -> compact JSON bytes, keyed by the selected labels.
+- dumps() / json_response(): orjson encoding (native UUID, datetime, date) for bodies we build
+  ourselves; returning the Response directly skips FastAPI's response_model validation pass.
+- ORJSONResponse: the app-wide default response class (main.py) for routes that return plain
+  dicts/lists without a response_model.
+
+Notes:
+- The projections must produce exactly the fields of the endpoint's response_model, which
+  stays declared on the route for the OpenAPI schema but is not used to validate these bodies.
+- main.py installs ORJSONResponse wrapped in Default(): FastAPI only takes its Pydantic
+  dump_json fast path for response_model routes while the response class is still a default.
+"""
+
+from typing import Any, Iterable
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import Text, cast, false, func
+
+
+def text_col(col, name: str = None):
+    return cast(col, Text).label(name or col.key)
+
+
+def text_preview(col, chars: int, name: str = None):
+    """(preview, truncated) labelled columns; octet_length reads the TOAST header, not the value.
+
+    A NULL value gives a NULL preview and truncated=false.
+    """
+    name = name or col.key
+    preview = func.left(col, chars)
+    truncated = func.coalesce(func.octet_length(col) > func.octet_length(preview), false())
+    return preview.label(name), truncated.label(f"{name}_truncated")
+
+
+def dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+
+def rows_json(rows: Iterable) -> bytes:
+    return dumps([row._asdict() for row in rows])
+
+
+def json_response(obj: Any, status_code: int = 200, headers: dict = None) -> Response:
+    return Response(content=dumps(obj), status_code=status_code, media_type="application/json", headers=headers)
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
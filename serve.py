@@ -0,0 +1,149 @@
+"""
+Production entrypoint: run mini_ddq_app.main:app with several worker processes, with each
+worker's DB pool sized from one connection budget.
+
+- Budget: --db-max-connections (default DB_MAX_CONNECTIONS). If unset, it is read from the
+  server as max_connections - superuser_reserved_connections - --db-headroom. It is always
+  checked against the server, so a budget that cannot fit is refused at startup.
+- Sizing: db.pool_limits(budget, workers) gives every worker pool_size + max_overflow
+  connections plus one for its LISTEN connection, so all workers together stay within the budget.
+  DB_MAX_CONNECTIONS and WEB_CONCURRENCY are exported for the workers, so each one computes the same split.
+- Server: gunicorn with uvicorn workers when gunicorn is installed (--preload, graceful
+  SIGHUP reloads, --max-requests recycling). Otherwise uvicorn's own supervisor (SIGHUP restarts
+  workers one by one, dead workers are respawned, no preload).
+
+    python -m mini_ddq_app.serve --workers 4 --db-max-connections 80
+    python -m mini_ddq_app.serve --workers 8 --preload --max-requests 5000 --dry-run
+
+Notes:
+- Several instances against one Postgres: give each its own DB_MAX_CONNECTIONS share.
+- --preload imports the app in the master before forking. The engine is created lazily, per
+  worker (db.get_engine), so no connection is ever shared across a fork.
+"""
+
+import argparse
+import logging
+import os
+import sys
+from typing import Optional
+
+from mini_ddq_app.config import settings
+from mini_ddq_app.db import RESERVED_PER_WORKER, pool_limits
+
+logger = logging.getLogger("mini_ddq_app.serve")
+
+APP = "mini_ddq_app.main:app"
+
+
+def server_connection_limit(database_url: str, headroom: int) -> Optional[int]:
+    """Connections the app may use on the server: max_connections minus reserved slots and headroom."""
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.pool import NullPool
+
+    engine = create_engine(database_url, poolclass=NullPool)
+    try:
+        with engine.connect() as conn:
+            max_conn = int(conn.execute(text("SHOW max_connections")).scalar())
+            reserved = int(conn.execute(text("SHOW superuser_reserved_connections")).scalar())
+    except Exception as e:
+        logger.warning("could not read max_connections from the database: %s", e)
+        return None
+    finally:
+        engine.dispose()
+    return max_conn - reserved - headroom
+
+
+def plan(workers: int, budget: int, server_limit: Optional[int]) -> dict:
+    if budget <= 0:
+        if server_limit is None:
+            raise SystemExit("no connection budget: set --db-max-connections / DB_MAX_CONNECTIONS")
+        budget = server_limit
+    if server_limit is not None and budget > server_limit:
+        raise SystemExit(f"connection budget {budget} exceeds what the server allows ({server_limit})")
+    try:
+        pool_size, max_overflow = pool_limits(budget, workers)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    per_worker = pool_size + max_overflow + RESERVED_PER_WORKER
+    return {
+        "workers": workers, "budget": budget, "server_limit": server_limit,
+        "pool_size": pool_size, "max_overflow": max_overflow,
+        "per_worker": per_worker, "total": per_worker * workers,
+    }
+
+
+def run_gunicorn(args) -> None:
+    from gunicorn.app.base import BaseApplication
+
+    class _App(BaseApplication):
+        def load_config(self):
+            for key, value in {
+                "bind": f"{args.host}:{args.port}", "workers": args.workers,
+                "worker_class": "uvicorn.workers.UvicornWorker", "preload_app": args.preload,
+                "graceful_timeout": args.graceful_timeout, "timeout": args.timeout,
+                "max_requests": args.max_requests, "max_requests_jitter": args.max_requests // 10,
+            }.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from mini_ddq_app.main import app
+            return app
+
+    _App().run()
+
+
+def run_uvicorn(args) -> None:
+    import uvicorn
+
+    if args.preload:
+        logger.warning("--preload needs gunicorn; uvicorn workers each import the app")
+    uvicorn.run(
+        APP, host=args.host, port=args.port, workers=args.workers,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        limit_max_requests=args.max_requests or None, limit_max_requests_jitter=args.max_requests // 10,
+        proxy_headers=True,
+    )
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Run the API with multiple workers and a shared DB connection budget")
+    ap.add_argument("--host", default="0.0.0.0")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "0")) or os.cpu_count() or 1)
+    ap.add_argument("--db-max-connections", type=int, default=settings.DB_MAX_CONNECTIONS,
+                    help="connections this instance may open in total (0 = derive from the server)")
+    ap.add_argument("--db-headroom", type=int, default=5,
+                    help="connections left free for migrations, psql, other clients when deriving the budget")
+    ap.add_argument("--server", choices=("auto", "gunicorn", "uvicorn"), default="auto")
+    ap.add_argument("--preload", action="store_true", help="import the app once before forking (gunicorn)")
+    ap.add_argument("--graceful-timeout", type=int, default=30, help="seconds for in-flight requests on restart/stop")
+    ap.add_argument("--timeout", type=int, default=60, help="gunicorn: restart a worker silent for this long")
+    ap.add_argument("--max-requests", type=int, default=0, help="recycle a worker after N requests (0 = never)")
+    ap.add_argument("--dry-run", action="store_true", help="print the sizing plan and exit")
+    args = ap.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+
+    p = plan(args.workers, args.db_max_connections, server_connection_limit(settings.DATABASE_URL, args.db_headroom))
+    logger.info("%d workers x (pool %d + overflow %d + %d listener) = %d of %d connections (server allows %s)",
+                p["workers"], p["pool_size"], p["max_overflow"], RESERVED_PER_WORKER, p["total"], p["budget"],
+                p["server_limit"] if p["server_limit"] is not None else "?")
+    if args.dry_run:
+        return
+
+    # workers (fresh imports or forks) size their pools from these
+    os.environ["DB_MAX_CONNECTIONS"] = str(p["budget"])
+    os.environ["WEB_CONCURRENCY"] = str(args.workers)
+    settings.DB_MAX_CONNECTIONS, settings.WEB_CONCURRENCY = p["budget"], args.workers
+
+    server = args.server
+    if server == "auto":
+        try:
+            import gunicorn  # noqa: F401
+            server = "gunicorn"
+        except ImportError:
+            server = "uvicorn"
+    (run_gunicorn if server == "gunicorn" else run_uvicorn)(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
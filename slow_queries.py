@@ -0,0 +1,134 @@
+"""
+Opt-in slow-query log (SLOW_QUERY_MS > 0), installed on the app engine by db.py.
+
+- Every statement is timed with before/after_cursor_execute. Statements over the threshold are
+  recorded with their SQL, the shapes of the bound parameters (names and types, never values),
+  and the route that issued them (metrics.current_route()).
+- A sampled share of them also get an EXPLAIN (FORMAT JSON) plan, run on the same connection
+  inside a savepoint. Plain EXPLAIN only plans the statement; it never executes it.
+- Entries go to a per-worker ring buffer (GET /metrics/slow-queries, admin) and to the
+  "mini_ddq_app.slow_queries" logger as one JSON object per line.
+
+Notes:
+- Overhead stays bounded: timing is two perf_counter calls per statement, and EXPLAIN runs for at
+  most SLOW_QUERY_EXPLAIN_SAMPLE of slow statements, and at most once per EXPLAIN_COOLDOWN
+  seconds for the same SQL text.
+- The plan is captured with the parameters of the slow execution, so it shows the plan that
+  was actually chosen for those values (generic vs custom plan aside).
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+
+from mini_ddq_app.metrics import current_route
+from mini_ddq_app.serialization import dumps
+
+logger = logging.getLogger("mini_ddq_app.slow_queries")
+
+EXPLAIN_COOLDOWN = 60.0
+MAX_SQL_CHARS = 4000
+EXPLAINABLE = ("select", "with", "insert", "update", "delete")
+
+
+def param_shapes(parameters: Any) -> Any:
+    """Names/positions -> type names (and lengths of sequences/strings); no values."""
+    def shape(v):
+        if isinstance(v, (str, bytes, list, tuple)):
+            return f"{type(v).__name__}[{len(v)}]"
+        return type(v).__name__
+    if isinstance(parameters, dict):
+        return {k: shape(v) for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [shape(v) for v in parameters]
+    return None
+
+
+class SlowQueryLog:
+    def __init__(self, threshold: float, sample: float, size: int, clock=time.monotonic):
+        self.threshold = threshold
+        self.sample = sample
+        self.entries: deque = deque(maxlen=size)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_explained: Dict[str, float] = {}
+
+    # ----- engine hooks -----
+    def install(self, engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("ddq_slow_start", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["ddq_slow_start"].pop()
+        if elapsed >= self.threshold:
+            self.record(conn, statement, parameters, elapsed, executemany)
+
+    # ----- recording -----
+    def _should_explain(self, statement: str, executemany: bool) -> bool:
+        if executemany or not statement.lstrip().lower().startswith(EXPLAINABLE):
+            return False
+        if random.random() >= self.sample:
+            return False
+        now = self._clock()
+        with self._lock:
+            if now - self._last_explained.get(statement, float("-inf")) < EXPLAIN_COOLDOWN:
+                return False
+            self._last_explained[statement] = now
+            if len(self._last_explained) > 10 * (self.entries.maxlen or 1):
+                self._last_explained.clear()
+        return True
+
+    def _explain(self, conn, statement: str, parameters) -> Any:
+        cursor = conn.connection.cursor()  # raw DBAPI cursor: bypasses these hooks
+        try:
+            cursor.execute("SAVEPOINT ddq_explain")
+            try:
+                cursor.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+                plan = cursor.fetchone()[0]
+                cursor.execute("RELEASE SAVEPOINT ddq_explain")
+                return plan
+            except Exception:
+                cursor.execute("ROLLBACK TO SAVEPOINT ddq_explain")
+                raise
+        finally:
+            cursor.close()
+
+    def record(self, conn, statement: str, parameters, elapsed: float, executemany: bool = False) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {
+            "at": time.time(),
+            "duration_ms": round(elapsed * 1000, 2),
+            "route": current_route(),
+            "sql": statement[:MAX_SQL_CHARS],
+            "params": param_shapes(parameters) if not executemany else f"executemany[{len(parameters)}]",
+            "plan": None,
+        }
+        if self._should_explain(statement, executemany):
+            try:
+                entry["plan"] = self._explain(conn, statement, parameters)
+            except Exception as e:  # e.g. the transaction is already aborted
+                entry["explain_error"] = f"{type(e).__name__}: {e}"[:300]
+        self.entries.append(entry)
+        logger.warning(dumps({"event": "slow_query", **{k: v for k, v in entry.items() if k != "plan"},
+                              "plan_captured": entry["plan"] is not None}).decode())
+        return entry
+
+    def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        return list(self.entries)[-limit:][::-1]
+
+
+slow_log: Optional[SlowQueryLog] = None
+
+
+def install(engine, threshold_ms: float, sample: float, size: int) -> SlowQueryLog:
+    global slow_log
+    slow_log = SlowQueryLog(threshold_ms / 1000.0, sample, size)
+    slow_log.install(engine)
+    return slow_log
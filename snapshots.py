@@ -0,0 +1,106 @@
+"""
+Immutable documents for finalized questionnaires.
+
+- render_document(): the whole questionnaire (metadata + questions + their responses) as compact
+  JSON bytes, from one Core query (no ORM objects).
+- store_snapshot(): gzip the rendered document and upsert it into questionnaire_snapshots,
+  tagged with the questionnaire data_version it was rendered at.
+- load_snapshot(): the stored row, only if it still matches the questionnaire's current
+  data_version (one joined primary-key lookup).
+
+Notes:
+- Finalized questionnaires are not locked against edits; an edit bumps data_version, the
+  snapshot stops matching, and the next read re-renders it. So a snapshot can be missing or
+  old, but is never served stale.
+- Snapshots are stored gzip-compressed; clients that accept gzip get the stored bytes untouched.
+"""
+
+import gzip
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from mini_ddq_app.models.question import Question
+from mini_ddq_app.models.questionnaire import Questionnaire
+from mini_ddq_app.models.questionnaire_snapshot import QuestionnaireSnapshot
+from mini_ddq_app.models.response import Response as ResponseModel
+from mini_ddq_app.serialization import dumps
+from mini_ddq_app.versioning import make_etag
+
+GZIP_LEVEL = 6
+
+
+def document_etag(questionnaire_id, data_version: int) -> str:
+    return make_etag("questionnaire-document", questionnaire_id, data_version)
+
+
+def render_document(db: Session, questionnaire: Questionnaire) -> bytes:
+    rows = db.execute(
+        select(
+            Question.id, Question.question_text, Question.category, Question.is_required,
+            Question.display_order, ResponseModel.answer, ResponseModel.status, ResponseModel.updated_at,
+        )
+        .outerjoin(ResponseModel, (ResponseModel.question_id == Question.id)
+                   & (ResponseModel.tenant_id == Question.tenant_id))
+        .where(Question.questionnaire_id == questionnaire.id, Question.tenant_id == questionnaire.tenant_id)
+        .order_by(Question.display_order.nulls_last(), Question.created_at, Question.id)
+    ).all()
+    doc = {
+        "questionnaire": {
+            "id": questionnaire.id,
+            "name": questionnaire.name,
+            "status": questionnaire.status,
+            "version": questionnaire.version,
+            "data_version": questionnaire.data_version,
+            "created_at": questionnaire.created_at,
+        },
+        "questions": [
+            {
+                "id": r.id,
+                "text": r.question_text,
+                "category": r.category,
+                "is_required": r.is_required,
+                "display_order": r.display_order,
+                "response": None if r.status is None else {
+                    "answer": r.answer,
+                    "status": r.status,
+                    "updated_at": r.updated_at,
+                },
+            }
+            for r in rows
+        ],
+    }
+    return dumps(doc)
+
+
+def store_snapshot(db: Session, questionnaire: Questionnaire) -> QuestionnaireSnapshot:
+    """Render + upsert the snapshot at the questionnaire's current data_version (caller commits)."""
+    raw = render_document(db, questionnaire)
+    values = {
+        "questionnaire_id": questionnaire.id,
+        "tenant_id": questionnaire.tenant_id,
+        "data_version": questionnaire.data_version,
+        "etag": document_etag(questionnaire.id, questionnaire.data_version),
+        "content": gzip.compress(raw, GZIP_LEVEL, mtime=0),  # mtime=0: same document, same bytes
+        "raw_size": len(raw),
+    }
+    stmt = pg_insert(QuestionnaireSnapshot).values(**values)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[QuestionnaireSnapshot.questionnaire_id],
+        set_={k: stmt.excluded[k] for k in ("data_version", "etag", "content", "raw_size")},
+    ))
+    return QuestionnaireSnapshot(**values)
+
+
+def load_snapshot(db: Session, tenant_id, questionnaire_id) -> Optional[QuestionnaireSnapshot]:
+    return db.execute(
+        select(QuestionnaireSnapshot)
+        .join(Questionnaire, Questionnaire.id == QuestionnaireSnapshot.questionnaire_id)
+        .where(
+            QuestionnaireSnapshot.questionnaire_id == str(questionnaire_id),
+            QuestionnaireSnapshot.tenant_id == tenant_id,
+            QuestionnaireSnapshot.data_version == Questionnaire.data_version,
+        )
+    ).scalar_one_or_none()
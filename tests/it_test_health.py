@@ -0,0 +1,20 @@
+# mini_ddq_app/tests/it_test_health.py
+"""
+- /healthz answers as soon as the app serves.
+- /readyz is 200 with per-step warmup timings once the lifespan warmup has finished.
+"""
+from mini_ddq_app import warmup
+
+def test_liveness(client):
+    r = client.get("/healthz")
+    assert r.status_code == 200
+    assert r.json() == {"status": "ok"}
+
+def test_readiness_after_warmup(client):
+    assert warmup.state.ready.wait(timeout=30)
+    r = client.get("/readyz")
+    assert r.status_code == 200
+    body = r.json()
+    assert body["status"] == "ready" and body["warm"] is True
+    assert {"engine", "mappers", "pool", "hashing"} <= set(body["steps_ms"])
+    assert body["error"] is None
@@ -15,4 +15,64 @@ def test_import_questions_sync_csv(client, alpha_fixture, alpha_token):
     assert r.status_code == 200, r.text
     body = r.json()
     assert body["rows_ok"] == 2
-    assert body["rows_failed"] == 0
\ No newline at end of file
+    assert body["rows_failed"] == 0
+
+def _put_final(client, token, question_id, answer):
+    r = client.put(f"/responses/{question_id}", headers=_authhed(client, token), json={"answer": answer, "status": "final"})
+    assert r.status_code in (200, 201), r.text
+
+def test_import_sync_autofill_drafts_from_similar_final_answers(client, alpha_fixture, alpha_token):
+    qn_id = str(alpha_fixture["questionnaire"].id)
+    _put_final(client, alpha_token, alpha_fixture["question_id"], "Yes, SOC2 Type II since 2021")
+    csv_content = (
+        "questionnaire_id,text,category,is_required,display_order\n"
+        f"{qn_id},Does your org have a SOC2 report?,security,true,20\n"
+        f"{qn_id},Describe your office seating plan,facilities,false,21\n"
+    ).encode("utf-8")
+
+    files = {"file": ("intake.csv", io.BytesIO(csv_content), "text/csv")}
+    r = client.post("/imports/questions", params={"sync": "true", "autofill": "draft"},
+                    headers=_authhed(client, alpha_token), files=files)
+    assert r.status_code == 200, r.text
+    assert r.json()["autofilled"] == 1
+
+    drafts = client.get("/responses/", params={"status_filter": "draft"}, headers=_authhed(client, alpha_token)).json()
+    assert [d["answer"] for d in drafts] == ["Yes, SOC2 Type II since 2021"]
+
+def test_import_async_reports_job_progress(client, alpha_fixture, alpha_token):
+    qn_id = str(alpha_fixture["questionnaire"].id)
+    csv_content = (
+        "questionnaire_id,text,category,is_required,display_order\n"
+        f"{qn_id},Do you rotate keys?,security,true,30\n"
+        ",missing questionnaire,security,true,31\n"
+    ).encode("utf-8")
+
+    files = {"file": ("intake.csv", io.BytesIO(csv_content), "text/csv")}
+    r = client.post("/imports/questions", params={"autofill": "draft"}, headers=_authhed(client, alpha_token), files=files)
+    assert r.status_code == 200, r.text
+    job_id = r.json()["job_id"]
+
+    # TestClient runs background tasks before returning, so the job is finished here
+    job = client.get(f"/imports/jobs/{job_id}", headers=_authhed(client, alpha_token)).json()
+    assert job["status"] == "succeeded", job
+    assert (job["rows_total"], job["rows_ok"], job["rows_failed"]) == (2, 1, 1)
+    assert job["autofill_total"] == job["autofill_done"] == 1
+
+def test_import_dedupe_skips_reworded_copies(client, alpha_fixture, alpha_token):
+    qn_id = str(alpha_fixture["questionnaire"].id)
+    csv_content = (
+        "questionnaire_id,text,category,is_required,display_order\n"
+        f"{qn_id},Does your org have SOC2,security,true,40\n"                          # copy of the seeded question
+        f"{qn_id},Is there a documented incident response plan?,security,true,41\n"
+        f"{qn_id},Is there a documented incident-response plan,security,true,42\n"     # copy of the row above
+    ).encode("utf-8")
+
+    files = {"file": ("v2.csv", io.BytesIO(csv_content), "text/csv")}
+    r = client.post("/imports/questions", params={"sync": "true", "dedupe": "skip"},
+                    headers=_authhed(client, alpha_token), files=files)
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["rows_ok"] == 1
+    assert body["rows_duplicate"] == 2
+    assert [d["row"] for d in body["duplicates"]] == [1, 3]
+    assert body["duplicates"][0]["duplicate_of"] == str(alpha_fixture["question_id"])
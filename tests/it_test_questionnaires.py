@@ -0,0 +1,60 @@
+# mini_ddq_app/tests/it_test_questionnaires.py
+def _authhed(client, token):
+    return {"Authorization": f"Bearer {token}"}
+
+def test_stats_follow_question_and_response_writes(client, alpha_fixture, alpha_token):
+    hdr = _authhed(client, alpha_token)
+    qn_id = str(alpha_fixture["questionnaire_id"])
+    q_id = str(alpha_fixture["question_id"])
+
+    before = client.get(f"/questionnaires/{qn_id}/stats", headers=hdr)
+    assert before.status_code == 200
+    assert before.json()["total_questions"] == 1
+    assert before.json()["required_questions"] == 1
+    assert before.json()["final"] == 0
+
+    client.post("/questions/", headers=hdr, json={"questionnaire_id": qn_id, "text": "Pen test yearly?"})
+    client.put(f"/responses/{q_id}", headers=hdr, json={"answer": "Yes", "status": "final"})
+
+    after = client.get(f"/questionnaires/{qn_id}/stats", headers=hdr).json()
+    assert after["total_questions"] == 2
+    assert after["answered"] == 1
+    assert after["final"] == 1
+    assert after["percent_complete"] == 50.0
+
+def test_stats_cross_tenant_404(client, alpha_fixture, beta_fixture, beta_token):
+    qn_id = str(alpha_fixture["questionnaire_id"])
+    r = client.get(f"/questionnaires/{qn_id}/stats", headers=_authhed(client, beta_token))
+    assert r.status_code == 404
+
+def test_finalized_document_is_served_from_snapshot(client, alpha_fixture, alpha_token):
+    hdr = _authhed(client, alpha_token)
+    qn_id = str(alpha_fixture["questionnaire_id"])
+    q_id = str(alpha_fixture["question_id"])
+    client.put(f"/responses/{q_id}", headers=hdr, json={"answer": "Yes, Type II", "status": "final"})
+
+    fin = client.post(f"/questionnaires/{qn_id}/finalize", headers=hdr)
+    assert fin.status_code == 200, fin.text
+    etag = fin.json()["etag"]
+
+    doc = client.get(f"/questionnaires/{qn_id}/document", headers=hdr)
+    assert doc.status_code == 200
+    assert doc.headers["ETag"] == etag
+    assert doc.headers.get("content-encoding") == "gzip"  # stored bytes sent as-is
+    body = doc.json()
+    assert body["questionnaire"]["status"] == "final"
+    assert body["questions"][0]["response"]["answer"] == "Yes, Type II"
+
+    assert client.get(f"/questionnaires/{qn_id}/document", headers={**hdr, "If-None-Match": etag}).status_code == 304
+
+    for accept, encoded in (("gzip;q=0, identity", False), ("br, GZIP;q=0.5", True), ("br, *;q=0.1", True),
+                            ("*, gzip;q=0", False)):
+        r = client.get(f"/questionnaires/{qn_id}/document", headers={**hdr, "Accept-Encoding": accept})
+        assert (r.headers.get("content-encoding") == "gzip") is encoded, accept
+        assert r.json() == body
+
+    # an edit after finalize makes the next read re-render
+    client.put(f"/responses/{q_id}", headers=hdr, json={"answer": "Yes, Type II (2025)", "status": "final"})
+    again = client.get(f"/questionnaires/{qn_id}/document", headers={**hdr, "Accept-Encoding": "identity"})
+    assert again.headers["ETag"] != etag
+    assert again.json()["questions"][0]["response"]["answer"] == "Yes, Type II (2025)"
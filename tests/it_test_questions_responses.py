@@ -36,6 +36,9 @@ def test_cross_tenant_404_on_response(client, alpha_fixture, beta_fixture, beta_
     alpha_q_id = str(alpha_fixture["questions"][0].id)
     r = client.get(f"/responses/{alpha_q_id}", headers=_authhed(client, beta_token))
     assert r.status_code == 404
+    # a conditional request must not turn that 404 into a 304
+    r = client.get(f"/responses/{alpha_q_id}", headers={**_authhed(client, beta_token), "If-None-Match": "*"})
+    assert r.status_code == 404
 
 def test_response_upsert_404_if_question_not_in_tenant(client, beta_fixture, beta_token):
     # Covers 404 path when tenant tries to update a question not belonging to them
@@ -45,4 +48,200 @@ def test_response_upsert_404_if_question_not_in_tenant(client, beta_fixture, bet
         json={"answer": "nope"},
         headers=_authhed(client, beta_token),
     )
-    assert r.status_code == 404
\ No newline at end of file
+    assert r.status_code == 404
+def test_response_changes_feed_picks_up_updates(client, alpha_fixture, alpha_token):
+    q_id = str(alpha_fixture["questions"][0].id)
+    hdr = _authhed(client, alpha_token)
+
+    client.put(f"/responses/{q_id}", headers=hdr, json={"answer": "v1", "status": "draft"})
+    first = client.get("/responses/changes", headers=hdr)
+    assert first.status_code == 200
+    page = first.json()
+    assert q_id in {item["question_id"] for item in page["items"]}
+
+    # Nothing new since the returned cursor
+    idle = client.get("/responses/changes", params={"since": page["cursor"]}, headers=hdr)
+    assert idle.status_code == 200
+    assert idle.json()["items"] == []
+
+    # An update moves the row past the cursor again
+    client.put(f"/responses/{q_id}", headers=hdr, json={"answer": "v2", "status": "final"})
+    after = client.get("/responses/changes", params={"since": page["cursor"]}, headers=hdr)
+    items = after.json()["items"]
+    assert [i["answer"] for i in items if i["question_id"] == q_id] == ["v2"]
+
+def test_changes_feed_rejects_bad_cursor(client, alpha_fixture, alpha_token):
+    r = client.get("/questions/changes", params={"since": "nope"}, headers=_authhed(client, alpha_token))
+    assert r.status_code == 400
+
+def test_conditional_get_returns_304_until_a_write(client, alpha_fixture, alpha_token):
+    q_id = str(alpha_fixture["questions"][0].id)
+    hdr = _authhed(client, alpha_token)
+
+    first = client.get("/responses/", headers=hdr)
+    etag = first.headers["ETag"]
+    cached = client.get("/responses/", headers={**hdr, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    client.put(f"/responses/{q_id}", headers=hdr, json={"answer": "changed", "status": "draft"})
+    fresh = client.get("/responses/", headers={**hdr, "If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+
+def test_question_list_etag_ignores_response_writes(client, alpha_fixture, alpha_token):
+    q_id = str(alpha_fixture["question_id"])
+    qn_id = str(alpha_fixture["questionnaire_id"])
+    hdr = _authhed(client, alpha_token)
+
+    etag = client.get("/questions/", params={"questionnaire_id": qn_id}, headers=hdr).headers["ETag"]
+    client.put(f"/responses/{q_id}", headers=hdr, json={"answer": "changed", "status": "draft"})
+    assert client.get("/questions/", params={"questionnaire_id": qn_id},
+                      headers={**hdr, "If-None-Match": etag}).status_code == 304
+
+    client.post("/questions/", headers=hdr, json={"questionnaire_id": qn_id, "text": "New question?"})
+    fresh = client.get("/questions/", params={"questionnaire_id": qn_id}, headers={**hdr, "If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+
+def test_question_list_for_unknown_or_foreign_questionnaire(client, alpha_fixture, beta_fixture, beta_token):
+    hdr = _authhed(client, beta_token)
+    for qn_id in (str(uuid4()), str(alpha_fixture["questionnaire_id"])):
+        for _ in range(2):  # the second request must not trip over a cached entry
+            r = client.get("/questions/", params={"questionnaire_id": qn_id}, headers=hdr)
+            assert r.status_code == 200 and r.json() == []
+
+def test_bulk_reorder_and_edit(client, alpha_fixture, alpha_token):
+    hdr = _authhed(client, alpha_token)
+    qn_id = str(alpha_fixture["questionnaire_id"])
+    q1 = str(alpha_fixture["question_id"])
+    q2 = client.post("/questions/", headers=hdr, json={"questionnaire_id": qn_id, "text": "Second?", "display_order": 2}).json()["id"]
+
+    r = client.patch("/questions/bulk", headers=hdr, json={
+        "questionnaire_id": qn_id,
+        "items": [
+            {"id": q1, "display_order": 2},
+            {"id": q2, "display_order": 1, "category": "ops", "is_required": True},
+        ],
+    })
+    assert r.status_code == 200, r.text
+    assert r.json()["updated"] == 2
+
+    listed = client.get("/questions/", params={"questionnaire_id": qn_id}, headers=hdr).json()
+    assert [q["id"] for q in listed] == [q2, q1]
+    assert listed[0]["category"] == "ops" and listed[0]["is_required"] is True
+    assert listed[1]["category"] == "security"  # untouched
+
+def test_bulk_update_is_all_or_nothing(client, alpha_fixture, alpha_token):
+    hdr = _authhed(client, alpha_token)
+    qn_id = str(alpha_fixture["questionnaire_id"])
+    q1 = str(alpha_fixture["question_id"])
+    r = client.patch("/questions/bulk", headers=hdr, json={
+        "questionnaire_id": qn_id,
+        "items": [{"id": q1, "display_order": 99}, {"id": str(uuid4()), "display_order": 1}],
+    })
+    assert r.status_code == 404
+    listed = client.get("/questions/", params={"questionnaire_id": qn_id}, headers=hdr).json()
+    assert listed[0]["display_order"] == 1
+
+def test_suggestions_reuse_final_answers(client, alpha_fixture, alpha_token):
+    hdr = _authhed(client, alpha_token)
+    qn_id = str(alpha_fixture["questionnaire_id"])
+    src = str(alpha_fixture["question_id"])  # "Does your org have SOC2?"
+    client.put(f"/responses/{src}", headers=hdr, json={"answer": "Yes, Type II", "status": "final"})
+    new_q = client.post("/questions/", headers=hdr, json={"questionnaire_id": qn_id, "text": "Does your organisation have a SOC2 report?"}).json()["id"]
+
+    r = client.get(f"/questions/{new_q}/suggestions", headers=hdr)
+    assert r.status_code == 200, r.text
+    top = r.json()[0]
+    assert top["question_id"] == src
+    assert top["answer"] == "Yes, Type II"
+
+def test_question_list_cache_is_invalidated_by_create(client, alpha_fixture, alpha_token):
+    hdr = _authhed(client, alpha_token)
+    qn_id = str(alpha_fixture["questionnaire_id"])
+    first = client.get("/questions/", params={"questionnaire_id": qn_id}, headers=hdr)
+    again = client.get("/questions/", params={"questionnaire_id": qn_id}, headers=hdr)  # served from cache
+    assert again.status_code == 200 and again.json() == first.json()
+    assert again.headers["ETag"] == first.headers["ETag"]
+
+    client.post("/questions/", headers=hdr, json={"questionnaire_id": qn_id, "text": "Do you pen-test yearly?"})
+    after = client.get("/questions/", params={"questionnaire_id": qn_id}, headers=hdr)
+    assert len(after.json()) == len(first.json()) + 1
+    assert after.headers["ETag"] != first.headers["ETag"]
+
+def test_list_responses_previews_answers_in_sql(client, alpha_fixture, alpha_token):
+    hdr = _authhed(client, alpha_token)
+    long_answer = "Policy text. " * 2000
+    client.put(f"/responses/{alpha_fixture['question_id']}", headers=hdr, json={"answer": long_answer})
+
+    preview = client.get("/responses/", params={"include": "answer_preview", "preview_chars": 100},
+                         headers=hdr).json()[0]
+    assert preview["answer"] == long_answer[:100]
+    assert preview["answer_truncated"] is True
+
+    assert "answer" not in client.get("/responses/", params={"include": "none"}, headers=hdr).json()[0]
+    assert client.get("/responses/", headers=hdr).json()[0]["answer"] == long_answer  # default: answer_full
+
+    # lazy full fetch of one answer
+    assert client.get(f"/responses/{alpha_fixture['question_id']}", headers=hdr).json()["answer"] == long_answer
+
+    client.put(f"/responses/{alpha_fixture['question_id']}", headers=hdr, json={"answer": None})
+    empty = client.get("/responses/", params={"include": "answer_preview"}, headers=hdr).json()[0]
+    assert empty["answer"] is None and empty["answer_truncated"] is False
+
+def test_metrics_endpoint_reports_route_templates(client, alpha_fixture, alpha_token):
+    hdr = _authhed(client, alpha_token)
+    client.get(f"/responses/{alpha_fixture['question_id']}", headers=hdr)
+    body = client.get("/metrics").text
+    assert 'ddq_request_duration_seconds_count{method="GET",route="/responses/{question_id}"}' in body
+    assert 'ddq_cache_hits{cache="search"}' in body
+
+def test_draft_autosaves_are_buffered_and_coalesced(client, alpha_fixture, alpha_token, monkeypatch):
+    from sqlalchemy import select
+    from mini_ddq_app.config import settings
+    from mini_ddq_app.db import SessionLocal
+    from mini_ddq_app import draft_buffer as draft_buffer_module
+    from mini_ddq_app.draft_buffer import draft_buffer
+    from mini_ddq_app.models.response import Response as ResponseModel
+
+    monkeypatch.setattr(settings, "DRAFT_WRITE_BEHIND", True)
+    monkeypatch.setattr(draft_buffer, "interval", 3600)   # only the explicit flushes below write
+    events, publish = [], draft_buffer_module.publish
+
+    def recording_publish(db, tenant_id, kind, op, ids=(), **extra):
+        events.append((list(ids), extra))
+        publish(db, tenant_id, kind, op, ids, **extra)
+
+    monkeypatch.setattr(draft_buffer_module, "publish", recording_publish)
+    hdr = _authhed(client, alpha_token)
+    tenant_id, q_id = str(alpha_fixture["tenant_id"]), str(alpha_fixture["question_id"])
+
+    def stored_answer():
+        with SessionLocal() as s:
+            return s.execute(select(ResponseModel.answer).where(ResponseModel.question_id == q_id)).scalar_one()
+
+    first = client.put(f"/responses/{q_id}", headers=hdr, json={"answer": "v1", "status": "draft"})
+    assert first.status_code == 200                         # no row yet: written synchronously
+    for i in range(2, 6):
+        r = client.put(f"/responses/{q_id}", headers=hdr, json={"answer": f"v{i}", "status": "draft"})
+        assert r.status_code == 200 and r.json()["answer"] == f"v{i}" and r.json()["id"] == first.json()["id"]
+    assert draft_buffer.pending(tenant_id, q_id).answer == "v5"
+    assert stored_answer() == "v1"
+
+    got = client.get(f"/responses/{q_id}", headers=hdr)      # reading the key flushes it
+    assert got.json()["answer"] == "v5"
+    assert draft_buffer.pending(tenant_id, q_id) is None
+    assert events == [([first.json()["id"]], {"questionnaire_ids": [str(alpha_fixture["questionnaire_id"])],
+                                               "status": "draft", "question_ids": [q_id]})]
+
+    client.put(f"/responses/{q_id}", headers=hdr, json={"answer": "v6", "status": "draft"})
+    final = client.put(f"/responses/{q_id}", headers=hdr, json={"answer": "done", "status": "final"})
+    assert final.json()["status"] == "final"
+    assert draft_buffer.flush() == 0                         # the final write already flushed v6
+    assert stored_answer() == "done"
+
+    edited = client.put(f"/responses/{q_id}", headers=hdr, json={"answer": "done, edited", "status": None})
+    assert edited.json()["status"] == "final"
+    assert draft_buffer.pending(tenant_id, q_id) is None
+    assert stored_answer() == "done, edited"
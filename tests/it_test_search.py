@@ -35,4 +35,82 @@ def test_search_returns_200_when_match_exists(client, alpha_fixture, alpha_token
     assert r.status_code == 200, r.text
     data = r.json()
     assert isinstance(data, list) and len(data) > 0
-    assert all(item["type"] in ("question", "response") for item in data)
\ No newline at end of file
+    assert all(item["type"] in ("question", "response") for item in data)
+
+def test_search_fts_matches_stemmed_terms(client, alpha_fixture, alpha_token):
+    # "orgs" stems to the same lexeme as "org" in the seeded question text
+    r = client.get("/search", params={"q": "orgs", "scope": "questions", "mode": "fts"},
+                   headers=_authhed(client, alpha_token))
+    assert r.status_code == 200, r.text
+    assert any(item["id"] == str(alpha_fixture["question_id"]) for item in r.json())
+
+def test_search_substring_mode_still_available(client, alpha_fixture, alpha_token):
+    r = client.get("/search", params={"q": "SOC", "scope": "questions", "mode": "substring"},
+                   headers=_authhed(client, alpha_token))
+    assert r.status_code == 200
+    assert all(item["type"] == "question" for item in r.json())
+
+def test_search_fuzzy_matches_partial_control_id(client, alpha_fixture, alpha_token):
+    # "SOC" is only a partial token of "SOC2", which full-text stemming can't match
+    r = client.get("/search", params={"q": "SOC", "scope": "questions", "mode": "fuzzy"},
+                   headers=_authhed(client, alpha_token))
+    assert r.status_code == 200, r.text
+    assert any(item["id"] == str(alpha_fixture["question_id"]) for item in r.json())
+
+def test_search_pages_through_merged_results(client, alpha_fixture, alpha_token):
+    hdr = _authhed(client, alpha_token)
+    qn_id = str(alpha_fixture["questionnaire_id"])
+    for i in range(3):
+        client.post("/questions/", headers=hdr, json={"questionnaire_id": qn_id, "text": f"Encryption control {i}"})
+    client.put(f"/responses/{alpha_fixture['question_id']}", headers=hdr, json={"answer": "AES encryption at rest"})
+
+    first = client.get("/search", params={"q": "encryption", "limit": 2}, headers=hdr)
+    assert first.status_code == 200
+    assert len(first.json()) == 2
+    total = int(first.headers["X-Total-Count"])
+    assert total >= 4
+
+    second = client.get("/search", params={"q": "encryption", "limit": 2, "offset": first.headers["X-Next-Offset"]}, headers=hdr)
+    assert second.status_code == 200
+    first_ids = {i["id"] for i in first.json()}
+    assert first_ids.isdisjoint({i["id"] for i in second.json()})
+
+def test_search_auto_fallback_pages_stay_on_substring(client, alpha_fixture, alpha_token):
+    hdr = _authhed(client, alpha_token)
+    qn_id = str(alpha_fixture["questionnaire_id"])
+    for i in range(3):
+        client.post("/questions/", headers=hdr, json={"questionnaire_id": qn_id, "text": f"Tokenization scheme {i}"})
+
+    # "okeniz" is only part of a word: full-text finds nothing, so auto falls back to substring on every page
+    seen, offset = [], 0
+    while True:
+        r = client.get("/search", params={"q": "okeniz", "scope": "questions", "limit": 1, "offset": offset},
+                       headers=hdr)
+        assert r.status_code == 200, r.text
+        assert len(r.json()) == 1
+        assert int(r.headers["X-Total-Count"]) == 3
+        seen += [i["id"] for i in r.json()]
+        if "X-Next-Offset" not in r.headers:
+            break
+        offset = int(r.headers["X-Next-Offset"])
+    assert len(set(seen)) == 3
+
+def test_search_returns_highlighted_snippets_unless_full_requested(client, alpha_fixture, alpha_token):
+    hdr = _authhed(client, alpha_token)
+    long_answer = ("Our policy prose goes on at length. " * 200) + "All backups are encrypted with AES-256. " + ("More prose. " * 200)
+    client.put(f"/responses/{alpha_fixture['question_id']}", headers=hdr, json={"answer": long_answer})
+
+    for mode in ("fts", "substring"):
+        r = client.get("/search", params={"q": "backups", "scope": "responses", "mode": mode}, headers=hdr)
+        assert r.status_code == 200, r.text
+        hit = r.json()[0]
+        assert "answer" not in hit
+        assert "<mark>" in hit["snippet"] and "backups" in hit["snippet"].lower()
+        assert len(hit["snippet"]) < len(long_answer) / 10
+
+    full = client.get("/search", params={"q": "backups", "scope": "responses", "include": "answer_full"}, headers=hdr)
+    assert full.json()[0]["answer"] == long_answer
+
+    preview = client.get("/search", params={"q": "backups", "scope": "responses", "include": "answer_preview",
+                                            "preview_chars": 50}, headers=hdr).json()[0]
+    assert preview["answer"] == long_answer[:50] and preview["answer_truncated"] is True
@@ -0,0 +1,61 @@
+# mini_ddq_app/tests/test_answer_index.py
+"""
+- Similar question wording ranks above unrelated text.
+- Incremental upsert/remove keep the dense matrix and lookups consistent.
+- refresh() queries without the lock and drops a page read from a cursor that moved meanwhile.
+No DB here (the change-feed query is faked); sync() against Postgres is covered by integration tests.
+"""
+
+from collections import namedtuple
+
+from mini_ddq_app.answer_index import TenantAnswerIndex
+
+Row = namedtuple("Row", "id question_id status question_text change_txid change_seq")
+
+def _index():
+    idx = TenantAnswerIndex(capacity=2)  # small, to exercise growth
+    idx.upsert("r1", "q1", "Do you encrypt customer data at rest?")
+    idx.upsert("r2", "q2", "Describe your disaster recovery plan")
+    idx.upsert("r3", "q3", "How often are backups tested?")
+    return idx
+
+def test_similar_wording_ranks_first():
+    idx = _index()
+    hits = idx.query_many(["Is customer data encrypted at rest?"], k=3)[0]
+    assert hits[0][0][0] == "r1"
+    assert hits[0][1] > hits[1][1]
+
+def test_remove_and_update_are_reflected():
+    idx = _index()
+    idx.remove("r1")
+    assert len(idx) == 2
+    hits = idx.query_many(["encrypt customer data at rest"], k=5)[0]
+    assert "r1" not in {meta[0] for meta, _ in hits}
+
+    idx.upsert("r3", "q3", "Do you encrypt customer data at rest and in transit?")
+    hits = idx.query_many(["encrypt customer data at rest"], k=1)[0]
+    assert hits[0][0][0] == "r3"
+
+def test_batch_query_returns_one_list_per_text():
+    idx = _index()
+    out = idx.query_many(["backups tested", "recovery plan"], k=1)
+    assert [hits[0][0][0] for hits in out] == ["r3", "r2"]
+
+def test_refresh_rereads_when_another_request_moved_the_cursor():
+    idx = TenantAnswerIndex()
+    feed = [Row("r1", "q1", "final", "Do you encrypt data at rest?", 1, 1)]
+    reads = []
+
+    def changes(db, tenant_id, cursor):
+        assert not idx.lock.locked()
+        reads.append(cursor)
+        rows = [r for r in feed if (r.change_txid, r.change_seq) > cursor]
+        if len(reads) == 1:  # a concurrent request applies a newer state before this page lands
+            feed[0] = Row("r1", "q1", "draft", "Do you encrypt data at rest?", 2, 1)
+            idx.cursor = (2, 1)
+        return rows
+
+    idx._changes = changes
+    idx.refresh(None, "t1")
+    assert reads == [(0, 0), (2, 1)]
+    assert len(idx) == 0  # the stale "final" page was not applied over the newer state
@@ -0,0 +1,75 @@
+# mini_ddq_app/tests/test_cache.py
+"""
+- LRU eviction order and size bound.
+- TTL expiry (fake clock) counts as a miss.
+- hit-rate counters.
+- byte bound; RedisCache over a dict-backed stand-in client.
+- QuestionListCache only serves entries built from the current data version.
+"""
+
+from mini_ddq_app.cache import LRUCache, MISSING, RedisCache
+from mini_ddq_app.question_cache import QuestionListCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+def test_lru_evicts_least_recently_used():
+    c = LRUCache(maxsize=2, ttl=60)
+    c.set("a", 1)
+    c.set("b", 2)
+    assert c.get("a") == 1      # "a" is now most recent
+    c.set("c", 3)               # evicts "b"
+    assert c.get("b") is MISSING
+    assert c.get("a") == 1 and c.get("c") == 3
+    assert c.stats()["evictions"] == 1
+
+def test_ttl_expiry_is_a_miss():
+    clock = FakeClock()
+    c = LRUCache(maxsize=10, ttl=5, clock=clock)
+    c.set("k", "v")
+    clock.now = 4.9
+    assert c.get("k") == "v"
+    clock.now = 5.0
+    assert c.get("k") is MISSING
+    s = c.stats()
+    assert s["expirations"] == 1 and s["hits"] == 1 and s["misses"] == 1
+    assert s["hit_rate"] == 0.5
+
+def test_zero_size_disables_cache():
+    c = LRUCache(maxsize=0, ttl=60)
+    c.set("k", "v")
+    assert c.get("k") is MISSING
+    assert len(c) == 0
+
+def test_byte_bound_evicts_until_under_budget():
+    c = LRUCache(maxsize=100, ttl=60, maxbytes=10)
+    c.set("a", b"12345")
+    c.set("b", b"12345")
+    c.set("c", b"123")          # 13 bytes > 10: evicts "a"
+    assert c.get("a") is MISSING
+    assert c.stats()["bytes"] == 8
+    c.set("huge", b"x" * 11)    # larger than the whole budget: not cached, nothing evicted
+    assert c.get("huge") is MISSING and len(c) == 2
+
+class DictRedis:
+    def __init__(self):
+        self.data = {}
+    def get(self, k):
+        return self.data.get(k)
+    def set(self, k, v, px=None):
+        self.data[k] = v
+    def delete(self, k):
+        self.data.pop(k, None)
+
+def test_question_list_cache_checks_version_and_invalidates():
+    for backend in (LRUCache(maxsize=10, ttl=60, maxbytes=1000), RedisCache("", ttl=60, client=DictRedis())):
+        c = QuestionListCache(backend)
+        c.set("t1", "qn1", 3, 'W/"abc"', b"[]")
+        assert c.get("t1", "qn1", 3) == ('W/"abc"', b"[]")
+        assert c.get("t1", "qn1", 4) is None      # written since: never served stale
+        c.set("t1", None, 3, 'W/"all"', b"[1]")
+        c.invalidate("t1", ["qn1"])
+        assert c.get("t1", "qn1", 3) is None and c.get("t1", None, 3) is None
@@ -10,4 +10,10 @@ def test_get_db_yield_and_close():
     assert session.execute(text("SELECT 1")).scalar() == 1
     # exhaust the generator to hit the finally/close path
     with pytest.raises(StopIteration):
-        next(gen)
\ No newline at end of file
+        next(gen)
+
+def test_engine_is_created_on_first_use_and_bound_to_sessions():
+    from mini_ddq_app import db
+    engine = db.get_engine()
+    assert db.engine is engine and db.get_engine() is engine
+    assert db.SessionLocal().get_bind() is engine
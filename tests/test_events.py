@@ -0,0 +1,38 @@
+# mini_ddq_app/tests/test_events.py
+"""
+- Verifies ChangeBroker fans NOTIFY payloads out only to the matching tenant.
+- Verifies a full subscriber queue collapses into a single "resync" event.
+No listener thread / DB connection is started here.
+"""
+
+import asyncio
+import json
+
+from mini_ddq_app.events import ChangeBroker, RESYNC_EVENT
+
+def test_dispatch_is_tenant_scoped():
+    async def scenario():
+        broker = ChangeBroker()
+        alpha = broker.subscribe("alpha")
+        beta = broker.subscribe("beta")
+        broker.dispatch(json.dumps({"tenant_id": "alpha", "kind": "response", "op": "upserted", "ids": ["r1"]}))
+        await asyncio.sleep(0)  # let call_soon_threadsafe callbacks run
+        assert alpha.queue.get_nowait()["ids"] == ["r1"]
+        assert beta.queue.empty()
+        broker.unsubscribe(alpha)
+        broker.unsubscribe(beta)
+        assert broker.subscriber_count() == 0
+
+    asyncio.run(scenario())
+
+def test_overflow_collapses_to_resync():
+    async def scenario():
+        broker = ChangeBroker(queue_size=2)
+        sub = broker.subscribe("alpha")
+        for i in range(3):
+            broker.dispatch(json.dumps({"tenant_id": "alpha", "kind": "question", "op": "created", "ids": [str(i)]}))
+        await asyncio.sleep(0)
+        assert sub.queue.get_nowait() == RESYNC_EVENT
+        assert sub.queue.empty()
+
+    asyncio.run(scenario())
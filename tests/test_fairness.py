@@ -0,0 +1,116 @@
+# mini_ddq_app/tests/test_fairness.py
+"""
+- A tenant within its quota is admitted at once; past it, requests queue, and past the queue
+  limit they are rejected with a Retry-After.
+- Freed slots go to the tenant with the smallest virtual finish tag: a flooding tenant can't
+  starve another, and weights scale each tenant's share.
+- Queued requests time out into a rejection; the middleware answers 429 + Retry-After.
+- Per-tenant series reach /metrics only when enabled, with escaped tenant labels.
+"""
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from mini_ddq_app.auth.jwt import create_access_token
+from mini_ddq_app import fairness, metrics
+from mini_ddq_app.config import settings
+from mini_ddq_app.fairness import FairnessMiddleware, QuotaExceeded, TenantScheduler, parse_weights
+
+def test_quota_queue_and_reject():
+    async def scenario():
+        s = TenantScheduler(max_inflight=10, tenant_inflight=2, tenant_queue=1, queue_timeout=5)
+        assert await s.acquire("a") == 0.0
+        assert await s.acquire("a") == 0.0
+        queued = asyncio.create_task(s.acquire("a"))
+        await asyncio.sleep(0)
+        assert s.snapshot()["a"] == {"inflight": 2, "queued": 1, "weight": 1.0}
+        with pytest.raises(QuotaExceeded) as exc:
+            await s.acquire("a")
+        assert exc.value.retry_after >= 1
+        assert await s.acquire("b") == 0.0          # other tenants are unaffected
+        s.release("a", 0.01)
+        await queued
+        assert s.snapshot()["a"]["inflight"] == 2
+
+    asyncio.run(scenario())
+
+def _admission_order(weights, arrivals, slots=1):
+    async def scenario():
+        s = TenantScheduler(max_inflight=slots, tenant_inflight=slots, tenant_queue=100, queue_timeout=5,
+                            weights=weights)
+        await s.acquire("blocker")
+        order = []
+
+        async def request(tenant):
+            await s.acquire(tenant)
+            order.append(tenant)
+
+        tasks = []
+        for tenant in arrivals:
+            tasks.append(asyncio.create_task(request(tenant)))
+            await asyncio.sleep(0)
+        s.release("blocker", 0.01)
+        for i in range(len(arrivals)):      # one slot: run each admitted request to completion in turn
+            while len(order) <= i:
+                await asyncio.sleep(0)
+            s.release(order[i], 0.01)
+        await asyncio.gather(*tasks)
+        return order
+
+    return asyncio.run(scenario())
+
+def test_flooding_tenant_does_not_starve_others():
+    order = _admission_order({}, ["noisy"] * 6 + ["quiet"] * 2)
+    assert order.index("quiet") <= 1
+    assert order[:4].count("quiet") == 2
+
+def test_weights_scale_share():
+    order = _admission_order({"big": 3.0}, ["big"] * 6 + ["small"] * 6)
+    assert order[:4].count("big") == 3
+
+def test_queue_timeout_rejects():
+    async def scenario():
+        s = TenantScheduler(max_inflight=1, tenant_inflight=1, tenant_queue=5, queue_timeout=0.01)
+        await s.acquire("a")
+        with pytest.raises(QuotaExceeded):
+            await s.acquire("a")
+        assert s.snapshot()["a"]["queued"] == 0
+
+    asyncio.run(scenario())
+
+def test_parse_weights():
+    assert parse_weights("t1=2, t2=0.5,") == {"t1": 2.0, "t2": 0.5}
+
+def test_middleware_answers_429_with_retry_after():
+    scheduler = TenantScheduler(max_inflight=1, tenant_inflight=1, tenant_queue=0, queue_timeout=1)
+    app = FastAPI()
+    app.add_middleware(FairnessMiddleware, scheduler=scheduler)
+
+    @app.get("/work")
+    def work():
+        return {"ok": True}
+
+    token = create_access_token(sub="u1", tenant_id="t1", role="admin")
+    hdr = {"Authorization": f"Bearer {token}"}
+    with TestClient(app) as client:
+        assert client.get("/work", headers=hdr).status_code == 200
+        scheduler._state("t1").inflight = scheduler.tenant_inflight     # t1 busy elsewhere
+        r = client.get("/work", headers=hdr)
+        assert r.status_code == 429
+        assert int(r.headers["retry-after"]) >= 1
+        assert client.get("/work").status_code == 200                   # unauthenticated: not scheduled
+
+def test_tenant_metrics_are_opt_in_and_escaped(monkeypatch):
+    monkeypatch.setattr(fairness, "scheduler", TenantScheduler(10, 2, 1, 5))
+    asyncio.run(fairness.scheduler.acquire('evil"}\n'))
+    fairness.TENANT_REQUESTS.inc('evil"}\n', "admitted")
+
+    monkeypatch.setattr(settings, "METRICS_TENANT_LABELS", False)
+    assert "ddq_tenant_" not in metrics.render()
+
+    monkeypatch.setattr(settings, "METRICS_TENANT_LABELS", True)
+    out = metrics.render()
+    assert 'ddq_tenant_inflight{tenant="evil\\"}\\n"} 1' in out
+    assert 'ddq_tenant_requests_total{tenant="evil\\"}\\n",outcome="admitted"}' in out
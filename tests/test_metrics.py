@@ -0,0 +1,57 @@
+# mini_ddq_app/tests/test_metrics.py
+"""
+- Histograms render cumulative Prometheus buckets.
+- The middleware labels by route template and counts SQL statements of the request,
+  flagging a statement repeated N1_THRESHOLD+ times as a possible N+1.
+- Registered connection pools render as ddq_db_pool_* gauges (parsed back by scripts/loadtest.py).
+"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from mini_ddq_app import metrics
+
+def test_histogram_renders_cumulative_buckets():
+    h = metrics.Histogram("t_seconds", "test", (0.1, 1.0), ("route",))
+    h.observe(0.05, "/a")
+    h.observe(0.5, "/a")
+    out = "\n".join(h.render())
+    assert 't_seconds_bucket{route="/a",le="0.1"} 1' in out
+    assert 't_seconds_bucket{route="/a",le="1"} 2' in out
+    assert 't_seconds_bucket{route="/a",le="+Inf"} 2' in out
+    assert 't_seconds_count{route="/a"} 2' in out
+
+def test_pool_gauges_render_and_parse():
+    from sqlalchemy.pool import QueuePool
+    from mini_ddq_app.scripts.loadtest import parse_pool_metrics
+
+    engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=3)
+    metrics.register_pool("t_pool", engine.pool)
+    try:
+        with engine.connect():
+            pools = parse_pool_metrics(metrics.render())
+        assert pools["t_pool"]["size"] == 3
+        assert pools["t_pool"]["checkedout"] == 1
+    finally:
+        metrics._pools.pop("t_pool", None)
+
+def test_middleware_counts_statements_and_flags_n_plus_one():
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    def items(item_id: int):
+        with engine.connect() as conn:
+            return [conn.execute(text("SELECT :i"), {"i": i}).scalar() for i in range(item_id)]
+
+    client = TestClient(app)
+    assert client.get("/items/12").status_code == 200
+    out = metrics.render()
+    assert 'ddq_request_sql_statements_count{method="GET",route="/items/{item_id}"} 1' in out
+    assert 'ddq_request_sql_statements_sum{method="GET",route="/items/{item_id}"}' in out
+    assert 'ddq_n_plus_one_suspected_total{method="GET",route="/items/{item_id}"} 1' in out
+
+    client.get("/items/2")  # below the threshold
+    assert 'ddq_n_plus_one_suspected_total{method="GET",route="/items/{item_id}"} 1' in metrics.render()
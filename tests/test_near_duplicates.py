@@ -0,0 +1,49 @@
+# mini_ddq_app/tests/test_near_duplicates.py
+"""
+- Signatures are deterministic and round-trip through their stored bytes.
+- Chunked hashing gives the same signatures as hashing each text alone.
+- A reworded copy is found through the LSH buckets; unrelated text is not.
+- Questionnaire scoping and removal are honoured.
+"""
+
+import numpy as np
+
+from mini_ddq_app.near_duplicates import CHUNK, TenantDuplicateIndex, from_bytes, signatures, to_bytes
+
+ORIGINAL = "Does the company maintain a documented business continuity plan that is tested annually?"
+REWORDED = "Does the company maintain a documented business continuity plan, tested annually?"
+OTHER = "List all sub-processors that handle customer personal data."
+
+def test_signatures_are_stable_and_round_trip():
+    a, b = signatures([ORIGINAL, ORIGINAL.upper()])
+    assert a.shape == (64,)
+    assert np.array_equal(a, b)  # case/punctuation-insensitive
+    assert np.array_equal(from_bytes(to_bytes(a)), a)
+
+def test_signatures_are_independent_of_chunking():
+    texts = [f"{OTHER} #{i}" for i in range(CHUNK + 3)] + [ORIGINAL, ""]
+    batch = signatures(texts)
+    assert batch.shape == (len(texts), 64) and batch.dtype == np.uint32
+    for i in (0, CHUNK - 1, CHUNK, len(texts) - 2, len(texts) - 1):
+        assert np.array_equal(batch[i], signatures([texts[i]])[0])
+    assert signatures([]).shape == (0, 64)
+
+def test_reworded_copy_is_matched_and_unrelated_text_is_not():
+    orig, reworded, other = signatures([ORIGINAL, REWORDED, OTHER])
+    idx = TenantDuplicateIndex()
+    idx.upsert("q1", "qn1", orig)
+
+    match = idx.best_match(reworded, threshold=0.6)
+    assert match is not None and match[0] == "q1"
+    assert idx.best_match(other, threshold=0.6) is None
+
+def test_scope_and_remove():
+    orig, reworded = signatures([ORIGINAL, REWORDED])
+    idx = TenantDuplicateIndex()
+    idx.upsert("q1", "qn1", orig)
+
+    assert idx.best_match(reworded, 0.6, questionnaire_id="qn2") is None
+    assert idx.best_match(reworded, 0.6, questionnaire_id="qn1")[0] == "q1"
+    idx.remove("q1")
+    assert len(idx) == 0
+    assert idx.best_match(reworded, 0.6) is None
@@ -0,0 +1,31 @@
+# mini_ddq_app/tests/test_serve.py
+"""
+- pool_limits() splits a connection budget across workers, keeping one LISTEN connection each,
+  and never hands out more than the budget.
+- serve.plan() refuses budgets the server can't hold or too small for the worker count.
+"""
+import pytest
+
+from mini_ddq_app.db import RESERVED_PER_WORKER, pool_limits
+from mini_ddq_app.serve import plan
+
+@pytest.mark.parametrize("budget,workers", [(20, 2), (92, 4), (100, 7), (4, 2), (300, 16)])
+def test_pool_limits_stay_within_budget(budget, workers):
+    pool_size, max_overflow = pool_limits(budget, workers)
+    assert pool_size >= 1 and max_overflow >= 0
+    assert workers * (pool_size + max_overflow + RESERVED_PER_WORKER) <= budget
+
+def test_pool_limits_split():
+    assert pool_limits(20, 2) == (6, 3)
+
+def test_pool_limits_rejects_tiny_budget():
+    with pytest.raises(ValueError):
+        pool_limits(10, 8)
+
+def test_plan_derives_budget_from_server_and_rejects_overcommit():
+    p = plan(workers=4, budget=0, server_limit=92)
+    assert p["budget"] == 92 and p["total"] <= 92
+    with pytest.raises(SystemExit):
+        plan(workers=4, budget=200, server_limit=92)
+    with pytest.raises(SystemExit):
+        plan(workers=4, budget=0, server_limit=None)
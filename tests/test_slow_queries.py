@@ -0,0 +1,32 @@
+# mini_ddq_app/tests/test_slow_queries.py
+"""
+- Parameter shapes never include values.
+- Statements over the threshold land in the ring buffer; sampling/cooldown bound EXPLAIN runs.
+(EXPLAIN itself needs Postgres; here the sample rate is 0 so no plan is attempted.)
+"""
+
+from sqlalchemy import create_engine, text
+
+from mini_ddq_app.slow_queries import SlowQueryLog, param_shapes
+
+def test_param_shapes_hide_values():
+    assert param_shapes({"email": "a@b.c", "n": 3, "ids": [1, 2]}) == {"email": "str[5]", "n": "int", "ids": "list[2]"}
+
+def test_slow_statements_are_buffered():
+    engine = create_engine("sqlite://")
+    log = SlowQueryLog(threshold=0.0, sample=0.0, size=2)
+    log.install(engine)
+    with engine.connect() as conn:
+        for i in range(3):
+            conn.execute(text("SELECT :i"), {"i": i})
+    entries = log.recent()
+    assert len(entries) == 2                       # ring buffer keeps the newest
+    assert entries[0]["sql"].startswith("SELECT")
+    assert entries[0]["plan"] is None and entries[0]["route"] is None
+
+def test_explain_cooldown_per_statement():
+    log = SlowQueryLog(threshold=0.0, sample=1.0, size=10, clock=lambda: 100.0)
+    assert log._should_explain("SELECT 1", False)
+    assert not log._should_explain("SELECT 1", False)   # same SQL within the cooldown
+    assert log._should_explain("SELECT 2", False)
+    assert not log._should_explain("VACUUM", False)    # not explainable
@@ -0,0 +1,94 @@
+"""
+Per-tenant and per-questionnaire data versions, used for conditional GETs (ETag / 304).
+
+- bump_versions(): every write path calls it inside its own transaction, so the bump
+  commits (or rolls back) together with the data.
+- tenant_version() / questionnaire_version(): one primary-key lookup each.
+- questions_version: a second counter on both, bumped only by writes to questions (create,
+  bulk update, import; bump_versions(..., questions=True)). The question list keys its ETag
+  and cache on it, so response writes (PUTs, autofill, draft flushes) don't invalidate it.
+- make_etag() / not_modified(): build a weak ETag and answer If-None-Match without
+  running the list query.
+
+Notes:
+- The bump row-locks the tenant until commit, so writes within one tenant serialize on it.
+  Fine at our write rates; reads are never blocked.
+- The version is read before the list query, so an ETag can only be older than the
+  data it is sent with (worst case: one extra full fetch), never newer.
+"""
+
+import hashlib
+from typing import Iterable, Optional
+
+from fastapi import Request
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from mini_ddq_app.models.tenant import Tenant
+from mini_ddq_app.models.questionnaire import Questionnaire
+
+
+def bump_versions(db: Session, tenant_id, questionnaire_ids: Iterable = (), questions: bool = False) -> int:
+    """Increment the tenant's version (and the given questionnaires'); returns the new tenant version.
+
+    questions=True also increments questions_version (the write changed questions themselves).
+    """
+    qn_ids = sorted({str(i) for i in questionnaire_ids})
+    if qn_ids:
+        values = {"data_version": Questionnaire.data_version + 1}
+        if questions:
+            values["questions_version"] = Questionnaire.questions_version + 1
+        db.execute(
+            update(Questionnaire)
+            .where(Questionnaire.tenant_id == tenant_id, Questionnaire.id.in_(qn_ids))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+    values = {"data_version": Tenant.data_version + 1}
+    if questions:
+        values["questions_version"] = Tenant.questions_version + 1
+    return db.execute(
+        update(Tenant)
+        .where(Tenant.id == tenant_id)
+        .values(**values)
+        .returning(Tenant.data_version)
+        .execution_options(synchronize_session=False)
+    ).scalar_one()
+
+
+def tenant_version(db: Session, tenant_id) -> int:
+    return db.execute(select(Tenant.data_version).where(Tenant.id == tenant_id)).scalar_one()
+
+
+def questionnaire_version(db: Session, tenant_id, questionnaire_id) -> Optional[int]:
+    return db.execute(
+        select(Questionnaire.data_version).where(
+            Questionnaire.id == str(questionnaire_id), Questionnaire.tenant_id == tenant_id
+        )
+    ).scalar_one_or_none()
+
+
+def questions_version(db: Session, tenant_id, questionnaire_id=None) -> Optional[int]:
+    """The questionnaire's questions_version, or the tenant's when questionnaire_id is None."""
+    if questionnaire_id is None:
+        return db.execute(select(Tenant.questions_version).where(Tenant.id == tenant_id)).scalar_one()
+    return db.execute(
+        select(Questionnaire.questions_version).where(
+            Questionnaire.id == str(questionnaire_id), Questionnaire.tenant_id == tenant_id
+        )
+    ).scalar_one_or_none()
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha1(":".join(str(p) for p in parts).encode()).hexdigest()[:24]
+    return f'W/"{digest}"'
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in header.split(","))
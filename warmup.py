@@ -0,0 +1,98 @@
+"""
+Startup warmup and readiness state, so the first requests after a deploy don't pay one-off costs.
+
+- run(): creates the engine, configures all ORM mappers, pre-opens WARMUP_CONNECTIONS pool
+  connections (returned to the pool idle), and primes the password hashing backend (passlib
+  loads bcrypt and calibrates on first use). Each step is timed into state.steps.
+- The lifespan runs it in a worker thread, so the server accepts connections right away:
+  GET /healthz (liveness) answers immediately, GET /readyz (readiness) stays 503 until
+  warmup has finished and the database answers.
+
+Notes:
+- WARMUP=0 skips the steps (ready immediately); costs are then paid by the first requests.
+- A failed step is logged and recorded, not fatal: readiness then depends on the DB check alone.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+
+from mini_ddq_app.config import settings
+from mini_ddq_app.db import get_engine
+
+logger = logging.getLogger("mini_ddq_app.warmup")
+
+# a valid bcrypt_sha256 hash of "warmup", so priming only verifies (never hashes a new salt)
+_PRIME_HASH = "$bcrypt-sha256$v=2,t=2b,r=12$ft7Tcc9ZDTLb/yavFf4EUe$rDCI.7VKfPP21Tp/JOiW/a3MbEPJhhy"
+
+
+class WarmupState:
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.ready = threading.Event()
+        self.steps: Dict[str, float] = {}       # step -> seconds
+        self.error: Optional[str] = None
+
+    def snapshot(self) -> dict:
+        return {
+            "warm": self.ready.is_set(),
+            "steps_ms": {k: round(v * 1000, 1) for k, v in self.steps.items()},
+            "error": self.error,
+        }
+
+
+state = WarmupState()
+
+
+def _open_connections(n: int) -> None:
+    engine = get_engine()
+    conns = []
+    try:
+        for _ in range(min(n, engine.pool.size())):
+            conn = engine.connect()
+            conn.execute(text("SELECT 1"))
+            conns.append(conn)
+    finally:
+        for conn in conns:
+            conn.close()  # back to the pool, still open
+
+
+def _prime_hashing() -> None:
+    from mini_ddq_app.auth.hashing import verify_password
+    verify_password("warmup", _PRIME_HASH)
+
+
+def run(connections: Optional[int] = None) -> WarmupState:
+    if connections is None:
+        connections = settings.WARMUP_CONNECTIONS
+    steps = [
+        ("engine", get_engine),
+        ("mappers", configure_mappers),
+        ("pool", lambda: _open_connections(connections)),
+        ("hashing", _prime_hashing),
+    ] if settings.WARMUP else []
+    for name, step in steps:
+        t0 = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            state.error = f"{name}: {e}"
+            logger.exception("warmup step %s failed", name)
+        state.steps[name] = time.perf_counter() - t0
+    state.steps["total"] = time.monotonic() - state.started_at  # since import, i.e. including app setup
+    state.ready.set()
+    logger.info("warmup done in %.0f ms: %s", state.steps["total"] * 1000, state.snapshot()["steps_ms"])
+    return state
+
+
+def database_ok() -> bool:
+    try:
+        with get_engine().connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False